@@ -0,0 +1,40 @@
+"""
+Shared setup for benchmark scripts.
+
+Puts backend/ on sys.path and fills in dummy values for the settings that the app
+requires, so services can be imported without a real .env. Values already present
+in the environment always win.
+"""
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+_DEFAULTS = {
+    "DATABASE_URL": "sqlite:///" + str(BACKEND_DIR / "benchmarks" / "bench.db"),
+    "LLM_API_KEY": "sk-bench",
+    "GOOGLE_CLIENT_ID": "bench",
+    "GOOGLE_CLIENT_SECRET": "bench",
+    "GOOGLE_PROJECT_ID": "bench",
+    "GOOGLE_REDIRECT_URI": "http://localhost:8000/api/auth/callback",
+    "GOOGLE_SCOPES": "https://www.googleapis.com/auth/calendar,https://www.googleapis.com/auth/spreadsheets",
+    # Fixed throwaway Fernet key — benchmarks never touch real tokens
+    "ENCRYPTION_KEY": "kLN9NnghBNpdLeiHQFSl0mWBA0Xj7ALpLKAP3QM_rVI=",
+}
+
+
+def setup_env(**overrides: str) -> None:
+    """Apply dummy settings (and any overrides) before importing backend modules."""
+    for key, value in {**_DEFAULTS, **overrides}.items():
+        os.environ.setdefault(key, value)
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0 for empty input)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[idx]
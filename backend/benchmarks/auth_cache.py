@@ -0,0 +1,97 @@
+"""
+Per-request auth overhead: has_valid_token + get_credentials_for_user, uncached vs cached.
+
+Usage:
+    python benchmarks/auth_cache.py [--requests 500]
+
+Steps:
+    1. Creates a user with an encrypted OAuth token in benchmarks/bench.db
+    2. Simulates the auth work of one API request: the route's has_valid_token check,
+       then get_credentials_for_user as the service layer does
+    3. "uncached": auth_cache cleared before every request (the old behaviour)
+    4. "cached": the short-TTL auth_cache as shipped
+    5. Reports latency and SQL statements / Fernet decrypts per request
+"""
+import argparse
+import time
+
+from _bootstrap import setup_env, percentile
+
+setup_env()
+
+from sqlalchemy import event  # noqa: E402
+
+import services.oauth_token_service as oauth_token_service  # noqa: E402
+from config.database import SessionLocal, create_all_tables, engine  # noqa: E402
+from models.user import User  # noqa: E402
+from services.auth_cache import auth_cache  # noqa: E402
+from services.auth_service import get_credentials_for_user, has_valid_token  # noqa: E402
+from services.oauth_token_service import OAuthTokenService  # noqa: E402
+
+_counts = {"sql": 0, "decrypt": 0}
+
+
+def _count_sql(*_args, **_kwargs):
+    _counts["sql"] += 1
+
+
+def _counting_decrypt(fn):
+    def wrapper(*args, **kwargs):
+        _counts["decrypt"] += 1
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def _ensure_user(db) -> int:
+    user = db.query(User).filter(User.email == "bench@example.com").first()
+    if not user:
+        user = User(email="bench@example.com", name="Bench")
+        db.add(user)
+        db.commit()
+    OAuthTokenService.save_token(
+        db, user.user_id, "google", "ya29.bench-access", "1//bench-refresh",
+        scope="https://www.googleapis.com/auth/spreadsheets",
+    )
+    return user.user_id
+
+
+def _run(db, user_id: int, requests: int, clear: bool) -> dict:
+    _counts.update(sql=0, decrypt=0)
+    timings = []
+    for _ in range(requests):
+        if clear:
+            auth_cache.clear()
+        t0 = time.perf_counter()
+        assert has_valid_token(db, user_id)
+        get_credentials_for_user(db, user_id)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return {
+        "avg": sum(timings) / len(timings),
+        "p95": percentile(timings, 95),
+        "sql": _counts["sql"] / requests,
+        "decrypt": _counts["decrypt"] / requests,
+    }
+
+
+def main(requests: int) -> None:
+    create_all_tables()
+    db = SessionLocal()
+    try:
+        user_id = _ensure_user(db)
+        event.listen(engine, "before_cursor_execute", _count_sql)
+        oauth_token_service.decrypt_data = _counting_decrypt(oauth_token_service.decrypt_data)
+
+        print(f"{'mode':<10}{'avg(ms)':>10}{'p95(ms)':>10}{'sql/req':>10}{'decrypt/req':>13}")
+        for mode, clear in (("uncached", True), ("cached", False)):
+            r = _run(db, user_id, requests, clear)
+            print(f"{mode:<10}{r['avg']:>10.3f}{r['p95']:>10.3f}{r['sql']:>10.2f}{r['decrypt']:>13.2f}")
+        print(f"auth_cache: {auth_cache.stats()}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500, help="Simulated requests per mode")
+    args = parser.parse_args()
+    main(args.requests)
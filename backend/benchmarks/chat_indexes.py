@@ -0,0 +1,175 @@
+"""
+Query plans and latencies of the chat/token hot queries with the old single-column
+indexes vs the composite indexes from migration f6a7b8c9d0e1.
+
+Usage:
+    python benchmarks/chat_indexes.py [--messages 1000000] [--sessions 20000] [--users 500]
+                                      [--runs 200] [--database-url postgresql://...]
+
+Steps:
+    1. Creates the schema in a scratch database (default: benchmarks/chat_indexes.db,
+       recreated on every run; pass --database-url to use a Postgres database, whose
+       tables are dropped and recreated) and seeds users, sessions, connected accounts,
+       OAuth tokens and --messages messages spread over the sessions
+    2. "before": drops the composite indexes and creates the single-column indexes
+       of the initial schema; "after": the reverse, as the migration does
+    3. For each phase, prints the plan (EXPLAIN QUERY PLAN / EXPLAIN) of each hot query
+       and its p50/p95 latency over --runs executions with random keys
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from _bootstrap import setup_env, percentile
+
+setup_env()
+
+from sqlalchemy import Index, create_engine, insert, select, text  # noqa: E402
+
+import models  # noqa: E402,F401
+from models.base import Base  # noqa: E402
+from models.user import User  # noqa: E402
+from models.workspace import Workspace  # noqa: E402
+from models.assistant_session import AssistantSession, SessionStatus  # noqa: E402
+from models.message import Message, MessageRole  # noqa: E402
+from models.connected_account import ConnectedAccount  # noqa: E402
+from models.oauth_token import OAuthToken  # noqa: E402
+
+_CHUNK = 20000
+
+# Composite index (as declared on the models) -> single-column index it replaced
+_LEGACY = {
+    "ix_message_session_created": Index("ix_message_session_id", Message.__table__.c.session_id),
+    "ix_assistant_session_user_updated": Index("ix_assistant_session_user_id", AssistantSession.__table__.c.user_id),
+    "ix_connected_account_user_provider": Index("ix_connected_account_user_id", ConnectedAccount.__table__.c.user_id),
+    "ix_oauth_token_account_expires": Index("ix_oauth_token_connected_account_id",
+                                            OAuthToken.__table__.c.connected_account_id),
+}
+_COMPOSITE = {
+    ix.name: ix
+    for table in (Message, AssistantSession, ConnectedAccount, OAuthToken)
+    for ix in table.__table__.indexes
+    if ix.name in _LEGACY
+}
+
+
+def _seed(engine, users: int, sessions: int, messages: int) -> None:
+    now = datetime.utcnow()
+    rnd = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"user_id": u, "email": f"user{u}@bench.local", "name": f"user{u}", "created_at": now, "updated_at": now}
+            for u in range(1, users + 1)
+        ])
+        conn.execute(insert(Workspace), [
+            {"workspace_id": u, "owner_user_id": u, "name": "Default", "created_at": now, "updated_at": now}
+            for u in range(1, users + 1)
+        ])
+        conn.execute(insert(ConnectedAccount), [
+            {"connected_account_id": u, "user_id": u, "provider": "google", "account_email": f"user{u}@bench.local",
+             "created_at": now, "updated_at": now}
+            for u in range(1, users + 1)
+        ])
+        conn.execute(insert(OAuthToken), [
+            {"connected_account_id": u, "access_token": "x", "expires_at": now + timedelta(minutes=rnd.randint(0, 60)),
+             "created_at": now, "updated_at": now}
+            for u in range(1, users + 1)
+        ])
+        statuses = [SessionStatus.ACTIVE] * 8 + [SessionStatus.COMPLETED, SessionStatus.CANCELLED]
+        for start in range(1, sessions + 1, _CHUNK):
+            conn.execute(insert(AssistantSession), [
+                {"session_id": s, "user_id": (s % users) + 1, "workspace_id": (s % users) + 1,
+                 "status": rnd.choice(statuses), "created_at": now,
+                 "updated_at": now - timedelta(seconds=rnd.randint(0, 90 * 86400))}
+                for s in range(start, min(start + _CHUNK, sessions + 1))
+            ])
+    roles = [MessageRole.USER, MessageRole.ASSISTANT]
+    for start in range(0, messages, _CHUNK):
+        with engine.begin() as conn:
+            conn.execute(insert(Message), [
+                {"session_id": rnd.randint(1, sessions), "role": roles[m % 2], "content": "bench message",
+                 "created_at": now - timedelta(seconds=rnd.randint(0, 90 * 86400)), "updated_at": now}
+                for m in range(start, min(start + _CHUNK, messages))
+            ])
+
+
+def _set_indexes(engine, composite: bool) -> None:
+    for name, legacy in _LEGACY.items():
+        drop, create = (legacy, _COMPOSITE[name]) if composite else (_COMPOSITE[name], legacy)
+        drop.drop(engine, checkfirst=True)
+        create.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def _queries(users: int, sessions: int):
+    """(label, statement factory) for each hot query."""
+    return [
+        ("history", lambda r: select(Message.message_id, Message.role, Message.content, Message.created_at)
+            .where(Message.session_id == r.randint(1, sessions))
+            .order_by(Message.created_at.desc(), Message.message_id.desc()).limit(20)),
+        ("sessions", lambda r: select(AssistantSession.session_id, AssistantSession.title, AssistantSession.updated_at)
+            .where(AssistantSession.user_id == r.randint(1, users),
+                   AssistantSession.status != SessionStatus.CANCELLED)
+            .order_by(AssistantSession.updated_at.desc(), AssistantSession.session_id.desc()).limit(20)),
+        ("account", lambda r: select(ConnectedAccount.connected_account_id)
+            .where(ConnectedAccount.user_id == r.randint(1, users), ConnectedAccount.provider == "google")),
+        ("token", lambda r: select(OAuthToken.oauth_token_id, OAuthToken.expires_at)
+            .where(OAuthToken.connected_account_id == r.randint(1, users))),
+    ]
+
+
+def _explain(conn, stmt) -> str:
+    sql = str(stmt.compile(conn.engine, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        return "; ".join(row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql)))
+    return " / ".join(row[0].strip() for row in conn.execute(text("EXPLAIN " + sql)))
+
+
+def _measure(engine, users: int, sessions: int, runs: int, phase: str) -> None:
+    print(f"\n== {phase} ==")
+    with engine.connect() as conn:
+        for label, make in _queries(users, sessions):
+            rnd = random.Random(7)
+            print(f"  {label:<9} plan: {_explain(conn, make(rnd))}")
+            latencies = []
+            for _ in range(runs):
+                stmt = make(rnd)
+                t0 = time.perf_counter()
+                conn.execute(stmt).all()
+                latencies.append((time.perf_counter() - t0) * 1000)
+            print(f"  {label:<9} p50={percentile(latencies, 50):.3f} ms  p95={percentile(latencies, 95):.3f} ms")
+
+
+def main(messages: int, sessions: int, users: int, runs: int, database_url: str) -> None:
+    if not database_url:
+        path = Path(__file__).parent / "chat_indexes.db"
+        path.unlink(missing_ok=True)
+        database_url = f"sqlite:///{path}"
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    t0 = time.perf_counter()
+    _seed(engine, users, sessions, messages)
+    print(f"seeded {messages} messages / {sessions} sessions / {users} users "
+          f"on {engine.dialect.name} in {time.perf_counter() - t0:.1f}s")
+
+    _set_indexes(engine, composite=False)
+    _measure(engine, users, sessions, runs, "before: single-column indexes")
+    _set_indexes(engine, composite=True)
+    _measure(engine, users, sessions, runs, "after: composite indexes")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1_000_000, help="Messages to seed")
+    parser.add_argument("--sessions", type=int, default=20_000, help="Sessions to spread them over")
+    parser.add_argument("--users", type=int, default=500, help="Users owning the sessions")
+    parser.add_argument("--runs", type=int, default=200, help="Executions per query and phase")
+    parser.add_argument("--database-url", default="", help="Scratch database (default: local SQLite file)")
+    args = parser.parse_args()
+    main(args.messages, args.sessions, args.users, args.runs, args.database_url)
@@ -0,0 +1,111 @@
+"""
+Load test for blocking Google/DB work in async routes: inline on the event loop vs
+the dedicated executors.
+
+Usage:
+    python benchmarks/executor_load.py [--requests 256] [--levels 1,8,32,64] [--latency 0.05]
+
+Steps:
+    1. Drives GET /api/sheets/expenses on the real app in-process (httpx ASGITransport)
+    2. The Google side is faked: has_valid_token and read_expenses block for --latency
+       seconds (time.sleep), like a token check plus a Sheets API round trip
+    3. "inline" mode swaps run_google / run_db for a direct call (the old behaviour);
+       "executor" mode uses services.executors as shipped
+    4. For each concurrency level, reports throughput, p50/p95 latency, the worst
+       event-loop stall seen by a 10 ms heartbeat, and executor wait/queue stats
+"""
+import argparse
+import asyncio
+import time
+
+from _bootstrap import setup_env, percentile
+
+setup_env()
+
+import httpx  # noqa: E402
+
+import routers.sheets as sheets_router  # noqa: E402
+from config.database import create_all_tables  # noqa: E402
+from server import app  # noqa: E402
+from services import executors  # noqa: E402
+
+
+async def _inline(fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+def _patch(latency: float, inline: bool) -> None:
+    def has_valid_token(db, user_id):
+        time.sleep(latency / 2)
+        return True
+
+    def read_expenses(db, user_id, sheet_id, limit=50):
+        time.sleep(latency)
+        return [{"date": "2026-10-01", "amount": 50000.0, "description": "cafe",
+                 "category": "Ăn uống", "row_number": 5}]
+
+    sheets_router.has_valid_token = has_valid_token
+    sheets_router.read_expenses = read_expenses
+    sheets_router.get_user_sheet_id = lambda db, user_id: "bench-sheet"
+    sheets_router.run_google = _inline if inline else executors.run_google
+    sheets_router.run_db = _inline if inline else executors.run_db
+
+
+async def _heartbeat(stop: asyncio.Event, stalls: list) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(0.01)
+        stalls.append((time.perf_counter() - t0 - 0.01) * 1000)
+
+
+async def _run_level(client: httpx.AsyncClient, requests: int, concurrency: int) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with sem:
+            t0 = time.perf_counter()
+            resp = await client.get("/api/sheets/expenses", params={"user_id": 1, "limit": 10})
+            resp.raise_for_status()
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    stop, stalls = asyncio.Event(), []
+    beat = asyncio.create_task(_heartbeat(stop, stalls))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    wall = time.perf_counter() - t0
+    stop.set()
+    await beat
+    return {
+        "rps": requests / wall,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "stall": max(stalls, default=0.0),
+    }
+
+
+async def main(requests: int, levels: list, latency: float) -> None:
+    create_all_tables()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'mode':<10}{'conc':>6}{'req/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'stall(ms)':>11}")
+        for inline in (True, False):
+            _patch(latency, inline)
+            mode = "inline" if inline else "executor"
+            for concurrency in levels:
+                r = await _run_level(client, requests, concurrency)
+                print(f"{mode:<10}{concurrency:>6}{r['rps']:>10.1f}{r['p50']:>10.1f}{r['p95']:>10.1f}{r['stall']:>11.1f}")
+
+    for name, stats in executors.executor_stats().items():
+        print(f"{name}: max_workers={stats['max_workers']} max_queue_depth={stats['max_queue_depth']} "
+              f"wait_ms_p95={stats['wait_ms_p95']:.2f} run_ms_p95={stats['run_ms_p95']:.2f}")
+    executors.shutdown_executors()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=256, help="Requests per concurrency level")
+    parser.add_argument("--levels", default="1,8,32,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated Google API latency (s)")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, [int(x) for x in args.levels.split(",")], args.latency))
@@ -0,0 +1,108 @@
+"""
+Per-call overhead of obtaining a Google Sheets service: rebuilt every call vs pooled.
+
+Usage:
+    python benchmarks/google_client_pool.py [--calls 200] [--threads 16]
+
+Steps:
+    1. Creates a user with an encrypted OAuth token in benchmarks/bench.db
+    2. "rebuild": get_credentials_for_user + googleapiclient build() per call (the old
+       path), then service.spreadsheets().values() as every sheets_service call does
+    3. "pooled": services.sheets_service.get_sheet_service (GoogleClientPool), warm,
+       then the same spreadsheets().values() access
+    4. "pooled xN threads": the same shared service used from N threads at once, each
+       preparing a values.get request — checks the per-thread Http wiring under load
+No request is sent to Google; only the client-side setup cost is measured.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _bootstrap import setup_env, percentile
+
+setup_env()
+
+from googleapiclient.discovery import build  # noqa: E402
+
+from config.database import SessionLocal, create_all_tables  # noqa: E402
+from models.user import User  # noqa: E402
+from services.auth_service import get_credentials_for_user  # noqa: E402
+from services.oauth_token_service import OAuthTokenService  # noqa: E402
+from services.sheets_service import get_sheet_service  # noqa: E402
+from services.google_client_pool import google_client_pool  # noqa: E402
+
+
+def _ensure_user(db) -> int:
+    user = db.query(User).filter(User.email == "bench@example.com").first()
+    if not user:
+        user = User(email="bench@example.com", name="Bench")
+        db.add(user)
+        db.commit()
+    OAuthTokenService.save_token(
+        db, user.user_id, "google", "ya29.bench-access", "1//bench-refresh",
+        scope="https://www.googleapis.com/auth/spreadsheets",
+    )
+    return user.user_id
+
+
+def _time_calls(fn, n: int) -> list:
+    timings = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list) -> None:
+    avg = sum(timings) / len(timings)
+    print(f"{label:<22}{len(timings):>7}{avg:>10.3f}{percentile(timings, 50):>10.3f}{percentile(timings, 95):>10.3f}")
+
+
+def main(calls: int, threads: int) -> None:
+    create_all_tables()
+    db = SessionLocal()
+    try:
+        user_id = _ensure_user(db)
+
+        def rebuild():
+            creds = get_credentials_for_user(db, user_id)
+            build("sheets", "v4", credentials=creds).spreadsheets().values()
+
+        def pooled():
+            get_sheet_service(db, user_id).spreadsheets().values()
+
+        rebuild_t = _time_calls(rebuild, calls)
+        google_client_pool.clear()
+        pooled()  # warm the pool
+        pooled_t = _time_calls(pooled, calls)
+
+        service = get_sheet_service(db, user_id)
+
+        def threaded_call(_):
+            t0 = time.perf_counter()
+            req = service.spreadsheets().values().get(spreadsheetId="bench", range="A1:B2")
+            assert req.http is not None
+            return (time.perf_counter() - t0) * 1000, id(req.http)
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(threaded_call, range(calls * 4)))
+        threaded_t = [r[0] for r in results]
+        distinct_http = len({r[1] for r in results})
+
+        print(f"{'mode':<22}{'calls':>7}{'avg(ms)':>10}{'p50(ms)':>10}{'p95(ms)':>10}")
+        _report("rebuild per call", rebuild_t)
+        _report("pooled", pooled_t)
+        _report(f"pooled x{threads} threads", threaded_t)
+        print(f"Distinct Http objects across {threads} threads: {distinct_http}")
+        print(f"Pool stats: {google_client_pool.stats()}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200, help="Calls per mode")
+    parser.add_argument("--threads", type=int, default=16, help="Threads sharing the pooled service")
+    args = parser.parse_args()
+    main(args.calls, args.threads)
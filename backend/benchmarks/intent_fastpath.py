@@ -0,0 +1,116 @@
+"""
+Hit rate, accuracy and latency of the local intent fast path.
+
+Usage:
+    python benchmarks/intent_fastpath.py [--llm-ms 1500] [--repeat 200]
+
+Runs services.intent_fastpath over a labelled corpus of typical chat messages
+(short expense/income phrases mixed with calendar, questions and long requests),
+then reports:
+    - hit rate (messages answered without the LLM)
+    - accuracy of hits against the expected tool / amount / category
+    - local parse latency, and latency saved per message given --llm-ms
+      (the average parse_user_intent round trip — see fastpath_stats in production logs)
+"""
+import argparse
+import time
+from datetime import date
+
+from _bootstrap import percentile  # noqa: F401 - also puts backend/ on sys.path
+from services.intent_fastpath import parse_fast_intent
+
+EXPENSE_CATS = ["Ăn uống", "Di chuyển", "Mua sắm", "Giải trí", "Hóa đơn", "Sức khỏe", "Khác"]
+INCOME_CATS = ["Lương", "Thưởng", "Freelance", "Khác"]
+
+# (message, expected tool or None for "must go to the LLM", amount, category)
+CORPUS = [
+    ("50k ăn trưa", "add_expense", 50_000, "Ăn uống"),
+    ("đổ xăng 200k", "add_expense", 200_000, "Di chuyển"),
+    ("nhận lương 15 triệu", "add_income", 15_000_000, "Lương"),
+    ("cafe 35k", "add_expense", 35_000, "Ăn uống"),
+    ("hôm qua ăn tối 120k", "add_expense", 120_000, "Ăn uống"),
+    ("grab 45.000đ", "add_expense", 45_000, "Di chuyển"),
+    ("trà sữa 40k", "add_expense", 40_000, "Ăn uống"),
+    ("tiền điện 450k", "add_expense", 450_000, "Hóa đơn"),
+    ("tiền nước 150 nghìn", "add_expense", 150_000, "Hóa đơn"),
+    ("mua áo 2tr5", "add_expense", 2_500_000, "Mua sắm"),
+    ("xem phim 120k", "add_expense", 120_000, "Giải trí"),
+    ("thưởng tết 5 triệu", "add_income", 5_000_000, "Thưởng"),
+    ("freelance 3tr", "add_income", 3_000_000, "Freelance"),
+    ("phở sáng nay 45k", "add_expense", 45_000, "Ăn uống"),
+    ("gửi xe 5k", "add_expense", 5_000, "Di chuyển"),
+    ("mua thuốc 80k", "add_expense", 80_000, "Sức khỏe"),
+    ("khám bệnh viện 300k", "add_expense", 300_000, "Sức khỏe"),
+    ("shopee 1.250.000", "add_expense", 1_250_000, "Mua sắm"),
+    ("internet tháng 10 200k", None, None, None),
+    ("ăn trưa 50", None, None, None),
+    ("50k", None, None, None),
+    ("hôm nay có lịch gì", None, None, None),
+    ("tuần này chi bao nhiêu", None, None, None),
+    ("xem lịch hôm nay", None, None, None),
+    ("tạo lịch họp 3h chiều mai", None, None, None),
+    ("xóa cuộc họp với team", None, None, None),
+    ("dời lịch khám sang thứ 6", None, None, None),
+    ("ăn sáng 30k, cafe 25k, trưa 50k", None, None, None),
+    ("cho bạn mượn 500k", None, None, None),
+    ("tháng này tiêu nhiều quá không?", None, None, None),
+    ("mua quà sinh nhật cho mẹ hết 700k ở cửa hàng gần nhà hôm qua nhé", None, None, None),
+    ("chào bạn", None, None, None),
+    ("-50k ăn sáng", None, None, None),
+    ("12/10 bún chả 60k", "add_expense", 60_000, "Ăn uống"),
+    ("taxi 2 ngày trước 180k", "add_expense", 180_000, "Di chuyển"),
+    ("lẩu 1tr2", "add_expense", 1_200_000, "Ăn uống"),
+    ("netflix 260k", "add_expense", 260_000, "Giải trí"),
+    ("nhận thưởng dự án 2 triệu", "add_income", 2_000_000, "Thưởng"),
+    ("siêu thị 850k", "add_expense", 850_000, "Mua sắm"),
+    ("bánh mì 20k", "add_expense", 20_000, "Ăn uống"),
+]
+
+
+def run(llm_ms: float, repeat: int) -> None:
+    today = date(2026, 10, 18)
+    hits = correct = false_hits = 0
+    misses_expected = []
+
+    for message, tool, amount, category in CORPUS:
+        result = parse_fast_intent(message, EXPENSE_CATS, INCOME_CATS, today=today)
+        if result is None:
+            if tool is not None:
+                misses_expected.append(message)
+            continue
+        hits += 1
+        txn = result.args["transactions"][0]
+        if (result.tool_name, txn["amount"], txn["category"]) == (tool, amount, category):
+            correct += 1
+        else:
+            false_hits += 1
+            print(f"  MISMATCH {message!r}: got {result.tool_name} {txn}")
+
+    timings = []
+    for _ in range(repeat):
+        for message, *_ in CORPUS:
+            t0 = time.perf_counter()
+            parse_fast_intent(message, EXPENSE_CATS, INCOME_CATS, today=today)
+            timings.append((time.perf_counter() - t0) * 1000)
+
+    n = len(CORPUS)
+    hit_rate = hits / n
+    avg_ms = sum(timings) / len(timings)
+    saved_per_msg = hit_rate * (llm_ms - avg_ms) - (1 - hit_rate) * avg_ms
+
+    print(f"Messages              : {n}")
+    print(f"Fast-path hits        : {hits} ({hit_rate:.0%})")
+    print(f"Hits correct          : {correct}/{hits}  (wrong: {false_hits})")
+    print(f"Expected hits missed  : {len(misses_expected)} {misses_expected}")
+    print(f"Parse latency         : avg {avg_ms:.3f} ms, p95 {percentile(timings, 95):.3f} ms")
+    print(f"Assumed LLM latency   : {llm_ms:.0f} ms")
+    print(f"Latency saved per hit : {llm_ms - avg_ms:.0f} ms")
+    print(f"Saved per message     : {saved_per_msg:.0f} ms (averaged over all messages, misses pay parse cost)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-ms", type=float, default=1500.0, help="Average LLM intent round trip (ms)")
+    parser.add_argument("--repeat", type=int, default=200, help="Timing repetitions over the corpus")
+    args = parser.parse_args()
+    run(args.llm_ms, args.repeat)
@@ -0,0 +1,189 @@
+"""
+Concurrency benchmark for the LLM client layer against a local fake OpenAI server.
+
+Usage:
+    python benchmarks/llm_concurrency.py [--requests 300] [--concurrency 300] [--latency 1.0]
+
+Steps:
+    1. Starts a fake /v1/chat/completions server on 127.0.0.1 (own thread + event loop)
+       that answers every request with a canned tool call after --latency seconds
+    2. "sync" mode: calls a blocking OpenAI client from coroutines (the old behaviour)
+    3. "async" mode: calls services.ai_service.parse_user_intent (shared AsyncOpenAI pool)
+    4. Reports wall time, throughput, p50/p95 request latency and the worst
+       event-loop stall observed by a 10 ms heartbeat task
+"""
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+
+from _bootstrap import setup_env, percentile
+
+_COMPLETION = {
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [{
+        "index": 0,
+        "finish_reason": "tool_calls",
+        "message": {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": "call_bench",
+                "type": "function",
+                "function": {
+                    "name": "read_calendar",
+                    "arguments": json.dumps({"days_ahead": 1, "days_back": 0}),
+                },
+            }],
+        },
+    }],
+    "usage": {"prompt_tokens": 1500, "completion_tokens": 20, "total_tokens": 1520},
+}
+
+
+class FakeOpenAIServer:
+    """Minimal keep-alive HTTP/1.1 server answering chat completions after a fixed delay."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.port = self._free_port()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            return s.getsockname()[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def start(self) -> None:
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(
+            asyncio.start_server(self._handle, "127.0.0.1", self.port, backlog=2048)
+        )
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        body = json.dumps(_COMPLETION).encode()
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode("latin-1").split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                await asyncio.sleep(self.latency)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Connection: keep-alive\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _heartbeat(stop: asyncio.Event, stalls: list) -> None:
+    """Record how late a 10 ms timer fires — a direct measure of event-loop blocking."""
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(0.01)
+        stalls.append(time.perf_counter() - t0 - 0.01)
+
+
+async def _drive(label: str, call, n_requests: int, concurrency: int) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list = []
+    errors = 0
+
+    async def one() -> None:
+        nonlocal errors
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                await call()
+                latencies.append(time.perf_counter() - t0)
+            except Exception:
+                errors += 1
+
+    stop, stalls = asyncio.Event(), []
+    hb = asyncio.create_task(_heartbeat(stop, stalls))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n_requests)))
+    wall = time.perf_counter() - t0
+    stop.set()
+    await hb
+
+    return {
+        "mode": label,
+        "wall_s": wall,
+        "rps": len(latencies) / wall if wall else 0.0,
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+        "max_loop_stall_s": max(stalls) if stalls else 0.0,
+        "errors": errors,
+    }
+
+
+async def main(n_requests: int, concurrency: int, latency: float, skip_sync: bool) -> None:
+    server = FakeOpenAIServer(latency)
+    server.start()
+    setup_env(LLM_BASE_URL=server.base_url, LLM_MAX_CONNECTIONS=str(max(concurrency, 1)))
+
+    from openai import OpenAI
+    from services import ai_service
+
+    results = []
+
+    if not skip_sync:
+        sync_client = OpenAI(api_key="sk-bench", base_url=server.base_url)
+
+        async def sync_call():
+            # Old behaviour: a blocking client call inside a coroutine
+            sync_client.chat.completions.create(
+                model="gpt-4o-mini", messages=[{"role": "user", "content": "xem lịch hôm nay"}],
+            )
+
+        # Serialised calls: cap the sync run so it finishes in reasonable time
+        n_sync = min(n_requests, max(1, int(20 / max(latency, 0.01))))
+        results.append(await _drive(f"sync x{n_sync}", sync_call, n_sync, concurrency))
+
+    async def async_call():
+        await ai_service.parse_user_intent("xem lịch hôm nay")
+
+    results.append(await _drive(f"async x{n_requests}", async_call, n_requests, concurrency))
+    await ai_service.close_openai_client()
+
+    print(f"Fake server latency: {latency:.2f}s   concurrency: {concurrency}")
+    print(f"{'mode':<14}{'wall(s)':>10}{'req/s':>10}{'p50(s)':>10}{'p95(s)':>10}{'loop stall(s)':>15}{'errors':>8}")
+    for r in results:
+        print(f"{r['mode']:<14}{r['wall_s']:>10.2f}{r['rps']:>10.1f}{r['p50_s']:>10.3f}"
+              f"{r['p95_s']:>10.3f}{r['max_loop_stall_s']:>15.3f}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300, help="Total requests per mode")
+    parser.add_argument("--concurrency", type=int, default=300, help="Max in-flight requests")
+    parser.add_argument("--latency", type=float, default=1.0, help="Fake completion latency (seconds)")
+    parser.add_argument("--skip-sync", action="store_true", help="Only run the async client")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.latency, args.skip_sync))
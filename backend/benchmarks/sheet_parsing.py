@@ -0,0 +1,131 @@
+"""
+Parse throughput of the "Giao dịch" transaction columns: per-row vs columnar.
+
+Usage:
+    python benchmarks/sheet_parsing.py [--rows 10000 100000] [--repeat 5]
+
+Steps:
+    1. Generates a values matrix shaped like a values.batchGet of A5:E (Vietnamese
+       amounts "27.000 ₫" / "1.600.000,00 đ", DD/MM/YYYY dates over two years, a
+       dozen categories, ~5% blank rows and ~5% rows shifted into column B).
+    2. Times the previous per-row parser (kept below as the reference) and
+       services.transaction_columns (parse only, and parse + to_rows as used by
+       sync_ledger), checking that both produce the same rows.
+
+Reports the best-of-repeat time and rows per second for each.
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from _bootstrap import percentile  # noqa: F401 - also puts backend/ on sys.path
+from services.transaction_columns import parse_expense_columns
+
+CATEGORIES = ["Ăn uống", "Di chuyển", "Mua sắm", "Giải trí", "Hóa đơn", "Sức khỏe",
+              "Giáo dục", "Nhà cửa", "Quà tặng", "Du lịch", "Cà phê", "Khác"]
+
+
+def make_values(rows: int, seed: int = 7):
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    values = []
+    for _ in range(rows):
+        roll = rng.random()
+        if roll < 0.05:
+            values.append([] if rng.random() < 0.5 else ["", "", ""])
+            continue
+        day = start + timedelta(days=rng.randrange(730))
+        amount = rng.randrange(5, 5000) * 1000
+        amount_text = (f"{amount:,}".replace(",", ".") + " ₫") if rng.random() < 0.8 \
+            else f"{amount:,}".replace(",", ".") + ",00 đ"
+        row = [f"{day.day:02d}/{day.month:02d}/{day.year}", amount_text,
+               f"giao dịch {rng.randrange(1000)}", rng.choice(CATEGORIES)]
+        values.append([""] + row if roll < 0.10 else row)
+    return values
+
+
+# --- Reference: the per-row parser services.sheets_service used before ---
+
+def _ref_amount(value):
+    if not value:
+        return 0.0
+    try:
+        v = str(value).replace("₫", "").replace("đ", "").strip()
+        v = v.replace(".", "").replace(",", ".") if "," in v else v.replace(".", "")
+        return float(v)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _ref_date(date_str):
+    if not date_str:
+        return ""
+    parts = str(date_str).strip().split("/")
+    if len(parts) == 3:
+        day, month, year = parts
+        return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+    return date_str
+
+
+def reference_parse(values):
+    rows = []
+    for idx, row in enumerate(values, start=5):
+        if not row or all(not str(cell).strip() for cell in row if cell):
+            continue
+        if len(row) > 0 and not str(row[0]).strip() and len(row) > 1 and str(row[1]).strip():
+            cells = row[1:5]
+        else:
+            cells = row[0:4]
+        cells = cells + [""] * (4 - len(cells))
+        if not str(cells[0]).strip():
+            continue
+        rows.append({
+            "date": _ref_date(cells[0]),
+            "amount": _ref_amount(cells[1]),
+            "description": cells[2].strip(),
+            "category": cells[3].strip(),
+            "row_number": idx,
+        })
+    return rows
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def report(label: str, seconds: float, rows: int) -> None:
+    print(f"  {label:<28} {seconds * 1000:9.1f} ms   {rows / seconds / 1e6:6.2f} M rows/s")
+
+
+def run(rows: int, repeat: int) -> None:
+    values = make_values(rows)
+    expected = reference_parse(values)
+    assert parse_expense_columns(values, 5).to_rows() == expected, "columnar parser disagrees with the reference"
+
+    print(f"\n{rows:,} rows ({len(expected):,} transactions)")
+    per_row = best_of(lambda: reference_parse(values), repeat)
+    report("per-row (reference)", per_row, rows)
+    columnar = best_of(lambda: parse_expense_columns(values, 5), repeat)
+    report("columnar parse", columnar, rows)
+    with_rows = best_of(lambda: parse_expense_columns(values, 5).to_rows(), repeat)
+    report("columnar parse + to_rows", with_rows, rows)
+    print(f"  speedup: {per_row / columnar:.1f}x parse, {per_row / with_rows:.1f}x parse + to_rows")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
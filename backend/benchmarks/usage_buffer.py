@@ -0,0 +1,101 @@
+"""
+Hot-path cost of logging token usage: synchronous commit per call vs the usage buffer.
+
+Usage:
+    python benchmarks/usage_buffer.py [--calls 2000] [--concurrency 50]
+
+Steps:
+    1. Creates a user + assistant session in benchmarks/bench.db
+    2. "direct": TokenUsageService.log_token_usage with a db session (one insert +
+       commit per call, as every LLM call used to do)
+    3. "buffered": log_token_usage without db → services.usage_buffer, then stop()
+       to flush; reports per-call latency seen by the caller, total time including
+       the final flush, batches written and dropped records
+"""
+import argparse
+import asyncio
+import time
+
+from _bootstrap import setup_env, percentile
+
+setup_env()
+
+from config.database import SessionLocal, create_all_tables  # noqa: E402
+from models.assistant_session import AssistantSession  # noqa: E402
+from models.token_usage import TokenUsage  # noqa: E402
+from models.user import User  # noqa: E402
+from services.chat_service import ChatService  # noqa: E402
+from services.executors import shutdown_executors  # noqa: E402
+from services.token_usage_service import TokenUsageService  # noqa: E402
+from services.usage_buffer import usage_buffer  # noqa: E402
+
+
+def _ensure_session() -> int:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "bench@example.com").first()
+        if not user:
+            user = User(email="bench@example.com", name="Bench")
+            db.add(user)
+            db.commit()
+        session = db.query(AssistantSession).filter(AssistantSession.user_id == user.user_id).first()
+        if not session:
+            session = ChatService.create_session(db, user.user_id, title="bench")
+        return session.session_id
+    finally:
+        db.close()
+
+
+async def _log(session_id: int, db=None) -> float:
+    t0 = time.perf_counter()
+    await TokenUsageService.log_token_usage(
+        session_id=session_id, prompt_tokens=900, completion_tokens=40,
+        total_tokens=940, cached_tokens=768, model="gpt-4o-mini", db=db,
+    )
+    return (time.perf_counter() - t0) * 1000
+
+
+async def _run(session_id: int, calls: int, concurrency: int, buffered: bool) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    db = None if buffered else SessionLocal()
+    timings = []
+
+    async def one():
+        async with sem:
+            timings.append(await _log(session_id, db))
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    if buffered:
+        await usage_buffer.stop()
+    total = time.perf_counter() - t0
+    if db is not None:
+        db.close()
+    return {"avg": sum(timings) / len(timings), "p95": percentile(timings, 95), "total": total}
+
+
+async def main(calls: int, concurrency: int) -> None:
+    create_all_tables()
+    session_id = _ensure_session()
+    db = SessionLocal()
+    before = db.query(TokenUsage).count()
+    db.close()
+
+    print(f"{'mode':<10}{'calls':>7}{'avg(ms)':>10}{'p95(ms)':>10}{'total(s)':>10}")
+    for mode in ("direct", "buffered"):
+        r = await _run(session_id, calls, concurrency, mode == "buffered")
+        print(f"{mode:<10}{calls:>7}{r['avg']:>10.3f}{r['p95']:>10.3f}{r['total']:>10.2f}")
+
+    db = SessionLocal()
+    written = db.query(TokenUsage).count() - before
+    db.close()
+    print(f"rows written: {written} (expected {2 * calls}); buffer: {usage_buffer.stats()}")
+    shutdown_executors()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000, help="log_token_usage calls per mode")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent callers")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.concurrency))
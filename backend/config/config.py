@@ -8,6 +8,14 @@ class Settings(BaseSettings):
     # Database (SENSITIVE - No defaults)
     database_url: str
     sql_echo: bool = False
+
+    # Connection pool (server databases and file SQLite; in-memory SQLite keeps one shared connection)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: int = 30  # wait this long for a free connection, then fail
+    db_pool_recycle_seconds: int = 1800  # replace connections older than this (-1 disables)
+    db_pool_pre_ping: bool = True  # test connections on checkout and reconnect if dropped
+    db_async_enabled: bool = False  # serve ported queries through the async engine (asyncpg / aiosqlite)
     
     # OpenAI / LLM (API keys are SENSITIVE)
     llm_model: str = "gpt-4o-mini"
@@ -15,6 +23,20 @@ class Settings(BaseSettings):
     llm_max_tokens: int = 1000
     llm_temperature: float = 0.7
     llm_timeout: int = 30
+    llm_base_url: Optional[str] = None  # Override for OpenAI-compatible gateways / local fakes
+    llm_max_connections: int = 500
+    llm_max_keepalive_connections: int = 100
+
+    # Local rule-based parser for short expense/income messages (skips the LLM on a hit)
+    intent_fastpath_enabled: bool = True
+    intent_fastpath_min_confidence: float = 0.9
+
+    # Replay parse_user_intent results for repeated phrasings (per user, category set and day)
+    intent_cache_enabled: bool = True
+    intent_cache_ttl_seconds: int = 600
+    intent_cache_max_entries: int = 5000
+    intent_cache_write_intents: bool = False  # also cache expense/income/calendar writes
+    intent_cache_min_confidence: float = 0.9  # fallback replies (unknown tool, no tool call) are never cached
     
     # Google OAuth (SENSITIVE credentials - No defaults)
     google_client_id: str
@@ -23,13 +45,47 @@ class Settings(BaseSettings):
     google_redirect_uri: str
     google_token_refresh: Optional[str] = None
     google_scopes: str
+
+    # Pooled, authorised Google API clients per (user, API)
+    google_client_pool_size: int = 256
+    google_client_pool_ttl_seconds: int = 1800
+    auth_cache_ttl_seconds: int = 60  # cached credentials / has_valid_token verdicts per user
+
+    # Background refresh of access tokens shortly before they expire
+    token_refresh_enabled: bool = True
+    token_refresh_interval_seconds: int = 60
+    token_refresh_lead_seconds: int = 300  # refresh tokens expiring within this window
+    token_refresh_retry_seconds: int = 900  # back-off after a failed refresh (e.g. revoked grant)
+    token_refresh_concurrency: int = 8
+
+    # Thread pools for blocking work called from async routes (see services/executors.py)
+    google_io_workers: int = 32
+    db_workers: int = 16
     
+    # Buffered token_usage writes (see services/usage_buffer.py)
+    usage_buffer_max_records: int = 10000
+    usage_flush_batch_size: int = 200
+    usage_flush_interval_ms: int = 1000
+    usage_enqueue_timeout_ms: int = 50  # wait this long for queue space, then drop the record
+
     # Encryption (SENSITIVE - No defaults)
     # Generate with: python -c 'from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())'
     encryption_key: str
 
     # Google Sheets — ID from spreadsheet URL (docs.google.com/spreadsheets/d/{ID}/edit)
     google_sheet_id: str = ""
+    sheets_metadata_ttl_seconds: int = 300  # cached tab titles / numeric sheetIds
+    ledger_reconcile_interval_seconds: int = 300  # re-read "Giao dịch" into the local ledger after this
+
+    # Local calendar event store (see services/calendar_store.py)
+    calendar_sync_interval_seconds: int = 60  # incremental syncToken sync when the store is older than this
+    calendar_sync_days_back: int = 90  # window mirrored by a full sync
+    calendar_sync_days_ahead: int = 365
+    # Free-slot search / conflict checks (see services/calendar_index.py)
+    calendar_timezone: str = "Asia/Ho_Chi_Minh"
+    calendar_work_start_hour: int = 8
+    calendar_work_end_hour: int = 18
+    calendar_work_weekends: bool = False
 
     # Kaggle — used only by evals scripts, not required for app runtime
     kaggle_api_token: str = ""
@@ -87,6 +143,8 @@ class Settings(BaseSettings):
                 "max_tokens": self.llm_max_tokens,
                 "temperature": self.llm_temperature,
                 "timeout": self.llm_timeout,
+                "base_url": self.llm_base_url,
+                "max_connections": self.llm_max_connections,
             },
         }
 
@@ -1,24 +1,165 @@
-from typing import Generator
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Deque, Dict, Generator, Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 from config.config import settings
 import os
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
 # Database URL (loaded from .env via config.settings)
 DATABASE_URL = settings.database_url
+IS_SQLITE = make_url(DATABASE_URL).get_backend_name() == "sqlite"
+# An in-memory SQLite database exists only on its one connection, so it cannot be pooled
+IS_SQLITE_MEMORY = IS_SQLITE and (
+    make_url(DATABASE_URL).database in (None, "", ":memory:") or "mode=memory" in DATABASE_URL
+)
+
+# Recent checkout waits kept for percentiles
+_SAMPLE_WINDOW = 1024
+
+# Async driver per backend for the async engine
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+class PoolWaitStats:
+    """
+    Checkout counters for one connection pool.
+
+    wait_ms is how long a checkout waited for a free connection (near zero while the
+    pool has idle connections). A steadily high p95 means db_pool_size/db_max_overflow
+    is too small for the load; timeouts are checkouts that gave up after
+    db_pool_timeout_seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wait_ms: Deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.max_wait_ms = 0.0
+
+    def record(self, wait_ms: float, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.checkouts += 1
+            else:
+                self.timeouts += 1
+            self._wait_ms.append(wait_ms)
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self._wait_ms)
+        pick = lambda pct: ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_ms_p50": pick(50),
+            "wait_ms_p95": pick(95),
+            "wait_ms_max": self.max_wait_ms,
+        }
+
+
+class _WaitTimedPool:
+    """Mixin timing _do_get, the step where a checkout blocks until a connection is free."""
+    wait_stats: PoolWaitStats
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        ok = False
+        try:
+            conn = super()._do_get()
+            ok = True
+            return conn
+        finally:
+            self.wait_stats.record((time.perf_counter() - started_at) * 1000, ok)
+
+
+class InstrumentedQueuePool(_WaitTimedPool, QueuePool):
+    wait_stats = PoolWaitStats()
+
+
+class InstrumentedAsyncQueuePool(_WaitTimedPool, AsyncAdaptedQueuePool):
+    wait_stats = PoolWaitStats()
+
 
-# Create engine
+def _pool_kwargs(poolclass) -> Dict[str, Any]:
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _connect_args() -> Dict[str, Any]:
+    if not IS_SQLITE:
+        return {}
+    # Connections move between executor threads; a writer waits this long for another's lock
+    return {"check_same_thread": False, "timeout": settings.db_pool_timeout_seconds}
+
+
+# Create engine. Every checkout gets its own connection, so sessions on the DB executor,
+# the usage buffer and the token refresher never share a transaction; only an in-memory
+# SQLite database keeps one shared connection (and a single DB worker, see executors.py)
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-    poolclass=StaticPool if "sqlite" in DATABASE_URL else None,
+    connect_args=_connect_args(),
     echo=os.getenv("SQL_ECHO", "false").lower() == "true",
+    **({"poolclass": StaticPool} if IS_SQLITE_MEMORY else _pool_kwargs(InstrumentedQueuePool)),
 )
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine / session factory, created on first use so greenlet and the async drivers
+# are only needed when something actually uses them (db_async_enabled)
+_async_engine: Optional["AsyncEngine"] = None
+_async_session_factory: Optional["async_sessionmaker"] = None
+
+
+def get_async_engine() -> "AsyncEngine":
+    """
+    Async engine on the same database: asyncpg for Postgres, aiosqlite for SQLite.
+
+    Pool settings are shared with the sync engine; each engine has its own pool.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = make_url(DATABASE_URL)
+        url = url.set(drivername=_ASYNC_DRIVERS[url.get_backend_name()])
+        _async_engine = create_async_engine(
+            url,
+            echo=os.getenv("SQL_ECHO", "false").lower() == "true",
+            **({} if IS_SQLITE else _pool_kwargs(InstrumentedAsyncQueuePool)),
+        )
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_engine
+
+
+def AsyncSessionLocal() -> "AsyncSession":
+    """New AsyncSession bound to the async engine (use as `async with AsyncSessionLocal() as db`)."""
+    get_async_engine()
+    return _async_session_factory()
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's pooled connections (application shutdown)."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
+
 
 def get_db() -> Generator[Session, None, None]:
     """Dependency for getting database session"""
@@ -29,6 +170,33 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator["AsyncSession", None]:
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def db_pool_stats() -> Dict[str, Any]:
+    """Pool occupancy and checkout wait times for the sync and (if created) async engines."""
+    result = {}
+    pools = {"sync": engine.pool}
+    if _async_engine is not None:
+        pools["async"] = _async_engine.sync_engine.pool
+    for name, pool in pools.items():
+        stats: Dict[str, Any] = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "idle": pool.checkedin(),
+            })
+        if isinstance(pool, _WaitTimedPool):
+            stats.update(pool.wait_stats.stats())
+        result[name] = stats
+    return result
+
+
 def create_all_tables():
     """Create all tables in database"""
     from models.base import Base
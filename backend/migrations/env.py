@@ -27,7 +27,8 @@ from models.base import Base
 from models import (
     user, workspace, assistant_session, message, calendar,
     connected_account, integration, audit_log, token_usage,
-    tool_call, tool_result, sheet, oauth_token
+    tool_call, tool_result, sheet, oauth_token, ledger, usage_rollup,
+    calendar_event
 )
 
 target_metadata = Base.metadata
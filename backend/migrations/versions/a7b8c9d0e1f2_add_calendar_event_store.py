@@ -0,0 +1,58 @@
+"""Add calendar_event and calendar_sync_state
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, Sequence[str], None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'calendar_event',
+        sa.Column('entry_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('calendar_id', sa.String(length=255), nullable=False),
+        sa.Column('event_id', sa.String(length=1024), nullable=False),
+        sa.Column('start_at', sa.DateTime(), nullable=False),
+        sa.Column('end_at', sa.DateTime(), nullable=False),
+        sa.Column('all_day', sa.Boolean(), nullable=False),
+        sa.Column('resource_json', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.user_id']),
+        sa.PrimaryKeyConstraint('entry_id'),
+        sa.UniqueConstraint('user_id', 'calendar_id', 'event_id', name='uq_calendar_event_event'),
+    )
+    op.create_index(op.f('ix_calendar_event_entry_id'), 'calendar_event', ['entry_id'], unique=False)
+    op.create_index('ix_calendar_event_window', 'calendar_event',
+                    ['user_id', 'calendar_id', 'start_at', 'end_at'], unique=False)
+
+    op.create_table(
+        'calendar_sync_state',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('calendar_id', sa.String(length=255), nullable=False),
+        sa.Column('sync_token', sa.Text(), nullable=True),
+        sa.Column('window_start', sa.DateTime(), nullable=False),
+        sa.Column('window_end', sa.DateTime(), nullable=False),
+        sa.Column('synced_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.user_id']),
+        sa.PrimaryKeyConstraint('user_id', 'calendar_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('calendar_sync_state')
+    op.drop_index('ix_calendar_event_window', table_name='calendar_event')
+    op.drop_index(op.f('ix_calendar_event_entry_id'), table_name='calendar_event')
+    op.drop_table('calendar_event')
@@ -0,0 +1,53 @@
+"""Add ledger_entry and ledger_sync_state
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, Sequence[str], None] = 'b2c3d4e5f6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ledger_entry',
+        sa.Column('entry_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('spreadsheet_id', sa.String(length=500), nullable=False),
+        sa.Column('kind', sa.String(length=10), nullable=False),
+        sa.Column('row_number', sa.Integer(), nullable=False),
+        sa.Column('date', sa.String(length=10), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('description', sa.String(length=500), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.user_id']),
+        sa.PrimaryKeyConstraint('entry_id'),
+        sa.UniqueConstraint('user_id', 'spreadsheet_id', 'kind', 'row_number', name='uq_ledger_entry_row'),
+    )
+    op.create_index(op.f('ix_ledger_entry_entry_id'), 'ledger_entry', ['entry_id'], unique=False)
+
+    op.create_table(
+        'ledger_sync_state',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('spreadsheet_id', sa.String(length=500), nullable=False),
+        sa.Column('synced_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.user_id']),
+        sa.PrimaryKeyConstraint('user_id', 'spreadsheet_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ledger_sync_state')
+    op.drop_index(op.f('ix_ledger_entry_entry_id'), table_name='ledger_entry')
+    op.drop_table('ledger_entry')
@@ -0,0 +1,154 @@
+"""Add usage_rollup and assistant_session.total_tokens / total_cost
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, Sequence[str], None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BACKFILL_BATCH = 5000
+
+# Snapshot of services/usage_rollup.py pricing (USD per 1M tokens: input, cached input,
+# output), kept here so this migration does not depend on app code that may change
+_PRICING_PER_1M: Dict[str, Tuple[float, float, float]] = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+}
+_COUNTERS = ("request_count", "prompt_tokens", "completion_tokens", "cached_tokens", "total_tokens", "cost")
+
+
+def upgrade() -> None:
+    op.create_table(
+        'usage_rollup',
+        sa.Column('rollup_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=10), nullable=False),
+        sa.Column('period_start', sa.String(length=10), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('request_count', sa.Integer(), nullable=False),
+        sa.Column('prompt_tokens', sa.BigInteger(), nullable=False),
+        sa.Column('completion_tokens', sa.BigInteger(), nullable=False),
+        sa.Column('cached_tokens', sa.BigInteger(), nullable=False),
+        sa.Column('total_tokens', sa.BigInteger(), nullable=False),
+        sa.Column('cost', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.user_id']),
+        sa.PrimaryKeyConstraint('rollup_id'),
+        sa.UniqueConstraint('user_id', 'period', 'period_start', 'model', name='uq_usage_rollup_bucket'),
+    )
+    op.create_index(op.f('ix_usage_rollup_rollup_id'), 'usage_rollup', ['rollup_id'], unique=False)
+
+    op.add_column('assistant_session', sa.Column('total_tokens', sa.BigInteger(), nullable=False, server_default='0'))
+    op.add_column('assistant_session', sa.Column('total_cost', sa.Float(), nullable=False, server_default='0'))
+
+    _backfill()
+
+
+def _estimate_cost(model: str, prompt: int, completion: int, cached: int) -> float:
+    matches = [m for m in _PRICING_PER_1M if model.startswith(m)]
+    if not matches:
+        return (prompt + completion) / 1000 * 0.03
+    input_price, cached_price, output_price = _PRICING_PER_1M[max(matches, key=len)]
+    return (max(prompt - cached, 0) * input_price + cached * cached_price + completion * output_price) / 1_000_000
+
+
+def _backfill() -> None:
+    """Fold existing token_usage rows into the new rollups and session totals."""
+    bind = op.get_bind()
+    token_usage = sa.table(
+        'token_usage',
+        sa.column('usage_id', sa.Integer()),
+        sa.column('session_id', sa.Integer()),
+        sa.column('amount', sa.Integer()),
+        sa.column('meta_data', sa.Text()),
+        sa.column('created_at', sa.DateTime()),
+    )
+    assistant_session = sa.table(
+        'assistant_session',
+        sa.column('session_id', sa.Integer()),
+        sa.column('user_id', sa.Integer()),
+        sa.column('total_tokens', sa.BigInteger()),
+        sa.column('total_cost', sa.Float()),
+    )
+    usage_rollup = sa.table('usage_rollup', *(
+        [sa.column(c) for c in ('user_id', 'period', 'period_start', 'model', 'created_at', 'updated_at')]
+        + [sa.column(c) for c in _COUNTERS]
+    ))
+
+    # (user_id, period, period_start, model) -> counters; the table is new, so plain inserts
+    buckets: Dict[Tuple[int, str, str, str], Dict[str, float]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+    session_totals: Dict[int, List[float]] = defaultdict(lambda: [0, 0.0])  # session_id -> [tokens, cost]
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(
+                token_usage.c.usage_id, token_usage.c.session_id, token_usage.c.amount,
+                token_usage.c.meta_data, token_usage.c.created_at, assistant_session.c.user_id,
+            )
+            .select_from(token_usage.join(
+                assistant_session, assistant_session.c.session_id == token_usage.c.session_id
+            ))
+            .where(token_usage.c.usage_id > last_id)
+            .order_by(token_usage.c.usage_id)
+            .limit(_BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        for usage_id, session_id, amount, meta_data, created_at, user_id in rows:
+            meta = json.loads(meta_data or "{}")
+            model = meta.get("model") or "unknown"
+            prompt = int(meta.get("prompt_tokens") or 0)
+            completion = int(meta.get("completion_tokens") or 0)
+            cached = int(meta.get("cached_tokens") or 0)
+            cost = _estimate_cost(model, prompt, completion, cached)
+            session_totals[session_id][0] += int(amount or 0)
+            session_totals[session_id][1] += cost
+            for period, start in (("day", created_at.strftime("%Y-%m-%d")), ("month", created_at.strftime("%Y-%m"))):
+                bucket = buckets[(user_id, period, start, model)]
+                bucket["request_count"] += 1
+                bucket["prompt_tokens"] += prompt
+                bucket["completion_tokens"] += completion
+                bucket["cached_tokens"] += cached
+                bucket["total_tokens"] += int(amount or 0)
+                bucket["cost"] += cost
+        last_id = rows[-1].usage_id
+
+    now = datetime.utcnow()
+    if buckets:
+        bind.execute(usage_rollup.insert(), [
+            {"user_id": u, "period": p, "period_start": s, "model": m, "created_at": now, "updated_at": now, **c}
+            for (u, p, s, m), c in buckets.items()
+        ])
+
+    # updated_at is left alone: the session list is ordered by it
+    if session_totals:
+        bind.execute(
+            assistant_session.update()
+            .where(assistant_session.c.session_id == sa.bindparam('sid'))
+            .values(total_tokens=sa.bindparam('tokens'), total_cost=sa.bindparam('cost')),
+            [{"sid": sid, "tokens": tokens, "cost": cost} for sid, (tokens, cost) in session_totals.items()],
+        )
+
+
+def downgrade() -> None:
+    op.drop_column('assistant_session', 'total_cost')
+    op.drop_column('assistant_session', 'total_tokens')
+    op.drop_index(op.f('ix_usage_rollup_rollup_id'), table_name='usage_rollup')
+    op.drop_table('usage_rollup')
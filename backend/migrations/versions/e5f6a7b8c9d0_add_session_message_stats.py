@@ -0,0 +1,40 @@
+"""Add message_count and last_message_at to assistant_session
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, Sequence[str], None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('assistant_session', sa.Column('message_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('assistant_session', sa.Column('last_message_at', sa.DateTime(), nullable=True))
+
+    # Backfill from existing messages
+    op.execute(
+        """
+        UPDATE assistant_session SET
+            message_count = (
+                SELECT COUNT(*) FROM message WHERE message.session_id = assistant_session.session_id
+            ),
+            last_message_at = (
+                SELECT MAX(message.created_at) FROM message WHERE message.session_id = assistant_session.session_id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('assistant_session', 'last_message_at')
+    op.drop_column('assistant_session', 'message_count')
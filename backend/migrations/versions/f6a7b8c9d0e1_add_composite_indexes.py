@@ -0,0 +1,39 @@
+"""Add composite indexes for chat and token hot queries
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, Sequence[str], None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (new composite index, table, columns, single-column index it makes redundant)
+_INDEXES = [
+    ('ix_message_session_created', 'message', ['session_id', 'created_at', 'message_id'], 'ix_message_session_id'),
+    ('ix_assistant_session_user_updated', 'assistant_session', ['user_id', 'updated_at', 'session_id', 'status'],
+     'ix_assistant_session_user_id'),
+    ('ix_connected_account_user_provider', 'connected_account', ['user_id', 'provider'], 'ix_connected_account_user_id'),
+    ('ix_oauth_token_account_expires', 'oauth_token', ['connected_account_id', 'expires_at'],
+     'ix_oauth_token_connected_account_id'),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, replaced in _INDEXES:
+        op.create_index(name, table, columns, unique=False)
+        # The new index has the old one's column as its prefix, so it serves the same lookups
+        op.drop_index(replaced, table_name=table)
+
+
+def downgrade() -> None:
+    for name, table, columns, replaced in reversed(_INDEXES):
+        op.create_index(replaced, table, columns[:1], unique=False)
+        op.drop_index(name, table_name=table)
@@ -12,6 +12,9 @@ from models.sheet import Sheet
 from models.integration import Integration
 from models.audit_log import AuditLog, AuditAction
 from models.token_usage import TokenUsage
+from models.ledger import LedgerEntry, LedgerSyncState
+from models.usage_rollup import UsageRollup
+from models.calendar_event import CalendarEventEntry, CalendarSyncState
 
 __all__ = [
     "Base",
@@ -34,4 +37,9 @@ __all__ = [
     "AuditLog",
     "AuditAction",
     "TokenUsage",
+    "LedgerEntry",
+    "LedgerSyncState",
+    "UsageRollup",
+    "CalendarEventEntry",
+    "CalendarSyncState",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, BigInteger, Float, String, Text, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from models.base import Base, TimestampMixin
@@ -16,12 +16,22 @@ class SessionStatus(str, enum.Enum):
 class AssistantSession(TimestampMixin, Base):
     """Assistant session model - represents a conversation session"""
     __tablename__ = "assistant_session"
+    __table_args__ = (
+        # Sidebar listing: WHERE user_id = ? AND status != ? ORDER BY updated_at DESC, session_id DESC.
+        # status trails the sort keys so the != filter is checked in the index while it
+        # still yields rows in updated_at order.
+        Index("ix_assistant_session_user_updated", "user_id", "updated_at", "session_id", "status"),
+    )
 
     session_id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
     workspace_id = Column(Integer, ForeignKey("workspace.workspace_id"), nullable=False, index=True)
     title = Column(String(255), nullable=True)
     status = Column(Enum(SessionStatus), default=SessionStatus.ACTIVE)
+    total_tokens = Column(BigInteger, nullable=False, default=0, server_default="0")  # kept in sync by usage_rollup
+    total_cost = Column(Float, nullable=False, default=0, server_default="0")  # USD, kept in sync by usage_rollup
+    message_count = Column(Integer, nullable=False, default=0, server_default="0")  # kept in sync by ChatService
+    last_message_at = Column(DateTime, nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="assistant_sessions")
@@ -0,0 +1,44 @@
+import json
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, UniqueConstraint
+from datetime import datetime
+from models.base import Base, TimestampMixin
+
+
+class CalendarEventEntry(TimestampMixin, Base):
+    """Calendar event entry - local mirror of one (expanded) Google Calendar event"""
+    __tablename__ = "calendar_event"
+    __table_args__ = (
+        UniqueConstraint("user_id", "calendar_id", "event_id", name="uq_calendar_event_event"),
+        # Window reads: WHERE user_id = ? AND calendar_id = ? AND start_at < ? AND end_at > ? ORDER BY start_at
+        Index("ix_calendar_event_window", "user_id", "calendar_id", "start_at", "end_at"),
+    )
+
+    entry_id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
+    calendar_id = Column(String(255), nullable=False)  # e.g. "primary"
+    event_id = Column(String(1024), nullable=False)  # Google event id (instance id for recurring events)
+    start_at = Column(DateTime, nullable=False)  # UTC
+    end_at = Column(DateTime, nullable=False)  # UTC
+    all_day = Column(Boolean, nullable=False, default=False)
+    resource_json = Column(Text, nullable=False)  # event resource as returned by the Calendar API
+
+    def to_dict(self) -> dict:
+        return json.loads(self.resource_json)
+
+    def __repr__(self):
+        return f"<CalendarEventEntry(id={self.entry_id}, user_id={self.user_id}, event_id={self.event_id})>"
+
+
+class CalendarSyncState(Base):
+    """Sync position of one user's calendar: Google syncToken and the window covered by the last full sync"""
+    __tablename__ = "calendar_sync_state"
+
+    user_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    calendar_id = Column(String(255), primary_key=True)
+    sync_token = Column(Text, nullable=True)
+    window_start = Column(DateTime, nullable=False)  # UTC
+    window_end = Column(DateTime, nullable=False)  # UTC
+    synced_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CalendarSyncState(user_id={self.user_id}, calendar_id={self.calendar_id}, synced_at={self.synced_at})>"
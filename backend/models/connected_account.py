@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from models.base import Base, TimestampMixin
@@ -7,9 +7,12 @@ from models.base import Base, TimestampMixin
 class ConnectedAccount(TimestampMixin, Base):
     """Connected account for OAuth/integrations"""
     __tablename__ = "connected_account"
+    __table_args__ = (
+        Index("ix_connected_account_user_provider", "user_id", "provider"),
+    )
 
     connected_account_id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
     provider = Column(String(100), nullable=False)  # e.g., "google", "outlook"
     account_email = Column(String(255), nullable=False)
     is_primary = Column(Boolean, default=False)
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+from models.base import Base, TimestampMixin
+
+
+class LedgerEntry(TimestampMixin, Base):
+    """Ledger entry - local mirror of one expense/income row of the "Giao dịch" sheet"""
+    __tablename__ = "ledger_entry"
+    __table_args__ = (
+        # Also serves the (user, spreadsheet, kind) ORDER BY row_number reads
+        UniqueConstraint("user_id", "spreadsheet_id", "kind", "row_number", name="uq_ledger_entry_row"),
+    )
+
+    entry_id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
+    spreadsheet_id = Column(String(500), nullable=False)
+    kind = Column(String(10), nullable=False)  # "expense" | "income"
+    row_number = Column(Integer, nullable=False)  # 1-based sheet row
+    date = Column(String(10), nullable=False)  # YYYY-MM-DD
+    amount = Column(Float, nullable=False)
+    description = Column(String(500), nullable=False, default="")
+    category = Column(String(100), nullable=False, default="")
+
+    def to_dict(self) -> dict:
+        return {
+            "date": self.date,
+            "amount": self.amount,
+            "description": self.description,
+            "category": self.category,
+            "row_number": self.row_number,
+        }
+
+    def __repr__(self):
+        return f"<LedgerEntry(id={self.entry_id}, user_id={self.user_id}, kind={self.kind}, row={self.row_number})>"
+
+
+class LedgerSyncState(Base):
+    """When the ledger of one user/spreadsheet was last reconciled against the sheet"""
+    __tablename__ = "ledger_sync_state"
+
+    user_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    spreadsheet_id = Column(String(500), primary_key=True)
+    synced_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<LedgerSyncState(user_id={self.user_id}, spreadsheet_id={self.spreadsheet_id}, synced_at={self.synced_at})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from models.base import Base, TimestampMixin
 import enum
@@ -14,9 +14,13 @@ class MessageRole(str, enum.Enum):
 class Message(TimestampMixin, Base):
     """Message model - represents a message in a session"""
     __tablename__ = "message"
+    __table_args__ = (
+        # History reads: WHERE session_id = ? ORDER BY created_at, message_id
+        Index("ix_message_session_created", "session_id", "created_at", "message_id"),
+    )
 
     message_id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("assistant_session.session_id"), nullable=False, index=True)
+    session_id = Column(Integer, ForeignKey("assistant_session.session_id"), nullable=False)
     role = Column(Enum(MessageRole), nullable=False)
     content = Column(Text, nullable=False)
     actions_json = Column(Text, nullable=True)
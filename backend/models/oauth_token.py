@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from models.base import Base, TimestampMixin
@@ -7,9 +7,13 @@ from models.base import Base, TimestampMixin
 class OAuthToken(TimestampMixin, Base):
     """OAuth token storage"""
     __tablename__ = "oauth_token"
+    __table_args__ = (
+        # Token lookup per account; expires_at lets the refresher's due scan skip the heap
+        Index("ix_oauth_token_account_expires", "connected_account_id", "expires_at"),
+    )
 
     oauth_token_id = Column(Integer, primary_key=True, index=True)
-    connected_account_id = Column(Integer, ForeignKey("connected_account.connected_account_id"), nullable=False, index=True)
+    connected_account_id = Column(Integer, ForeignKey("connected_account.connected_account_id"), nullable=False)
     access_token = Column(Text, nullable=False)
     refresh_token = Column(Text, nullable=True)
     token_type = Column(String(50), default="Bearer")
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Float, ForeignKey, UniqueConstraint
+from models.base import Base, TimestampMixin
+
+
+class UsageRollup(TimestampMixin, Base):
+    """Usage rollup - pre-aggregated LLM token usage per user, period and model"""
+    __tablename__ = "usage_rollup"
+    __table_args__ = (
+        # Also serves per-user lookups by period (leading user_id, period, period_start)
+        UniqueConstraint("user_id", "period", "period_start", "model", name="uq_usage_rollup_bucket"),
+    )
+
+    rollup_id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
+    period = Column(String(10), nullable=False)  # "day" | "month"
+    period_start = Column(String(10), nullable=False)  # "2026-10-18" | "2026-10"
+    model = Column(String(100), nullable=False)
+    request_count = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(BigInteger, nullable=False, default=0)
+    completion_tokens = Column(BigInteger, nullable=False, default=0)
+    cached_tokens = Column(BigInteger, nullable=False, default=0)
+    total_tokens = Column(BigInteger, nullable=False, default=0)
+    cost = Column(Float, nullable=False, default=0.0)  # USD
+
+    def __repr__(self):
+        return f"<UsageRollup(user_id={self.user_id}, {self.period}={self.period_start}, model={self.model})>"
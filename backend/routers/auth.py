@@ -9,6 +9,7 @@ from services.auth_service import (
     has_valid_token,
     logout as auth_logout
 )
+from services.executors import run_google, run_db
 from utils.oauth_utils import generate_pkce_pair, generate_authorization_url, validate_state
 from utils.encryption import encrypt_data, decrypt_data
 from schemas.user import UserResponse
@@ -35,7 +36,7 @@ async def auth_status(
         - **authenticated**: Boolean indicating if user is authenticated
         - **user_id**: User ID
     """
-    is_authenticated = has_valid_token(db, user_id)
+    is_authenticated = await run_google(has_valid_token, db, user_id)
     return {
         "authenticated": is_authenticated,
         "user_id": user_id
@@ -147,7 +148,7 @@ async def auth_callback(
         
         # Exchange code for token using code_verifier
         try:
-            result = handle_oauth_callback(code, code_verifier, db)
+            result = await run_google(handle_oauth_callback, code, code_verifier, db)
         except (GoogleOAuthError, InvalidEmailError) as e:
             return HTMLResponse(
                 content=f"""
@@ -222,7 +223,7 @@ async def logout(
     
     - **user_id**: User ID to logout (required)
     """
-    success = auth_logout(db, user_id)
+    success = await run_db(auth_logout, db, user_id)
     return {
         "success": success,
         "message": "Logged out successfully" if success else "Logout failed",
@@ -1,11 +1,26 @@
 """Calendar Router - Handles calendar endpoints"""
+import json
+import logging
+from datetime import date
+from typing import Optional
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from config.database import get_db
-from services.calendar_service import list_events, create_event, update_event, delete_event
+from config.database import get_db, SessionLocal
+from services.calendar_service import (
+    list_events, iter_events, create_event, update_event, delete_event, sync_calendar, batch_events,
+    find_free_slots,
+)
 from services.auth_service import has_valid_token
-from schemas.event import EventCreate, EventResponse, EventListResponse
-from exceptions import NoValidTokenError
+from services.executors import run_google
+from config.config import settings
+from schemas.event import (
+    EventCreate, EventResponse, EventListResponse, CalendarSyncResponse, EventBatchRequest, EventBatchResponse,
+    FreeSlotsResponse,
+)
+from exceptions import AssistAIException, NoValidTokenError
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["calendar"])
 
@@ -30,6 +45,7 @@ async def get_events(
     max_results: int = Query(100, description="Max events", ge=1, le=500),
     days_ahead: int = Query(7, description="Days to look ahead", ge=1, le=90),
     days_back: int = Query(0, description="Days to look back", ge=0, le=90),
+    stream: bool = Query(False, description="Stream events as NDJSON, one per line"),
     db: Session = Depends(get_db)
 ):
     """
@@ -38,23 +54,59 @@ async def get_events(
     - **user_id**: User ID (required)
     - **max_results**: Maximum events to return (default: 100)
     - **days_ahead**: Number of days to look ahead (default: 7)
+    - **stream**: Send each event as soon as it is read (application/x-ndjson) instead of
+      one {"events", "total"} body; a failure mid-stream ends it with an {"error_code", "message"} line
     """
     # Validate authentication
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
     
+    if stream:
+        return await _stream_events(user_id, max_results, days_ahead, days_back)
+    
     raw = await list_events(db, user_id, max_results, days_ahead, days_back)
     events = [_transform_event(e) for e in raw]
     return {"events": events, "total": len(events)}
 
 
+async def _stream_events(user_id: int, max_results: int, days_ahead: int, days_back: int) -> StreamingResponse:
+    # Own DB session: the request-scoped one is not guaranteed to outlive the response
+    stream_db = SessionLocal()
+    events = iter_events(stream_db, user_id, max_results, days_ahead, days_back)
+    try:
+        # Pull the first event before responding so auth/API errors still get a proper status code
+        first = await anext(events, None)
+    except Exception:
+        stream_db.close()
+        raise
+
+    async def lines():
+        try:
+            if first is None:
+                return
+            yield json.dumps(_transform_event(first), ensure_ascii=False) + "\n"
+            async for event in events:
+                yield json.dumps(_transform_event(event), ensure_ascii=False) + "\n"
+        except AssistAIException as e:
+            yield json.dumps({"error_code": e.error_code, "message": e.message}, ensure_ascii=False) + "\n"
+        except Exception:
+            logger.exception("Unhandled error in calendar events stream")
+            yield json.dumps({"error_code": "INTERNAL_ERROR", "message": "An unexpected error occurred"}) + "\n"
+        finally:
+            await events.aclose()
+            stream_db.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/events")
 async def create_event_handler(
     request: EventCreate,
     user_id: int = Query(..., description="User ID", gt=0),
+    check_conflicts: bool = Query(False, description="Return 409 EVENT_CONFLICT if the time overlaps another event"),
     db: Session = Depends(get_db)
 ):
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
     event = await create_event(
@@ -68,19 +120,59 @@ async def create_event_handler(
         attendees=request.attendees,
         recurrence=request.recurrence,
         timezone=request.timezone or "Asia/Ho_Chi_Minh",
+        check_conflicts=check_conflicts,
     )
 
     return _transform_event(event)
 
 
+@router.post("/events:batch", response_model=EventBatchResponse)
+async def batch_events_handler(
+    request: EventBatchRequest,
+    user_id: int = Query(..., description="User ID", gt=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Create, update and delete several events in one call (e.g. all events read from a poster)
+    
+    Every operation gets its own result; one failing operation does not stop the others.
+    Update only changes the fields it is given.
+    """
+    if not await run_google(has_valid_token, db, user_id):
+        raise NoValidTokenError(user_id)
+
+    operations = []
+    for item in request.items:
+        operation = {"op": item.op, "event_id": item.event_id}
+        if item.event is not None:
+            operation.update(
+                summary=item.event.summary,
+                start_datetime=item.event.start_datetime.isoformat(),
+                end_datetime=item.event.end_datetime.isoformat(),
+                description=item.event.description,
+                location=item.event.location,
+                attendees=item.event.attendees,
+                recurrence=item.event.recurrence,
+                timezone=item.event.timezone or "Asia/Ho_Chi_Minh",
+            )
+        operations.append(operation)
+
+    results = await batch_events(db, user_id, operations)
+    for result in results:
+        if result["event"] is not None:
+            result["event"] = _transform_event(result["event"])
+    return EventBatchResponse(success=all(r["success"] for r in results), results=results)
+
+
 @router.put("/events/{event_id}")
 async def update_event_handler(
     event_id: str,
     request: EventCreate,
     user_id: int = Query(..., description="User ID", gt=0),
+    check_conflicts: bool = Query(False, description="Return 409 EVENT_CONFLICT if the time overlaps another event"),
     db: Session = Depends(get_db)
 ):
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
     event = await update_event(
@@ -95,6 +187,7 @@ async def update_event_handler(
         attendees=request.attendees,
         recurrence=request.recurrence,
         timezone=request.timezone or "Asia/Ho_Chi_Minh",
+        check_conflicts=check_conflicts,
     )
 
     return _transform_event(event)
@@ -112,7 +205,7 @@ async def delete_event_handler(
     - **event_id**: Event ID to delete (path parameter, required)
     """
     # Validate authentication
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
     
     result = await delete_event(db, user_id, event_id)
@@ -120,4 +213,50 @@ async def delete_event_handler(
     return {
         "success": result,
         "message": "Event deleted successfully" if result else "Failed to delete event"
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/free-slots", response_model=FreeSlotsResponse)
+async def get_free_slots(
+    user_id: int = Query(..., description="User ID", gt=0),
+    date_from: Optional[date] = Query(None, description="First day to search (default: today)"),
+    days: int = Query(7, description="Days to search", ge=1, le=31),
+    duration_minutes: int = Query(60, description="Minimum slot length", ge=5, le=1440),
+    work_start_hour: Optional[int] = Query(None, description="Start of the working day", ge=0, le=23),
+    work_end_hour: Optional[int] = Query(None, description="End of the working day", ge=1, le=24),
+    include_weekends: Optional[bool] = Query(None, description="Also search Saturdays and Sundays"),
+    db: Session = Depends(get_db)
+):
+    """
+    Free time within working hours, computed from the local event store
+    
+    Working hours default to the server's calendar_work_* settings, in its
+    calendar_timezone. All-day events do not block time.
+    """
+    if not await run_google(has_valid_token, db, user_id):
+        raise NoValidTokenError(user_id)
+
+    slots = await find_free_slots(
+        db, user_id,
+        date_from=date_from,
+        days=days,
+        duration_minutes=duration_minutes,
+        work_start_hour=work_start_hour,
+        work_end_hour=work_end_hour,
+        include_weekends=include_weekends,
+    )
+    return FreeSlotsResponse(success=True, timezone=settings.calendar_timezone, slots=slots)
+
+
+@router.post("/sync", response_model=CalendarSyncResponse)
+async def sync_events(
+    user_id: int = Query(..., description="User ID", gt=0),
+    full: bool = Query(False, description="Re-read the whole window instead of only changes"),
+    db: Session = Depends(get_db)
+):
+    """Bring the local event store up to date with Google Calendar now."""
+    if not await run_google(has_valid_token, db, user_id):
+        raise NoValidTokenError(user_id)
+
+    result = await sync_calendar(db, user_id, full=full)
+    return CalendarSyncResponse(success=True, **result)
@@ -1,15 +1,29 @@
 """Chat Router - Handles chat and session endpoints"""
-from fastapi import APIRouter, Depends, Query
+import asyncio
+import json
+import logging
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from config.database import get_db
+from typing import Any, List, Optional, Set
+from config.database import get_db, SessionLocal
 from services.chat_service import ChatService
 from services.auth_service import has_valid_token
+from services.executors import run_google, run_db
 from schemas.chat import ChatMessageRequest, ChatMessageResponse, ChatSessionSummary, ActionStatusEnum, ActionStatusResponse
-from exceptions import NoValidTokenError
+from exceptions import AssistAIException, NoValidTokenError
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["chat"])
 
+# Streams keep running if the client disconnects, so the conversation is still saved
+_stream_tasks: Set[asyncio.Task] = set()
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
 
 @router.post("/message", response_model=ChatMessageResponse)
 async def send_message(
@@ -18,7 +32,7 @@ async def send_message(
     db: Session = Depends(get_db),
 ) -> ChatMessageResponse:
     """Send a message (text + optional image) to the AI assistant."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
     result = await ChatService.send_message(
@@ -31,19 +45,95 @@ async def send_message(
     return ChatMessageResponse(**result)
 
 
+@router.post("/message/stream")
+async def send_message_stream(
+    request: ChatMessageRequest,
+    user_id: int = Query(..., description="User ID", gt=0),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Same as POST /message, streamed as Server-Sent Events.
+
+    Events, in order: token (chat reply text, zero or more), intent, calendar / sheet
+    (when data was fetched), actions, persisted, then done (the ChatMessageResponse body)
+    or error ({error_code, message}).
+    """
+    if not await run_google(has_valid_token, db, user_id):
+        raise NoValidTokenError(user_id)
+
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def emit(event: str, payload: dict) -> None:
+        await queue.put((event, payload))
+
+    async def run() -> None:
+        # Own DB session: the request-scoped one is not guaranteed to outlive the response
+        stream_db = SessionLocal()
+        try:
+            result = await ChatService.send_message(
+                db=stream_db,
+                user_id=user_id,
+                message=request.message,
+                session_id=request.session_id,
+                image_base64=request.image_base64,
+                emit=emit,
+            )
+            await queue.put(("done", ChatMessageResponse(**result).model_dump(mode="json")))
+        except AssistAIException as e:
+            await queue.put(("error", {"error_code": e.error_code, "message": e.message}))
+        except Exception:
+            logger.exception("Unhandled error in chat stream")
+            await queue.put(("error", {"error_code": "INTERNAL_ERROR", "message": "An unexpected error occurred"}))
+        finally:
+            stream_db.close()
+            await queue.put(None)
+
+    task = asyncio.create_task(run())
+    _stream_tasks.add(task)
+    task.add_done_callback(_stream_tasks.discard)
+
+    async def events():
+        while (item := await queue.get()) is not None:
+            yield _sse(*item)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/history")
 async def get_message_history(
     session_id: int = Query(..., description="Session ID", gt=0),
     limit: int = Query(10, description="Max messages", ge=1, le=50),
+    before_message_id: Optional[int] = Query(None, description="Return messages older than this one", gt=0),
     user_id: int = Query(..., description="User ID", gt=0),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
-    """Return message history for a session."""
-    if not has_valid_token(db, user_id):
+    """
+    Return one page of message history for a session, oldest first.
+
+    To page further back, pass the response's next_before_message_id as
+    before_message_id. Responses carry an ETag; a request with a matching
+    If-None-Match gets 304 Not Modified without the messages being loaded.
+    """
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    history = ChatService.get_message_history(db, session_id, limit)
-    return {"session_id": session_id, "messages": history}
+    etag = await run_db(ChatService.get_history_etag, db, user_id, session_id, limit, before_message_id)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    history, next_before = await run_db(
+        ChatService.get_message_history, db, user_id, session_id, limit, before_message_id
+    )
+    return JSONResponse(
+        {"session_id": session_id, "messages": history, "next_before_message_id": next_before},
+        headers=headers,
+    )
 
 
 # --- Session management ---
@@ -55,24 +145,33 @@ async def create_session(
     db: Session = Depends(get_db),
 ):
     """Create a new chat session."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    session = ChatService.create_session(db, user_id, title=title)
+    session = await run_db(ChatService.create_session, db, user_id, title=title)
     return {"session_id": session.session_id, "created_at": session.created_at}
 
 
 @router.get("/sessions", response_model=List[ChatSessionSummary])
 async def list_sessions(
+    response: Response,
     user_id: int = Query(..., description="User ID", gt=0),
     limit: int = Query(20, description="Max sessions", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db),
 ):
-    """List active sessions for a user, most recent first."""
-    if not has_valid_token(db, user_id):
+    """
+    List active sessions for a user, most recent first.
+
+    When more sessions exist, the X-Next-Cursor response header carries the
+    cursor for the next page.
+    """
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sessions = ChatService.list_sessions(db, user_id, limit)
+    sessions, next_cursor = await run_db(ChatService.list_sessions, db, user_id, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [ChatSessionSummary(**s) for s in sessions]
 
 
@@ -85,10 +184,10 @@ async def update_action_status(
     db: Session = Depends(get_db),
 ):
     """Persist accepted/rejected status for an action card."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    ChatService.update_action_status(db, user_id, message_id, action_idx, status)
+    await run_db(ChatService.update_action_status, db, user_id, message_id, action_idx, status)
     return ActionStatusResponse(success=True)
 
 
@@ -99,8 +198,8 @@ async def delete_session(
     db: Session = Depends(get_db),
 ):
     """Soft-delete a session (set status=cancelled)."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    ChatService.delete_session(db, user_id, session_id)
+    await run_db(ChatService.delete_session, db, user_id, session_id)
     return {"success": True, "session_id": session_id}
@@ -0,0 +1,29 @@
+"""Metrics Router - In-process runtime counters for capacity tuning"""
+from fastapi import APIRouter
+
+from config.database import db_pool_stats
+from services.executors import executor_stats
+from services.google_client_pool import google_client_pool
+from services.ai_service import intent_cache
+from services.auth_cache import auth_cache
+from services.usage_buffer import usage_buffer
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics() -> dict:
+    """
+    Thread-pool queue depth / wait times, DB pool checkout waits, Google client pool,
+    auth/intent cache and usage buffer counters.
+
+    Counters are per process and reset on restart.
+    """
+    return {
+        "executors": executor_stats(),
+        "db_pool": db_pool_stats(),
+        "google_client_pool": google_client_pool.stats(),
+        "auth_cache": auth_cache.stats(),
+        "intent_cache": intent_cache.stats(),
+        "usage_buffer": usage_buffer.stats(),
+    }
@@ -9,12 +9,19 @@ from services.sheets_service import (
     add_category, delete_category,
     read_income_transactions, append_income, update_income,
     get_user_sheet_id, set_user_sheet_id, get_budgets, clear_transactions,
+    append_expenses_bulk, append_income_bulk, append_transactions_bulk, sync_ledger,
 )
 from services.auth_service import has_valid_token
+from services.executors import run_google, run_db
 from schemas.sheets_ops import (
     ExpenseCreate,
     ExpenseRow,
     ExpenseCreateResponse,
+    BulkCreateRequest,
+    BulkCreateResponse,
+    BulkTransactionsRequest,
+    BulkTransactionsResponse,
+    LedgerSyncResponse,
     CategoryListResponse,
     SummaryDataResponse,
     UpdateBalanceRequest,
@@ -44,7 +51,7 @@ async def get_sheet_config(
     db: Session = Depends(get_db),
 ):
     """Return the current Google Sheet ID configured for this user."""
-    sid = get_user_sheet_id(db, user_id)
+    sid = await run_db(get_user_sheet_id, db, user_id)
     return SheetConfigResponse(
         sheet_id=sid or None,
         sheet_url=f"https://docs.google.com/spreadsheets/d/{sid}/edit" if sid else None,
@@ -58,11 +65,11 @@ async def list_budgets(
     db: Session = Depends(get_db),
 ):
     """Return per-category planned budgets from the Tóm tắt sheet."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    result = get_budgets(db, user_id, sid)
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    result = await run_google(get_budgets, db, user_id, sid)
     return BudgetListResponse(
         expense=[BudgetItem(**b) for b in result["expense"]],
         income=[BudgetItem(**b) for b in result["income"]],
@@ -82,18 +89,18 @@ async def start_new_month(
     3. Clear all transaction rows in the new sheet (keeps headers + budgets).
     4. Save new_sheet_id to user DB record.
     """
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    old_sid = get_user_sheet_id(db, user_id)
+    old_sid = await run_db(get_user_sheet_id, db, user_id)
     new_sid = request.new_sheet_id.strip()
 
-    old_summary = get_summary_data(db, user_id, old_sid)
+    old_summary = await run_google(get_summary_data, db, user_id, old_sid)
     closing_balance = old_summary.get("closing_balance", 0.0)
 
-    update_balance(db, user_id, new_sid, opening_balance=closing_balance)
-    clear_transactions(db, user_id, new_sid)
-    set_user_sheet_id(db, user_id, new_sid)
+    await run_google(update_balance, db, user_id, new_sid, opening_balance=closing_balance)
+    await run_google(clear_transactions, db, user_id, new_sid)
+    await run_db(set_user_sheet_id, db, user_id, new_sid)
 
     return NewMonthResponse(
         success=True,
@@ -110,11 +117,11 @@ async def list_categories(
     db: Session = Depends(get_db),
 ):
     """Return distinct category values from the Danh mục column."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    categories = get_categories(db, user_id, sid)
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    categories = await run_google(get_categories, db, user_id, sid)
     return CategoryListResponse(categories=categories)
 
 
@@ -125,11 +132,11 @@ async def list_income_categories(
     db: Session = Depends(get_db),
 ):
     """Return income category values from the Tóm tắt sheet (H28:H44)."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    categories = get_income_categories(db, user_id, sid)
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    categories = await run_google(get_income_categories, db, user_id, sid)
     return CategoryListResponse(categories=categories)
 
 
@@ -141,11 +148,12 @@ async def create_expense(
     db: Session = Depends(get_db),
 ):
     """Append one expense row to the sheet."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    result = append_expense(
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    result = await run_google(
+        append_expense,
         db=db, user_id=user_id, sheet_id=sid,
         date=request.date, amount=request.amount,
         description=request.description, category=request.category,
@@ -153,6 +161,51 @@ async def create_expense(
     return ExpenseCreateResponse(success=True, row_number=result.get("row_number"), data=ExpenseRow(**result))
 
 
+@router.post("/expenses:bulk", response_model=BulkCreateResponse, status_code=201)
+async def create_expenses_bulk(
+    request: BulkCreateRequest,
+    user_id: int = Query(..., description="User ID", gt=0),
+    sheet_id: str = Query(None, description="Google Sheet ID (defaults to user setting)"),
+    db: Session = Depends(get_db),
+):
+    """Append several expense rows with one Sheets API call."""
+    if not await run_google(has_valid_token, db, user_id):
+        raise NoValidTokenError(user_id)
+
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    results = await run_google(append_expenses_bulk, db, user_id, sid, [item.model_dump() for item in request.items])
+    return BulkCreateResponse(
+        success=True,
+        row_numbers=[r.get("row_number") for r in results],
+        data=[ExpenseRow(**r) for r in results],
+    )
+
+
+@router.post("/transactions:bulk", response_model=BulkTransactionsResponse, status_code=201)
+async def create_transactions_bulk(
+    request: BulkTransactionsRequest,
+    user_id: int = Query(..., description="User ID", gt=0),
+    sheet_id: str = Query(None, description="Google Sheet ID (defaults to user setting)"),
+    db: Session = Depends(get_db),
+):
+    """Append expense and income rows together (one append per block)."""
+    if not await run_google(has_valid_token, db, user_id):
+        raise NoValidTokenError(user_id)
+
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    results = await run_google(
+        append_transactions_bulk,
+        db, user_id, sid,
+        expenses=[item.model_dump() for item in request.expenses],
+        income=[item.model_dump() for item in request.income],
+    )
+    return BulkTransactionsResponse(
+        success=True,
+        expenses=[ExpenseRow(**r) for r in results["expenses"]],
+        income=[ExpenseRow(**r) for r in results["income"]],
+    )
+
+
 @router.get("/expenses", response_model=List[ExpenseRow])
 async def list_expenses(
     user_id: int = Query(..., description="User ID", gt=0),
@@ -161,14 +214,29 @@ async def list_expenses(
     db: Session = Depends(get_db),
 ):
     """Return the last N expense rows from the sheet."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    rows = read_expenses(db, user_id, sid, limit)
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    rows = await run_google(read_expenses, db, user_id, sid, limit)
     return [ExpenseRow(**r) for r in rows]
 
 
+@router.post("/ledger/sync", response_model=LedgerSyncResponse)
+async def sync_transactions_ledger(
+    user_id: int = Query(..., description="User ID", gt=0),
+    sheet_id: str = Query(None, description="Google Sheet ID (defaults to user setting)"),
+    db: Session = Depends(get_db),
+):
+    """Re-read the "Giao dịch" sheet into the local ledger now (e.g. after editing it in Google Sheets)."""
+    if not await run_google(has_valid_token, db, user_id):
+        raise NoValidTokenError(user_id)
+
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    counts = await run_google(sync_ledger, db, user_id, sid)
+    return LedgerSyncResponse(success=True, **counts)
+
+
 @router.get("/summary", response_model=SummaryDataResponse)
 async def get_summary(
     user_id: int = Query(..., description="User ID", gt=0),
@@ -176,11 +244,11 @@ async def get_summary(
     db: Session = Depends(get_db),
 ):
     """Return summary data: opening_balance, closing_balance, total_expenses, total_income."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    summary = get_summary_data(db, user_id, sid)
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    summary = await run_google(get_summary_data, db, user_id, sid)
     if sid:
         summary["sheet_url"] = f"https://docs.google.com/spreadsheets/d/{sid}/edit"
     return SummaryDataResponse(**summary)
@@ -194,11 +262,11 @@ async def delete_expense_row(
     db: Session = Depends(get_db),
 ):
     """Delete an expense row by row number."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    delete_expense(db, user_id, sid, row_number)
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    await run_google(delete_expense, db, user_id, sid, row_number)
     return SuccessResponse(success=True)
 
 
@@ -211,11 +279,12 @@ async def update_expense_row(
     db: Session = Depends(get_db),
 ):
     """Update an expense row by row number."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    result = update_expense(
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    result = await run_google(
+        update_expense,
         db=db, user_id=user_id, sheet_id=sid, row_number=row_number,
         date=request.date, amount=request.amount,
         description=request.description, category=request.category,
@@ -231,11 +300,12 @@ async def update_balance_endpoint(
     db: Session = Depends(get_db),
 ):
     """Update opening and/or closing balance."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    result = update_balance(
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    result = await run_google(
+        update_balance,
         db=db, user_id=user_id, sheet_id=sid,
         opening_balance=request.opening_balance,
         closing_balance=request.closing_balance,
@@ -251,11 +321,12 @@ async def update_budget_endpoint(
     db: Session = Depends(get_db),
 ):
     """Update budget for a category."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    result = update_budget(
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    result = await run_google(
+        update_budget,
         db=db, user_id=user_id, sheet_id=sid,
         category=request.category, budget_amount=request.budget_amount,
         is_income=request.is_income,
@@ -271,11 +342,11 @@ async def list_income_transactions(
     db: Session = Depends(get_db),
 ):
     """Return the last N income rows from the Giao dịch sheet (columns G:J)."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    rows = read_income_transactions(db, user_id, sid, limit)
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    rows = await run_google(read_income_transactions, db, user_id, sid, limit)
     return [ExpenseRow(**r) for r in rows]
 
 
@@ -287,11 +358,12 @@ async def create_income(
     db: Session = Depends(get_db),
 ):
     """Append one income row to the Giao dịch sheet (columns G:J)."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    result = append_income(
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    result = await run_google(
+        append_income,
         db=db, user_id=user_id, sheet_id=sid,
         date=request.date, amount=request.amount,
         description=request.description, category=request.category,
@@ -299,6 +371,26 @@ async def create_income(
     return ExpenseCreateResponse(success=True, row_number=result.get("row_number"), data=ExpenseRow(**result))
 
 
+@router.post("/income:bulk", response_model=BulkCreateResponse, status_code=201)
+async def create_income_bulk(
+    request: BulkCreateRequest,
+    user_id: int = Query(..., description="User ID", gt=0),
+    sheet_id: str = Query(None, description="Google Sheet ID (defaults to user setting)"),
+    db: Session = Depends(get_db),
+):
+    """Append several income rows with one Sheets API call."""
+    if not await run_google(has_valid_token, db, user_id):
+        raise NoValidTokenError(user_id)
+
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    results = await run_google(append_income_bulk, db, user_id, sid, [item.model_dump() for item in request.items])
+    return BulkCreateResponse(
+        success=True,
+        row_numbers=[r.get("row_number") for r in results],
+        data=[ExpenseRow(**r) for r in results],
+    )
+
+
 @router.put("/income/{row_number}", response_model=ExpenseRow, status_code=200)
 async def update_income_row(
     row_number: int,
@@ -308,11 +400,12 @@ async def update_income_row(
     db: Session = Depends(get_db),
 ):
     """Update an income row in the Giao dịch sheet (columns G:J)."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    result = update_income(
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    result = await run_google(
+        update_income,
         db=db, user_id=user_id, sheet_id=sid, row_number=row_number,
         date=request.date, amount=request.amount,
         description=request.description, category=request.category,
@@ -328,11 +421,11 @@ async def delete_income_row(
     db: Session = Depends(get_db),
 ):
     """Delete an income row by row number."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    delete_expense(db, user_id, sid, row_number)
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    await run_google(delete_expense, db, user_id, sid, row_number)
     return SuccessResponse(success=True)
 
 
@@ -344,12 +437,12 @@ async def add_category_endpoint(
     db: Session = Depends(get_db),
 ):
     """Add a new category."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    result = add_category(db=db, user_id=user_id, sheet_id=sid,
-                          category=request.category, is_income=request.is_income)
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    result = await run_google(add_category, db=db, user_id=user_id, sheet_id=sid,
+                              category=request.category, is_income=request.is_income)
     return ManageCategoryRequest(**result)
 
 
@@ -361,10 +454,10 @@ async def delete_category_endpoint(
     db: Session = Depends(get_db),
 ):
     """Delete a category."""
-    if not has_valid_token(db, user_id):
+    if not await run_google(has_valid_token, db, user_id):
         raise NoValidTokenError(user_id)
 
-    sid = _resolve(sheet_id, db, user_id)
-    delete_category(db=db, user_id=user_id, sheet_id=sid,
-                    category=request.category, is_income=request.is_income)
+    sid = await run_db(_resolve, sheet_id, db, user_id)
+    await run_google(delete_category, db=db, user_id=user_id, sheet_id=sid,
+                     category=request.category, is_income=request.is_income)
     return SuccessResponse(success=True)
@@ -0,0 +1,64 @@
+"""Usage Router - Token usage rollups per user, period and session"""
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from config.config import settings
+from config.database import get_db, AsyncSessionLocal
+from services.auth_service import has_valid_token
+from services.executors import run_google, run_db
+from services.token_usage_service import TokenUsageService
+from services.usage_rollup import get_usage, get_usage_async
+from schemas.token_usage import UsageRollupResponse, SessionUsageResponse
+from exceptions import NoValidTokenError
+
+router = APIRouter(tags=["usage"])
+
+
+async def _rollups(db: Session, user_id: int, period: Literal["day", "month"],
+                   start: Optional[str], end: Optional[str]) -> UsageRollupResponse:
+    if not await run_google(has_valid_token, db, user_id):
+        raise NoValidTokenError(user_id)
+
+    if settings.db_async_enabled:
+        async with AsyncSessionLocal() as adb:
+            rows = await get_usage_async(adb, user_id, period, start, end)
+    else:
+        rows = await run_db(get_usage, db, user_id, period, start, end)
+    return UsageRollupResponse(user_id=user_id, period=period, rows=rows)
+
+
+@router.get("/daily", response_model=UsageRollupResponse)
+async def daily_usage(
+    user_id: int = Query(..., description="User ID", gt=0),
+    start: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$", description="First day (YYYY-MM-DD)"),
+    end: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$", description="Last day (YYYY-MM-DD)"),
+    db: Session = Depends(get_db)
+) -> UsageRollupResponse:
+    """Token usage per day and model, oldest first."""
+    return await _rollups(db, user_id, "day", start, end)
+
+
+@router.get("/monthly", response_model=UsageRollupResponse)
+async def monthly_usage(
+    user_id: int = Query(..., description="User ID", gt=0),
+    start: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="First month (YYYY-MM)"),
+    end: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Last month (YYYY-MM)"),
+    db: Session = Depends(get_db)
+) -> UsageRollupResponse:
+    """Token usage per month and model, oldest first."""
+    return await _rollups(db, user_id, "month", start, end)
+
+
+@router.get("/sessions/{session_id}", response_model=SessionUsageResponse)
+async def session_usage(
+    session_id: int,
+    user_id: int = Query(..., description="User ID", gt=0),
+    db: Session = Depends(get_db)
+) -> SessionUsageResponse:
+    """Token totals for one of the user's chat sessions."""
+    if not await run_google(has_valid_token, db, user_id):
+        raise NoValidTokenError(user_id)
+
+    return await run_db(TokenUsageService.get_session_usage, session_id, db=db, user_id=user_id)
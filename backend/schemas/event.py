@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr, field_validator, model_validator
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import datetime
 import zoneinfo
 
@@ -78,3 +78,56 @@ class SmartEventAction(BaseModel):
     target_event: Optional[EventResponse] = None  # For update/delete
     event_details: Optional[EventCreate] = None  # For create
     error: Optional[str] = None
+
+
+class CalendarSyncResponse(BaseModel):
+    """Schema for a local event store sync"""
+    success: bool
+    full: bool = Field(..., description="True if the whole window was re-read (no or expired sync token)")
+    changes: int = Field(..., description="Events written to the local store by this sync")
+
+
+class FreeSlot(BaseModel):
+    start: datetime = Field(..., description="Slot start (local time, with offset)")
+    end: datetime = Field(..., description="Slot end (local time, with offset)")
+    duration_minutes: int
+
+
+class FreeSlotsResponse(BaseModel):
+    """Schema for free time within working hours"""
+    success: bool
+    timezone: str = Field(..., description="Time zone of the working hours")
+    slots: List[FreeSlot]
+
+
+class EventBatchItem(BaseModel):
+    """One operation of a batch request"""
+    op: Literal["create", "update", "delete"]
+    event_id: Optional[str] = Field(None, description="Event to update/delete")
+    event: Optional[EventCreate] = Field(None, description="Event fields for create/update")
+
+    @model_validator(mode="after")
+    def fields_for_op(self):
+        if self.op in ("update", "delete") and not self.event_id:
+            raise ValueError(f"event_id là bắt buộc cho {self.op}")
+        if self.op in ("create", "update") and self.event is None:
+            raise ValueError(f"event là bắt buộc cho {self.op}")
+        return self
+
+
+class EventBatchRequest(BaseModel):
+    """Schema for creating/updating/deleting several events at once"""
+    items: List[EventBatchItem] = Field(..., min_length=1, max_length=100, description="Operations, in order")
+
+
+class EventBatchItemResult(BaseModel):
+    op: str
+    event_id: Optional[str] = None
+    success: bool
+    event: Optional[dict] = Field(None, description="Created/updated event (same shape as GET /events items)")
+    error: Optional[str] = None
+
+
+class EventBatchResponse(BaseModel):
+    success: bool = Field(..., description="True if every operation succeeded")
+    results: List[EventBatchItemResult]
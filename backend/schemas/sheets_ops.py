@@ -27,6 +27,39 @@ class ExpenseCreateResponse(BaseModel):
     data: ExpenseRow
 
 
+class BulkCreateRequest(BaseModel):
+    items: List[ExpenseCreate] = Field(..., min_length=1, max_length=500, description="Rows to append, in order")
+
+
+class BulkCreateResponse(BaseModel):
+    success: bool
+    row_numbers: List[Optional[int]]
+    data: List[ExpenseRow]
+
+
+class BulkTransactionsRequest(BaseModel):
+    expenses: List[ExpenseCreate] = Field(default_factory=list, max_length=500)
+    income: List[ExpenseCreate] = Field(default_factory=list, max_length=500)
+
+    @model_validator(mode="after")
+    def at_least_one_row(self):
+        if not self.expenses and not self.income:
+            raise ValueError("Phải cung cấp ít nhất một khoản chi hoặc thu nhập")
+        return self
+
+
+class BulkTransactionsResponse(BaseModel):
+    success: bool
+    expenses: List[ExpenseRow]
+    income: List[ExpenseRow]
+
+
+class LedgerSyncResponse(BaseModel):
+    success: bool
+    expenses: int = Field(..., description="Expense rows now in the local ledger")
+    income: int = Field(..., description="Income rows now in the local ledger")
+
+
 class SummaryDataResponse(BaseModel):
     opening_balance: float = Field(..., description="Số dư đầu kỳ (from L8)")
     closing_balance: float = Field(..., description="Số dư cuối kỳ (from D17)")
@@ -36,3 +36,29 @@ class TokenUsageSummary(BaseModel):
     input_tokens: int = 0
     output_tokens: int = 0
     by_model: dict = Field(default_factory=dict, description="Breakdown by model")
+
+
+class UsageRollupRow(BaseModel):
+    """One pre-aggregated usage bucket (user, period, model)"""
+    period_start: str = Field(..., description="'YYYY-MM-DD' for daily rows, 'YYYY-MM' for monthly rows")
+    model: str
+    request_count: int
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    total_tokens: int
+    cost: float = Field(..., description="Estimated cost in USD")
+
+
+class UsageRollupResponse(BaseModel):
+    """Usage rollups for a user over a period range"""
+    user_id: int
+    period: str
+    rows: list[UsageRollupRow]
+
+
+class SessionUsageResponse(BaseModel):
+    """Token usage totals for one session"""
+    session_id: int
+    total_tokens: int
+    cost_estimate: float = Field(..., description="Estimated cost in USD")
@@ -3,8 +3,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from config.config import settings
-from routers import auth, calendar, chat, sheets
+from config.database import dispose_async_engine
+from routers import auth, calendar, chat, sheets, metrics, usage
 from exceptions import register_exception_handlers
+from services.ai_service import close_openai_client
+from services.executors import shutdown_executors
+from services.token_refresher import token_refresher
+from services.usage_buffer import usage_buffer
 
 app = FastAPI(title="AssistAI Backend")
 
@@ -20,6 +25,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Register custom exception handlers
@@ -30,6 +36,23 @@ app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(calendar.router, prefix="/api/calendar", tags=["Calendar"])
 app.include_router(chat.router, prefix="/api/chat", tags=["Chat"])
 app.include_router(sheets.router, prefix="/api/sheets", tags=["Sheets"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"])
+app.include_router(usage.router, prefix="/api/usage", tags=["Usage"])
+
+
+@app.on_event("startup")
+async def startup():
+    token_refresher.start()
+    usage_buffer.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await token_refresher.stop()
+    await close_openai_client()
+    await usage_buffer.stop()
+    shutdown_executors()
+    await dispose_async_engine()
 
 
 @app.get("/health")
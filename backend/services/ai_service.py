@@ -1,17 +1,65 @@
 """AI Service - LLM integration with exception handling"""
 import json
-from typing import Dict, List, Optional, Any
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import httpx
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI
 from config.config import settings
 from services.token_usage_service import TokenUsageService
+from services.intent_fastpath import parse_fast_intent, fastpath_stats
+from services.intent_cache import IntentCache, READ_INTENTS
 from exceptions import (
     LLMProcessingError,
     DatabaseError,
 )
 
+logger = logging.getLogger(__name__)
+
 token_usage_service = TokenUsageService()
-openai_client = OpenAI(api_key=settings.llm_api_key)
+
+intent_cache = IntentCache(
+    max_entries=settings.intent_cache_max_entries,
+    ttl_seconds=settings.intent_cache_ttl_seconds,
+)
+
+
+def _build_openai_client() -> AsyncOpenAI:
+    """
+    Build the async OpenAI client used by every LLM call in this worker.
+
+    All requests share one bounded httpx connection pool, so hundreds of chats can be
+    in flight without blocking the event loop or opening a socket per request.
+    """
+    http_client = openai.DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+        ),
+        timeout=httpx.Timeout(settings.llm_timeout, connect=10.0),
+    )
+    return AsyncOpenAI(
+        api_key=settings.llm_api_key,
+        base_url=settings.llm_base_url or None,
+        timeout=settings.llm_timeout,
+        http_client=http_client,
+    )
+
+
+openai_client = _build_openai_client()
+
+
+async def close_openai_client() -> None:
+    """Close the shared HTTP connection pool (called on app shutdown)."""
+    await openai_client.close()
+
+
+def _cached_tokens(usage: Any) -> int:
+    """Prompt tokens served from the provider's prompt cache (billed at a discount)."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return (getattr(details, "cached_tokens", None) or 0) if details else 0
 
 
 async def smart_event_operation(
@@ -85,7 +133,7 @@ async def smart_event_operation(
         tool_choice = {"type": "function", "function": {"name": "select_event_to_delete"}}
 
     try:
-        response = openai_client.chat.completions.create(
+        response = await openai_client.chat.completions.create(
             model=settings.llm_model,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -95,6 +143,8 @@ async def smart_event_operation(
             tool_choice=tool_choice,
             max_completion_tokens=settings.llm_max_tokens,
         )
+    except openai.APITimeoutError:
+        raise LLMProcessingError(f"OpenAI request timed out after {settings.llm_timeout}s")
     except openai.APIConnectionError as e:
         raise LLMProcessingError(f"Could not connect to OpenAI: {str(e)}")
     except openai.RateLimitError as e:
@@ -110,6 +160,7 @@ async def smart_event_operation(
                 prompt_tokens=response.usage.prompt_tokens,
                 completion_tokens=response.usage.completion_tokens,
                 total_tokens=response.usage.total_tokens or 0,
+                cached_tokens=_cached_tokens(response.usage),
                 model=settings.llm_model,
             )
         except DatabaseError:
@@ -128,7 +179,7 @@ async def smart_event_operation(
 async def generate_chat_title(message: str) -> str:
     """Generate a short 3-5 word Vietnamese title summarising the user's first message."""
     try:
-        response = openai_client.chat.completions.create(
+        response = await openai_client.chat.completions.create(
             model=settings.llm_model,
             messages=[
                 {
@@ -149,6 +200,9 @@ async def generate_chat_title(message: str) -> str:
 
 def _tool_call_to_intent(name: str, args: Dict[str, Any], tokens: int) -> Dict[str, Any]:
     base: Dict[str, Any] = {"confidence": 0.95, "_tokens": tokens}
+    session_title = str(args.pop("session_title", "") or "").strip().strip('"\'.,')
+    if session_title:
+        base["session_title"] = session_title
 
     if name == "add_expense":
         txns = args.get("transactions", [])
@@ -181,199 +235,325 @@ def _tool_call_to_intent(name: str, args: Dict[str, Any], tokens: int) -> Dict[s
     return {"intent": "chat", "confidence": 0.5, "data": {"response": ""}, "_tokens": tokens}
 
 
-async def parse_user_intent(
-    message: str,
-    categories: Optional[List[str]] = None,
-    income_categories: Optional[List[str]] = None,
-    image_base64: Optional[str] = None,
-    session_id: Optional[int] = None,
-) -> Dict[str, Any]:
-    """
-    Classify user message using OpenAI function calling.
-
-    Returns dict with intent, action (calendar only), data, _tokens.
-    When no tool is called, returns chat intent with the model's text reply.
-
-    Raises:
-        LLMProcessingError: If OpenAI API call fails
-    """
-    from datetime import datetime
-
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    expense_cats = categories or ["Ăn uống", "Di chuyển", "Mua sắm", "Giải trí", "Khác"]
-    income_cats = income_categories or ["Lương", "Thưởng", "Freelance", "Khác"]
-
-    system_prompt = (
-        f"You are an AI assistant helping users track expenses, income, and calendar events. "
-        f"Current date: {current_date}. "
-        "Amounts in VND: '50k'=50000, '1 triệu'=1000000, '2.5m'=2500000. Always positive (> 0). If user gives a negative amount, DO NOT call a tool — reply explaining amounts must be positive. "
-        "Date defaults to today when not mentioned. "
-        "Expense = money spent/paid; Income = money received (salary, bonus, freelance). "
-        "For receipt images → add_expense (extract store name, total, date). "
-        "For calendar images/posters → create_calendar_event. "
-        "Calendar routing — follow strictly: "
-        "xóa/hủy/bỏ/cancel + event name → delete_calendar_event (NEVER read_calendar). "
-        "sửa/đổi/dời/cập nhật/reschedule + event name → update_calendar_event (NEVER read_calendar). "
-        "thêm/tạo/đặt lịch + details → create_calendar_event. "
-        "xem/kiểm tra/có gì/lịch hôm nay (no delete/update intent) → read_calendar. "
-        "Respond in Vietnamese when no tool is called."
-    )
+# Rules first, volatile parts (date) last: providers cache prompts by exact prefix,
+# so everything before the first changing byte is billed at the cached rate.
+_STATIC_RULES = (
+    "You are an AI assistant helping users track expenses, income, and calendar events. "
+    "Amounts in VND: '50k'=50000, '1 triệu'=1000000, '2.5m'=2500000. Always positive (> 0). If user gives a negative amount, DO NOT call a tool — reply explaining amounts must be positive. "
+    "Date defaults to today when not mentioned. "
+    "Expense = money spent/paid; Income = money received (salary, bonus, freelance). "
+    "For receipt images → add_expense (extract store name, total, date). "
+    "For calendar images/posters → create_calendar_event. "
+    "Calendar routing — follow strictly: "
+    "xóa/hủy/bỏ/cancel + event name → delete_calendar_event (NEVER read_calendar). "
+    "sửa/đổi/dời/cập nhật/reschedule + event name → update_calendar_event (NEVER read_calendar). "
+    "thêm/tạo/đặt lịch + details → create_calendar_event. "
+    "xem/kiểm tra/có gì/lịch hôm nay (no delete/update intent) → read_calendar. "
+    "rảnh/trống/có thời gian/khi nào free → read_calendar with mode=free_slots. "
+    "Respond in Vietnamese when no tool is called."
+)
 
-    def _cat_prop(cats: List[str]) -> Dict[str, Any]:
-        p: Dict[str, Any] = {"type": "string"}
-        if cats:
-            p["enum"] = cats
-        return p
+# Filled only when the prompt asks for it (first message of a new session), so the
+# title comes back in the same completion instead of a second LLM call
+_SESSION_TITLE_PROPERTY = {
+    "session_title": {"type": "string", "description": "Short 3-5 word Vietnamese title for the conversation, only when requested"},
+}
 
-    def _transaction_item(cats: List[str]) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "date": {"type": "string", "description": "Date YYYY-MM-DD"},
-                "amount": {"type": "number", "description": "Amount in VND, MUST be positive (> 0). Never use negative values.", "exclusiveMinimum": 0},
-                "description": {"type": "string"},
-                "category": {**_cat_prop(cats), "description": "Matching category"},
-            },
-            "required": ["date", "amount", "description", "category"],
-        }
+_TITLE_RULE = (
+    " This is the first message of a new conversation: when calling read_calendar or read_sheet, "
+    "also set session_title."
+)
 
-    tools = [
-        {
-            "type": "function",
-            "function": {
-                "name": "add_expense",
-                "description": "Record expense transaction(s) — money the user SPENT or PAID (purchases, bills, food, etc.).",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "transactions": {
-                            "type": "array",
-                            "items": _transaction_item(expense_cats),
-                            "description": "One or more expense transactions",
-                        }
-                    },
-                    "required": ["transactions"],
+# Category-independent tools go first so they stay in the cached prefix for every user
+_STATIC_TOOLS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "create_calendar_event",
+            "description": "Create one or more new calendar events/appointments.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "events": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "summary": {"type": "string", "description": "Event title"},
+                                "start_datetime": {"type": "string", "description": "ISO datetime YYYY-MM-DDTHH:MM:SS"},
+                                "end_datetime": {"type": "string", "description": "ISO datetime, default 1 hour after start"},
+                                "description": {"type": "string"},
+                                "location": {"type": "string"},
+                            },
+                            "required": ["summary", "start_datetime", "end_datetime"],
+                        },
+                    }
                 },
+                "required": ["events"],
             },
         },
-        {
-            "type": "function",
-            "function": {
-                "name": "add_income",
-                "description": "Record income transaction(s) — money the user RECEIVED or EARNED (salary, bonus, freelance, etc.).",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "transactions": {
-                            "type": "array",
-                            "items": _transaction_item(income_cats),
-                            "description": "One or more income transactions",
-                        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "update_calendar_event",
+            "description": "Update/modify/reschedule an existing calendar event. Triggered by: sửa, đổi, dời, cập nhật, thay đổi, reschedule + event name.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "event_query": {"type": "string", "description": "Natural language description of which event to update"},
+                    "changes": {
+                        "type": "object",
+                        "description": "Fields to update (only changed fields)",
+                        "properties": {
+                            "summary": {"type": "string"},
+                            "start_datetime": {"type": "string"},
+                            "end_datetime": {"type": "string"},
+                            "location": {"type": "string"},
+                            "description": {"type": "string"},
+                        },
                     },
-                    "required": ["transactions"],
                 },
+                "required": ["event_query", "changes"],
             },
         },
-        {
-            "type": "function",
-            "function": {
-                "name": "create_calendar_event",
-                "description": "Create one or more new calendar events/appointments.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "events": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "summary": {"type": "string", "description": "Event title"},
-                                    "start_datetime": {"type": "string", "description": "ISO datetime YYYY-MM-DDTHH:MM:SS"},
-                                    "end_datetime": {"type": "string", "description": "ISO datetime, default 1 hour after start"},
-                                    "description": {"type": "string"},
-                                    "location": {"type": "string"},
-                                },
-                                "required": ["summary", "start_datetime", "end_datetime"],
-                            },
-                        }
-                    },
-                    "required": ["events"],
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "delete_calendar_event",
+            "description": "Delete/cancel/remove an existing calendar event. Triggered by: xóa, hủy, bỏ, cancel, remove + event name. Do NOT use read_calendar first.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "event_query": {"type": "string", "description": "Natural language description of which event to delete"}
                 },
+                "required": ["event_query"],
             },
         },
-        {
-            "type": "function",
-            "function": {
-                "name": "update_calendar_event",
-                "description": "Update/modify/reschedule an existing calendar event. Triggered by: sửa, đổi, dời, cập nhật, thay đổi, reschedule + event name.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "event_query": {"type": "string", "description": "Natural language description of which event to update"},
-                        "changes": {
-                            "type": "object",
-                            "description": "Fields to update (only changed fields)",
-                            "properties": {
-                                "summary": {"type": "string"},
-                                "start_datetime": {"type": "string"},
-                                "end_datetime": {"type": "string"},
-                                "location": {"type": "string"},
-                                "description": {"type": "string"},
-                            },
-                        },
-                    },
-                    "required": ["event_query", "changes"],
-                },
-            },
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "delete_calendar_event",
-                "description": "Delete/cancel/remove an existing calendar event. Triggered by: xóa, hủy, bỏ, cancel, remove + event name. Do NOT use read_calendar first.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "event_query": {"type": "string", "description": "Natural language description of which event to delete"}
-                    },
-                    "required": ["event_query"],
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "read_calendar",
+            "description": "View/list upcoming or past events, or find free time. Use ONLY when user wants to SEE their schedule (e.g. 'tuần tới có gì', 'hôm nay có lịch gì', 'xem lịch') or asks when they are free ('thứ 6 rảnh lúc nào'). Do NOT use when user wants to delete, cancel, update, or modify an event.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "days_ahead": {"type": "integer", "description": "Days ahead to look (0 for past-only)"},
+                    "days_back": {"type": "integer", "description": "Days back to look (0 for future-only)"},
+                    "limit": {"type": "integer", "description": "Max events to return (default 10)"},
+                    "mode": {"type": "string", "enum": ["list", "free_slots"], "description": "list = show events (default); free_slots = free time within working hours"},
+                    "date": {"type": "string", "description": "free_slots only: the single day asked about, YYYY-MM-DD"},
+                    "duration_minutes": {"type": "integer", "description": "free_slots only: minimum free time needed (default 60)"},
+                    "query": {"type": "string", "description": "Original query phrase"},
+                    **_SESSION_TITLE_PROPERTY,
                 },
+                "required": ["days_ahead", "days_back"],
             },
         },
-        {
-            "type": "function",
-            "function": {
-                "name": "read_calendar",
-                "description": "View/list upcoming or past events. Use ONLY when user wants to SEE their schedule (e.g. 'tuần tới có gì', 'hôm nay có lịch gì', 'xem lịch'). Do NOT use when user wants to delete, cancel, update, or modify an event.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "days_ahead": {"type": "integer", "description": "Days ahead to look (0 for past-only)"},
-                        "days_back": {"type": "integer", "description": "Days back to look (0 for future-only)"},
-                        "limit": {"type": "integer", "description": "Max events to return (default 10)"},
-                        "query": {"type": "string", "description": "Original query phrase"},
-                    },
-                    "required": ["days_ahead", "days_back"],
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "read_sheet",
+            "description": "View expense/income history or spending summary. Use when user asks ABOUT past transactions (e.g. 'tháng này chi bao nhiêu', 'xem lịch sử').",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "limit": {"type": "integer", "description": "Max rows to return (default 50)"},
+                    "query": {"type": "string", "description": "Original query phrase"},
+                    **_SESSION_TITLE_PROPERTY,
                 },
+                "required": [],
             },
         },
-        {
-            "type": "function",
-            "function": {
-                "name": "read_sheet",
-                "description": "View expense/income history or spending summary. Use when user asks ABOUT past transactions (e.g. 'tháng này chi bao nhiêu', 'xem lịch sử').",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "limit": {"type": "integer", "description": "Max rows to return (default 50)"},
-                        "query": {"type": "string", "description": "Original query phrase"},
-                    },
-                    "required": [],
+    },
+]
+
+
+def _transaction_tool(name: str, description: str, cats: Tuple[str, ...]) -> Dict[str, Any]:
+    category: Dict[str, Any] = {"type": "string", "description": "Matching category"}
+    if cats:
+        category["enum"] = list(cats)
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "transactions": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "date": {"type": "string", "description": "Date YYYY-MM-DD"},
+                                "amount": {"type": "number", "description": "Amount in VND, MUST be positive (> 0). Never use negative values.", "exclusiveMinimum": 0},
+                                "description": {"type": "string"},
+                                "category": category,
+                            },
+                            "required": ["date", "amount", "description", "category"],
+                        },
+                        "description": f"One or more {name.split('_', 1)[1]} transactions",
+                    }
                 },
+                "required": ["transactions"],
             },
         },
+    }
+
+
+@lru_cache(maxsize=256)
+def _intent_tools(expense_cats: Tuple[str, ...], income_cats: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """Tool schemas for one category set. Cached — callers must not mutate the result."""
+    return _STATIC_TOOLS + [
+        _transaction_tool(
+            "add_expense",
+            "Record expense transaction(s) — money the user SPENT or PAID (purchases, bills, food, etc.).",
+            expense_cats,
+        ),
+        _transaction_tool(
+            "add_income",
+            "Record income transaction(s) — money the user RECEIVED or EARNED (salary, bonus, freelance, etc.).",
+            income_cats,
+        ),
     ]
 
+
+@lru_cache(maxsize=256)
+def build_intent_prompt(
+    expense_cats: Tuple[str, ...],
+    income_cats: Tuple[str, ...],
+    current_date: str,
+    want_title: bool = False,
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Build (system prompt, tools) for parse_user_intent, memoized per categories + date.
+
+    Args:
+        want_title: Ask for session_title on read tools (kept at the very end of the prompt)
+
+    Returns:
+        Tuple of system prompt and tool list (shared — do not mutate)
+    """
+    system_prompt = f"{_STATIC_RULES} Current date: {current_date}."
+    if want_title:
+        system_prompt += _TITLE_RULE
+    return system_prompt, _intent_tools(expense_cats, income_cats)
+
+
+async def _collect_stream(
+    stream: Any, on_token: Callable[[str], Awaitable[None]]
+) -> Tuple[Optional[str], List[Tuple[str, str]], Any]:
+    """
+    Drain a streamed completion, forwarding text deltas to on_token.
+
+    Returns:
+        (content, [(tool name, arguments JSON)], usage) — same data as a non-streamed response
+    """
+    parts: List[str] = []
+    calls: Dict[int, Dict[str, str]] = {}
+    usage = None
+    async for chunk in stream:
+        if chunk.usage:
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            parts.append(delta.content)
+            await on_token(delta.content)
+        for tc in delta.tool_calls or []:
+            call = calls.setdefault(tc.index, {"name": "", "arguments": ""})
+            if tc.function and tc.function.name:
+                call["name"] += tc.function.name
+            if tc.function and tc.function.arguments:
+                call["arguments"] += tc.function.arguments
+    tool_calls = [(c["name"], c["arguments"]) for _, c in sorted(calls.items())]
+    return "".join(parts) or None, tool_calls, usage
+
+
+def _is_cacheable(result: Dict[str, Any]) -> bool:
+    """
+    Read-only intents are replayable; writes only when explicitly enabled.
+
+    Low-confidence fallbacks and empty chat replies are never cached, so a bad
+    answer is not replayed for the whole TTL.
+    """
+    if result.get("confidence", 0) < settings.intent_cache_min_confidence:
+        return False
+    if result.get("intent") == "chat" and not (result.get("data") or {}).get("response"):
+        return False
+    if result.get("intent") in READ_INTENTS:
+        return True
+    return settings.intent_cache_write_intents
+
+
+def _remember(cache_key: Optional[Tuple], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Store an eligible result in intent_cache (replayed with _tokens=0) and pass it through."""
+    if cache_key is not None and _is_cacheable(result):
+        cached = {k: v for k, v in result.items() if k != "session_title"}
+        intent_cache.put(cache_key, {**cached, "_tokens": 0})
+    return result
+
+
+async def parse_user_intent(
+    message: str,
+    categories: Optional[List[str]] = None,
+    income_categories: Optional[List[str]] = None,
+    image_base64: Optional[str] = None,
+    session_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    want_title: bool = False,
+    on_token: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """
+    Classify user message using OpenAI function calling.
+
+    Returns dict with intent, action (calendar only), data, _tokens.
+    When no tool is called, returns a chat intent with a fixed "did not understand" reply.
+    With a user_id, repeated phrasings are answered from intent_cache (see _is_cacheable).
+    With want_title, read intents may also carry a session_title from the same completion.
+    With on_token, the completion is streamed and each text delta of a chat reply is
+    passed to it as it arrives; the returned dict (and so the stored reply) is the
+    same as without streaming.
+
+    Raises:
+        LLMProcessingError: If OpenAI API call fails
+    """
+    from datetime import datetime
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    expense_cats = categories or ["Ăn uống", "Di chuyển", "Mua sắm", "Giải trí", "Khác"]
+    income_cats = income_categories or ["Lương", "Thưởng", "Freelance", "Khác"]
+
+    # Short "50k ăn trưa"-style messages are parsed locally; only unsure ones reach the LLM
+    if settings.intent_fastpath_enabled and message and not image_base64:
+        fast = parse_fast_intent(
+            message, expense_cats, income_cats,
+            min_confidence=settings.intent_fastpath_min_confidence,
+        )
+        if fast:
+            logger.info("[fastpath] hit tool=%s confidence=%s stats=%s",
+                        fast.tool_name, fast.confidence, fastpath_stats.as_dict())
+            result = _tool_call_to_intent(fast.tool_name, fast.args, 0)
+            result["confidence"] = fast.confidence
+            return result
+
+    cache_key = None
+    if settings.intent_cache_enabled and user_id is not None and message and not image_base64:
+        cache_key = IntentCache.make_key(user_id, message, expense_cats, income_cats, current_date)
+        cached = intent_cache.get(cache_key)
+        if cached is not None:
+            logger.info("[intent_cache] hit intent=%s stats=%s", cached.get("intent"), intent_cache.stats())
+            return cached
+
+    system_prompt, tools = build_intent_prompt(
+        tuple(expense_cats), tuple(income_cats), current_date, want_title
+    )
+
     user_content: Any
     if image_base64:
         user_content = [
@@ -383,8 +563,9 @@ async def parse_user_intent(
     else:
         user_content = message
 
+    t_llm = time.perf_counter()
     try:
-        response = openai_client.chat.completions.create(
+        response = await openai_client.chat.completions.create(
             model=settings.llm_model,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -393,7 +574,16 @@ async def parse_user_intent(
             tools=tools,
             tool_choice="auto",
             max_completion_tokens=settings.llm_max_tokens,
+            **({"stream": True, "stream_options": {"include_usage": True}} if on_token else {}),
         )
+        if on_token:
+            _, tool_calls, usage = await _collect_stream(response, on_token)
+        else:
+            msg = response.choices[0].message
+            tool_calls = [(tc.function.name, tc.function.arguments) for tc in msg.tool_calls or []]
+            usage = response.usage
+    except openai.APITimeoutError:
+        raise LLMProcessingError(f"OpenAI request timed out after {settings.llm_timeout}s")
     except openai.APIConnectionError as e:
         raise LLMProcessingError(f"Could not connect to OpenAI: {str(e)}")
     except openai.RateLimitError as e:
@@ -401,25 +591,26 @@ async def parse_user_intent(
     except openai.APIStatusError as e:
         raise LLMProcessingError(f"OpenAI API error {e.status_code}: {e.message}")
 
+    fastpath_stats.record_llm((time.perf_counter() - t_llm) * 1000)
+
     tokens = 0
-    if response.usage:
-        tokens = response.usage.total_tokens or 0
+    if usage:
+        tokens = usage.total_tokens or 0
         if session_id:
             try:
                 await token_usage_service.log_token_usage(
                     session_id=session_id,
                     usage_type="llm_api",
-                    prompt_tokens=response.usage.prompt_tokens,
-                    completion_tokens=response.usage.completion_tokens,
+                    prompt_tokens=usage.prompt_tokens,
+                    completion_tokens=usage.completion_tokens,
                     total_tokens=tokens,
+                    cached_tokens=_cached_tokens(usage),
                     model=settings.llm_model,
                 )
             except DatabaseError:
                 pass
 
-    msg = response.choices[0].message
-
-    if not msg.tool_calls:
+    if not tool_calls:
         return {
             "intent": "chat",
             "confidence": 0.0,
@@ -427,31 +618,31 @@ async def parse_user_intent(
             "_tokens": tokens,
         }
 
-    if len(msg.tool_calls) > 1:
+    if len(tool_calls) > 1:
         expenses: List[Dict] = []
         income: List[Dict] = []
         events: List[Dict] = []
-        for tc in msg.tool_calls:
+        for name, arguments in tool_calls:
             try:
-                args = json.loads(tc.function.arguments)
+                args = json.loads(arguments)
             except json.JSONDecodeError:
                 args = {}
-            if tc.function.name == "add_expense":
+            if name == "add_expense":
                 expenses.extend(args.get("transactions", []))
-            elif tc.function.name == "add_income":
+            elif name == "add_income":
                 income.extend(args.get("transactions", []))
-            elif tc.function.name == "create_calendar_event":
+            elif name == "create_calendar_event":
                 events.extend(args.get("events", []))
-        return {
+        return _remember(cache_key, {
             "intent": "batch",
             "confidence": 0.95,
             "data": {"expenses": expenses, "income": income, "events": events},
             "_tokens": tokens,
-        }
+        })
 
-    tc = msg.tool_calls[0]
+    name, arguments = tool_calls[0]
     try:
-        args = json.loads(tc.function.arguments)
+        args = json.loads(arguments)
     except json.JSONDecodeError:
         args = {}
-    return _tool_call_to_intent(tc.function.name, args, tokens)
+    return _remember(cache_key, _tool_call_to_intent(name, args, tokens))
@@ -0,0 +1,103 @@
+"""Auth Cache - short-lived per-user credentials and token verdicts"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from google.oauth2.credentials import Credentials
+
+from config.config import settings
+
+
+@dataclass
+class _AuthEntry:
+    credentials: Optional[Credentials] = None
+    valid: Optional[bool] = None
+    expires_at: float = 0.0
+
+
+class AuthCache:
+    """
+    In-process cache of decrypted Credentials and has_valid_token verdicts per user.
+
+    A request checks the token and then loads credentials again for the API call;
+    both now come from one entry, so the ConnectedAccount/OAuthToken queries and the
+    Fernet decrypts run once per user per ttl_seconds instead of twice per request.
+    Entries are dropped whenever OAuthTokenService saves, refreshes or deletes a
+    token, so logout takes effect immediately. Safe to use from multiple threads.
+
+    Writers pass the generation() they read before loading from the DB; a put from a
+    load that raced with an invalidation is discarded instead of caching stale data.
+    """
+
+    def __init__(self, ttl_seconds: float = 60):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, _AuthEntry] = {}
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _live(self, user_id: int) -> Optional[_AuthEntry]:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        return entry
+
+    def get_credentials(self, user_id: int) -> Optional[Credentials]:
+        with self._lock:
+            entry = self._live(user_id)
+            if entry is None or entry.credentials is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.credentials
+
+    def get_verdict(self, user_id: int) -> Optional[bool]:
+        with self._lock:
+            entry = self._live(user_id)
+            if entry is None or entry.valid is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.valid
+
+    def generation(self, user_id: int) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def put_credentials(self, user_id: int, generation: int, credentials: Credentials) -> None:
+        self._put(user_id, generation, credentials=credentials)
+
+    def put_verdict(self, user_id: int, generation: int, valid: bool) -> None:
+        self._put(user_id, generation, valid=valid)
+
+    def _put(self, user_id: int, generation: int, **fields: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if self._generations.get(user_id, 0) != generation:
+                return
+            entry = self._live(user_id)
+            if entry is None:
+                entry = self._entries[user_id] = _AuthEntry(expires_at=time.monotonic() + self.ttl_seconds)
+            for name, value in fields.items():
+                setattr(entry, name, value)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Forget a user's credentials and verdict (token saved, refreshed or deleted)."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+auth_cache = AuthCache(ttl_seconds=settings.auth_cache_ttl_seconds)
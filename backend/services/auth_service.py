@@ -3,12 +3,15 @@ from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from pathlib import Path
 import json
+import threading
+from contextlib import contextmanager
 import requests
 from config.config import settings
 from sqlalchemy.orm import Session
 from services.user_service import UserService
 from services.oauth_token_service import OAuthTokenService
-from typing import Optional, Dict, Tuple
+from services.auth_cache import auth_cache
+from typing import Iterator, Optional, Dict, Tuple
 from datetime import datetime, timedelta
 from exceptions import (
     GoogleOAuthError,
@@ -22,6 +25,30 @@ from exceptions import (
 CONFIG_PATH = Path(__file__).parent.parent / "config"
 SCOPES = settings.google_scopes_list
 
+# One refresh in flight per user; other callers wait for it and reuse the result.
+# user_id -> (lock, callers holding or waiting for it); dropped when the count reaches 0
+_refresh_locks: Dict[int, Tuple[threading.Lock, int]] = {}
+_refresh_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _user_refresh_lock(user_id: int) -> Iterator[None]:
+    """Hold the user's refresh lock; the entry only lives while someone uses it."""
+    with _refresh_locks_guard:
+        lock, users = _refresh_locks.get(user_id, (None, 0))
+        lock = lock or threading.Lock()
+        _refresh_locks[user_id] = (lock, users + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _refresh_locks_guard:
+            _, users = _refresh_locks[user_id]
+            if users == 1:
+                del _refresh_locks[user_id]
+            else:
+                _refresh_locks[user_id] = (lock, users - 1)
+
 
 def _exchange_code_for_token(code: str, code_verifier: str) -> Dict:
     """
@@ -176,7 +203,7 @@ def handle_oauth_callback(code: str, code_verifier: str, db: Session) -> Dict:
 
 def get_credentials_for_user(db: Session, user_id: int) -> Optional[Credentials]:
     """
-    Load credentials from DB (decrypted)
+    Load credentials from DB (decrypted), reusing the short-lived auth_cache entry
     
     Args:
         db: Database session
@@ -188,6 +215,11 @@ def get_credentials_for_user(db: Session, user_id: int) -> Optional[Credentials]
     Raises:
         NoOAuthTokenError: If user has no valid token
     """
+    cached = auth_cache.get_credentials(user_id)
+    if cached is not None:
+        return cached
+
+    generation = auth_cache.generation(user_id)
     try:
         token_data = OAuthTokenService.get_decrypted_credentials(db, user_id)
         
@@ -200,8 +232,10 @@ def get_credentials_for_user(db: Session, user_id: int) -> Optional[Credentials]
             token_uri="https://oauth2.googleapis.com/token",
             client_id=settings.google_client_id,
             client_secret=settings.google_client_secret,
-            scopes=token_data['scope'].split() if token_data.get('scope') else SCOPES
+            scopes=token_data['scope'].split() if token_data.get('scope') else SCOPES,
+            expiry=token_data.get('expires_at'),
         )
+        auth_cache.put_credentials(user_id, generation, credentials)
         
         return credentials
         
@@ -216,6 +250,9 @@ def has_valid_token(db: Session, user_id: int) -> bool:
     Check if user has valid token
     - Token exists
     - Not expired (or can refresh)
+
+    Verdicts are cached per user for AUTH_CACHE_TTL_SECONDS and dropped on any
+    token save/refresh/delete.
     
     Args:
         db: Database session
@@ -224,6 +261,17 @@ def has_valid_token(db: Session, user_id: int) -> bool:
     Returns:
         True if valid token exists, False otherwise
     """
+    cached = auth_cache.get_verdict(user_id)
+    if cached is not None:
+        return cached
+
+    generation = auth_cache.generation(user_id)
+    valid = _check_token(db, user_id)
+    auth_cache.put_verdict(user_id, generation, valid)
+    return valid
+
+
+def _check_token(db: Session, user_id: int) -> bool:
     try:
         credentials = get_credentials_for_user(db, user_id)
         
@@ -232,20 +280,8 @@ def has_valid_token(db: Session, user_id: int) -> bool:
             # Try to refresh
             if credentials.refresh_token:
                 try:
-                    credentials.refresh(Request())
-                    
-                    # Update token in DB with new access token
-                    expires_at = credentials.expiry if hasattr(credentials, 'expiry') else None
-                    
-                    OAuthTokenService.update_token_expiry(
-                        db=db,
-                        user_id=user_id,
-                        new_access_token=credentials.token,
-                        expires_at=expires_at
-                    )
-                    
+                    refresh_credentials(db, user_id)
                     return True
-                    
                 except Exception as refresh_error:
                     return False
             else:
@@ -258,6 +294,52 @@ def has_valid_token(db: Session, user_id: int) -> bool:
         return False
 
 
+def _expires_within(credentials: Credentials, seconds: float) -> bool:
+    if credentials.expiry is None:
+        return False
+    return credentials.expired or credentials.expiry - datetime.utcnow() <= timedelta(seconds=seconds)
+
+
+def refresh_credentials(db: Session, user_id: int, lead_seconds: float = 0) -> Credentials:
+    """
+    Refresh the user's access token if it expires within lead_seconds (single-flight)
+    
+    Concurrent callers for the same user share one refresh: whoever gets the lock
+    refreshes and persists via OAuthTokenService.update_token_expiry; the others
+    then reload the already-fresh token and return without calling Google.
+    
+    Args:
+        db: Database session
+        user_id: User ID
+        lead_seconds: Refresh if the token expires within this many seconds
+        
+    Returns:
+        Credentials that are valid for at least lead_seconds
+        
+    Raises:
+        NoOAuthTokenError: If user has no token
+        TokenRefreshFailedError: If there is no refresh token or Google rejects it
+    """
+    with _user_refresh_lock(user_id):
+        credentials = get_credentials_for_user(db, user_id)
+        if not _expires_within(credentials, lead_seconds):
+            return credentials
+        if not credentials.refresh_token:
+            raise TokenRefreshFailedError("Google", "no refresh token")
+        try:
+            credentials.refresh(Request())
+        except Exception as e:
+            raise TokenRefreshFailedError("Google", str(e))
+
+        OAuthTokenService.update_token_expiry(
+            db=db,
+            user_id=user_id,
+            new_access_token=credentials.token,
+            expires_at=credentials.expiry,
+        )
+        return credentials
+
+
 def logout(db: Session, user_id: int) -> bool:
     """
     Logout user - delete token
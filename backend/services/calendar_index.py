@@ -0,0 +1,87 @@
+"""Calendar Index - in-memory interval index over a user's busy time"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+
+class IntervalIndex:
+    """
+    Immutable index over busy [start, end) intervals, built from the local event
+    store (CalendarStore.busy_intervals).
+
+    Intervals are kept sorted by start with a running maximum of their ends, so
+    "does [start, end) overlap anything, and with what" is one binary search.
+    Overlapping intervals are also merged into a sorted disjoint busy list, which
+    free-slot search walks from a binary-searched starting point.
+
+    Build: O(n log n). overlapping(): O(log n). free_slots(): O(log n + k) for
+    k busy blocks inside the searched range.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, datetime, str]]):
+        ordered = sorted((s, e, i) for s, e, i in intervals if e > s)
+        self._starts = [s for s, _, _ in ordered]
+        self._ends = [e for _, e, _ in ordered]
+        self._ids = [i for _, _, i in ordered]
+        # _max_end[k] / _max_at[k]: latest end among intervals 0..k and which interval has it
+        self._max_end: List[datetime] = []
+        self._max_at: List[int] = []
+        for k, (_, end, _) in enumerate(ordered):
+            if not self._max_end or end > self._max_end[-1]:
+                self._max_end.append(end)
+                self._max_at.append(k)
+            else:
+                self._max_end.append(self._max_end[-1])
+                self._max_at.append(self._max_at[-1])
+
+        self._busy_starts: List[datetime] = []
+        self._busy_ends: List[datetime] = []
+        for start, end, _ in ordered:
+            if self._busy_ends and start <= self._busy_ends[-1]:
+                self._busy_ends[-1] = max(self._busy_ends[-1], end)
+            else:
+                self._busy_starts.append(start)
+                self._busy_ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def overlapping(self, start: datetime, end: datetime, exclude: Optional[str] = None) -> Optional[str]:
+        """
+        Id of an interval overlapping [start, end), or None if that time is free.
+
+        exclude ignores that event id and its recurring instances ("<id>_..."), e.g.
+        the event being rescheduled; only when the excluded event is the one found
+        are the remaining candidates scanned.
+        """
+        # Only intervals starting before `end` can overlap; one of them does iff the latest end among them is after `start`
+        k = bisect_left(self._starts, end)
+        if k == 0 or self._max_end[k - 1] <= start:
+            return None
+        found = self._ids[self._max_at[k - 1]]
+        if not exclude or not _same_event(found, exclude):
+            return found
+        for j in range(k - 1, -1, -1):
+            if self._max_end[j] <= start:
+                break
+            if self._ends[j] > start and not _same_event(self._ids[j], exclude):
+                return self._ids[j]
+        return None
+
+    def free_slots(self, start: datetime, end: datetime, min_duration: timedelta) -> List[Tuple[datetime, datetime]]:
+        """Maximal free [start, end) gaps of at least min_duration inside [start, end)."""
+        slots = []
+        cursor = start
+        k = bisect_right(self._busy_ends, start)
+        while k < len(self._busy_starts) and self._busy_starts[k] < end:
+            if self._busy_starts[k] - cursor >= min_duration:
+                slots.append((cursor, self._busy_starts[k]))
+            cursor = max(cursor, self._busy_ends[k])
+            k += 1
+        if end - cursor >= min_duration:
+            slots.append((cursor, end))
+        return slots
+
+
+def _same_event(event_id: str, series_id: str) -> bool:
+    return event_id == series_id or event_id.startswith(series_id + "_")
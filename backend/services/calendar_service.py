@@ -1,14 +1,22 @@
 """Google Calendar Service"""
 from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from sqlalchemy.orm import Session
-from services.auth_service import get_credentials_for_user
+from services.auth_service import get_credentials_for_user, refresh_credentials
+from services.google_client_pool import google_client_pool, build_thread_safe_service
+from services.executors import run_google, run_db
 from config.config import settings
-from typing import Optional, List, Dict
+from services.calendar_store import CalendarStore, PRIMARY
+from services.calendar_index import IntervalIndex
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional, List, Dict
+from zoneinfo import ZoneInfo
 import datetime
+import logging
+import threading
+import time
 from exceptions import (
+    DatabaseError,
     GoogleCalendarError,
     NoOAuthTokenError,
     EventConflictError,
@@ -19,10 +27,36 @@ from exceptions import (
 
 SCOPES = settings.google_scopes_list
 
+logger = logging.getLogger(__name__)
+
+# Partial response for events.list: only the attributes the app reads (routers/calendar.py
+# _transform_event, chat read_calendar / event matching, the local store's status check)
+_EVENT_FIELDS = "id,status,summary,description,location,start,end,attendees(email)"
+_LIST_FIELDS = f"nextPageToken,nextSyncToken,timeZone,items({_EVENT_FIELDS})"
+_PAGE_SIZE = 250
+
+# Calendar batch requests take at most 50 calls
+_BATCH_SIZE = 50
+_EVENT_ARGS = ("summary", "start_datetime", "end_datetime", "description", "recurrence", "attendees", "location", "timezone")
+
+
+@dataclass
+class _BusyIndex:
+    """Interval index over one user's synced window of the local event store."""
+    index: IntervalIndex
+    synced_at: datetime.datetime
+    expires_at: float
+
+
+# Rebuilt when the store syncs or this process writes through; other processes'
+# writes show up after calendar_sync_interval_seconds
+_busy_cache: Dict[int, _BusyIndex] = {}
+_busy_lock = threading.Lock()
+
 
 def get_calendar_service(db: Session, user_id: int) -> object:
     """
-    Authenticate and return Calendar service for user
+    Authenticate and return Calendar service for user (pooled per user, thread-safe)
     
     Args:
         db: Database session
@@ -35,18 +69,20 @@ def get_calendar_service(db: Session, user_id: int) -> object:
         NoOAuthTokenError: If user has no valid OAuth token
         GoogleCalendarError: If service creation fails
     """
-    try:
+    def _factory():
         creds = get_credentials_for_user(db, user_id)
         
-        # Check and refresh if needed
+        # Check and refresh if needed (shared with concurrent callers, persisted)
         if creds.expired and creds.refresh_token:
             try:
-                creds.refresh(Request())
+                creds = refresh_credentials(db, user_id)
             except Exception as e:
                 raise GoogleCalendarError(f"Token refresh failed: {str(e)}")
         
-        service = build('calendar', 'v3', credentials=creds)
-        return service
+        return build_thread_safe_service('calendar', 'v3', creds)
+
+    try:
+        return google_client_pool.get(user_id, 'calendar', 'v3', _factory)
         
     except NoOAuthTokenError:
         raise
@@ -56,6 +92,12 @@ def get_calendar_service(db: Session, user_id: int) -> object:
         raise GoogleCalendarError(f"Failed to create calendar service: {str(e)}")
 
 
+def _window(days_ahead: int, days_back: int):
+    """(time_min, time_max) as naive UTC: from days_back days before today to days_ahead after."""
+    today = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - datetime.timedelta(days=days_back), today + datetime.timedelta(days=days_ahead)
+
+
 async def list_events(
     db: Session,
     user_id: int,
@@ -66,6 +108,9 @@ async def list_events(
     """
     Get list of events from today to next N days
     
+    Served from the local event store (synced incrementally when stale); windows
+    outside the store's full-sync range, or a store failure, fall back to the API.
+    
     Args:
         db: Database session
         user_id: User ID
@@ -79,34 +124,392 @@ async def list_events(
         NoOAuthTokenError: If user has no valid OAuth token
         GoogleCalendarError: If calendar operation fails
     """
+    return [event async for event in iter_events(db, user_id, max_results, days_ahead, days_back)]
+
+
+async def iter_events(
+    db: Session,
+    user_id: int,
+    max_results: int = 100,
+    days_ahead: int = 7,
+    days_back: int = 0,
+) -> AsyncIterator[Dict]:
+    """
+    Yield the events of a window in start-time order, up to max_results.
+    
+    Served from the local event store (synced incrementally when stale). Windows
+    outside the store's full-sync range, or a store failure, are read from the API
+    page by page: the next page is only requested once the caller has consumed
+    the previous one, and only the fields in _EVENT_FIELDS are transferred.
+    
+    Raises:
+        NoOAuthTokenError: If user has no valid OAuth token
+        GoogleCalendarError: If calendar operation fails
+    """
+    time_min, time_max = _window(days_ahead, days_back)
+    local = await _read_local(db, user_id, time_min, time_max, max_results)
+    if local is not None:
+        for event in local:
+            yield event
+        return
+
+    try:
+        service = await run_google(get_calendar_service, db, user_id)
+        remaining = max_results
+        async for page in _iter_pages(
+            service,
+            timeMin=time_min.isoformat() + 'Z',
+            timeMax=time_max.isoformat() + 'Z',
+            orderBy='startTime',
+            maxResults=min(max_results, _PAGE_SIZE),
+        ):
+            for event in page.get('items', [])[:remaining]:
+                yield event
+            remaining -= len(page.get('items', []))
+            if remaining <= 0:
+                return
+        
+    except (NoOAuthTokenError, GoogleCalendarError):
+        raise
+    except HttpError as e:
+        raise GoogleCalendarError(f"Calendar API error: {str(e)}")
+    except Exception as e:
+        raise GoogleCalendarError(f"Failed to list events: {str(e)}")
+
+
+async def _read_local(
+    db: Session, user_id: int, time_min: datetime.datetime, time_max: datetime.datetime, max_results: int
+) -> Optional[List[Dict]]:
+    """Window from the local store, syncing it first if needed; None if the store cannot serve it."""
+    try:
+        if await _synced_state(db, user_id, time_min, time_max) is not None:
+            return await run_db(CalendarStore.read_window, db, user_id, time_min, time_max, max_results)
+    except DatabaseError as e:
+        logger.warning("[calendar_store] read failed for user %s, using the API: %s", user_id, e)
+        await _store_write_through(db, user_id, CalendarStore.invalidate)
+    return None
+
+
+async def _synced_state(db: Session, user_id: int, time_min: datetime.datetime, time_max: datetime.datetime):
+    """
+    Sync the local store as needed to serve [time_min, time_max) and return its sync
+    state, or None if the window lies outside what a full sync mirrors.
+    
+    Raises:
+        NoOAuthTokenError / GoogleCalendarError: If a needed sync fails
+        DatabaseError: If the store cannot be read or written
+    """
+    sync_start, sync_end = _window(settings.calendar_sync_days_ahead, settings.calendar_sync_days_back)
+    if not (sync_start <= time_min and time_max <= sync_end):
+        return None
+    state = await run_db(CalendarStore.get_state, db, user_id)
+    if not CalendarStore.covers(state, time_min, time_max):
+        await sync_calendar(db, user_id, full=True)
+    elif not CalendarStore.is_fresh(state):
+        await sync_calendar(db, user_id)
+    else:
+        return state
+    state = await run_db(CalendarStore.get_state, db, user_id)
+    return state if CalendarStore.covers(state, time_min, time_max) else None
+
+
+async def _busy_index(
+    db: Session, user_id: int, time_min: datetime.datetime, time_max: datetime.datetime
+) -> Optional[IntervalIndex]:
+    """
+    Interval index over the busy time of the user's whole synced window, or None
+    if the store cannot serve [time_min, time_max). Built once per store sync and
+    reused until the next one, so each check is a binary search.
+    
+    Raises:
+        NoOAuthTokenError / GoogleCalendarError: If a needed sync fails
+        DatabaseError: If the store cannot be read
+    """
+    state = await _synced_state(db, user_id, time_min, time_max)
+    if state is None:
+        return None
+    now = time.monotonic()
+    with _busy_lock:
+        cached = _busy_cache.get(user_id)
+    if cached and cached.synced_at == state.synced_at and cached.expires_at > now:
+        return cached.index
+    
+    intervals = await run_db(CalendarStore.busy_intervals, db, user_id, state.window_start, state.window_end)
+    busy = _BusyIndex(
+        index=IntervalIndex(intervals),
+        synced_at=state.synced_at,
+        expires_at=now + settings.calendar_sync_interval_seconds,
+    )
+    with _busy_lock:
+        _busy_cache[user_id] = busy
+    return busy.index
+
+
+def _to_utc(value: str, tz: str) -> datetime.datetime:
+    """Naive UTC of an ISO datetime string; naive strings are local time in tz."""
     try:
-        service = get_calendar_service(db, user_id)
+        parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=ZoneInfo(tz))
+    except (ValueError, KeyError) as e:
+        raise ValidationError(f"Invalid datetime: {value} ({str(e)})", field="start_datetime")
+    return _naive_utc(parsed)
+
+
+async def check_conflict(
+    db: Session,
+    user_id: int,
+    start_datetime: str,
+    end_datetime: str,
+    timezone: str = "Asia/Ho_Chi_Minh",
+    exclude_event_id: Optional[str] = None,
+) -> None:
+    """
+    Check a time range against the user's timed events in the local event store
+    
+    All-day events do not count. When the store cannot serve the range (outside the
+    synced window, or a store failure) the check is skipped rather than guessed.
+    
+    Args:
+        db: Database session
+        user_id: User ID
+        start_datetime: Start time ISO format
+        end_datetime: End time ISO format
+        timezone: Time zone of naive start/end values
+        exclude_event_id: Event being rescheduled (not a conflict with itself)
         
-        # Get from days_back days before today
-        today = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        time_min = (today - datetime.timedelta(days=days_back)).isoformat() + 'Z'
+    Raises:
+        ValidationError: If the times are invalid
+        EventConflictError: If the range overlaps an existing event
+        NoOAuthTokenError: If user has no valid OAuth token
+        GoogleCalendarError: If the store needs a sync and it fails
+    """
+    start, end = _to_utc(start_datetime, timezone), _to_utc(end_datetime, timezone)
+    if end <= start:
+        raise ValidationError("End time must be after start time", field="end_datetime")
+    
+    try:
+        index = await _busy_index(db, user_id, start, end)
+    except DatabaseError as e:
+        logger.warning("[calendar_index] conflict check skipped for user %s: %s", user_id, e)
+        return
+    if index is None:
+        return
+    conflict_id = index.overlapping(start, end, exclude=exclude_event_id)
+    if conflict_id:
+        raise EventConflictError(event_id=conflict_id)
+
+
+async def find_free_slots(
+    db: Session,
+    user_id: int,
+    date_from: Optional[datetime.date] = None,
+    days: int = 7,
+    duration_minutes: int = 60,
+    work_start_hour: Optional[int] = None,
+    work_end_hour: Optional[int] = None,
+    include_weekends: Optional[bool] = None,
+) -> List[Dict]:
+    """
+    Find free time within working hours, from the local event store
+    
+    Working hours and weekends default to the calendar_work_* settings and are
+    local time in settings.calendar_timezone. Time already past is never free.
+    
+    Args:
+        db: Database session
+        user_id: User ID
+        date_from: First day to search (default: today)
+        days: Number of days to search
+        duration_minutes: Minimum length of a slot
+        work_start_hour: Start of the working day (0-23)
+        work_end_hour: End of the working day (1-24)
+        include_weekends: Also search Saturdays and Sundays
         
-        # To end of N days ahead
-        end_date = today + datetime.timedelta(days=days_ahead)
-        time_max = end_date.isoformat() + 'Z'
+    Returns:
+        List of {"start", "end", "duration_minutes"} dicts (aware local datetimes), in time order
         
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=time_min,
-            timeMax=time_max,
-            maxResults=max_results,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
+    Raises:
+        ValidationError: If the working hours are invalid or the range is outside the synced window
+        NoOAuthTokenError: If user has no valid OAuth token
+        GoogleCalendarError: If the store needs a sync and it fails
+        DatabaseError: If the store cannot be read
+    """
+    start_hour = settings.calendar_work_start_hour if work_start_hour is None else work_start_hour
+    end_hour = settings.calendar_work_end_hour if work_end_hour is None else work_end_hour
+    weekends = settings.calendar_work_weekends if include_weekends is None else include_weekends
+    if not 0 <= start_hour < end_hour <= 24:
+        raise ValidationError("Working hours must satisfy 0 <= start < end <= 24", field="work_start_hour")
+    
+    tz = ZoneInfo(settings.calendar_timezone)
+    now = datetime.datetime.now(tz)
+    first_day = date_from or now.date()
+    min_duration = datetime.timedelta(minutes=duration_minutes)
+    
+    windows = []
+    for offset in range(days):
+        day = first_day + datetime.timedelta(days=offset)
+        if not weekends and day.weekday() >= 5:
+            continue
+        midnight = datetime.datetime.combine(day, datetime.time(), tz)
+        window_start = max(midnight + datetime.timedelta(hours=start_hour), now)
+        window_end = midnight + datetime.timedelta(hours=end_hour)
+        if window_end - window_start >= min_duration:
+            windows.append((_naive_utc(window_start), _naive_utc(window_end)))
+    if not windows:
+        return []
+    
+    index = await _busy_index(db, user_id, windows[0][0], windows[-1][1])
+    if index is None:
+        raise ValidationError(
+            f"Free-slot search is limited to the next {settings.calendar_sync_days_ahead} days",
+            field="date_from",
+        )
+    
+    slots = []
+    for window_start, window_end in windows:
+        for start, end in index.free_slots(window_start, window_end, min_duration):
+            slots.append({
+                "start": start.replace(tzinfo=datetime.timezone.utc).astimezone(tz),
+                "end": end.replace(tzinfo=datetime.timezone.utc).astimezone(tz),
+                "duration_minutes": int((end - start).total_seconds() // 60),
+            })
+    return slots
+
+
+def _naive_utc(value: datetime.datetime) -> datetime.datetime:
+    return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+async def sync_calendar(db: Session, user_id: int, full: bool = False) -> Dict:
+    """
+    Bring the local event store up to date with the user's primary calendar.
+    
+    Uses the stored syncToken to fetch only changed/deleted events; does a full
+    sync of the configured window when there is no token, when full=True, or when
+    Google expires the token (410 Gone).
+    
+    Returns:
+        {"full": bool, "changes": n} - events written by this sync
         
-        return events_result.get('items', [])
+    Raises:
+        NoOAuthTokenError: If user has no valid OAuth token
+        GoogleCalendarError: If calendar operation fails
+        DatabaseError: If the store cannot be written
+    """
+    state = None if full else await run_db(CalendarStore.get_state, db, user_id)
+    try:
+        service = await run_google(get_calendar_service, db, user_id)
         
-    except (NoOAuthTokenError, GoogleCalendarError):
+        if state is not None and state.sync_token:
+            try:
+                items, sync_token, tz = await _list_all_pages(service, syncToken=state.sync_token)
+                await run_db(CalendarStore.apply_changes, db, user_id, PRIMARY, items, sync_token, tz)
+                return {"full": False, "changes": len(items)}
+            except HttpError as e:
+                if e.resp.status != 410:
+                    raise
+                logger.info("[calendar_store] sync token expired for user %s, full sync", user_id)
+        
+        window_start, window_end = _window(settings.calendar_sync_days_ahead, settings.calendar_sync_days_back)
+        items, sync_token, tz = await _list_all_pages(
+            service,
+            timeMin=window_start.isoformat() + 'Z',
+            timeMax=window_end.isoformat() + 'Z',
+        )
+        
+    except (NoOAuthTokenError, GoogleCalendarError, DatabaseError):
         raise
     except HttpError as e:
         raise GoogleCalendarError(f"Calendar API error: {str(e)}")
     except Exception as e:
-        raise GoogleCalendarError(f"Failed to list events: {str(e)}")
+        raise GoogleCalendarError(f"Failed to sync events: {str(e)}")
+    
+    await run_db(CalendarStore.replace_all, db, user_id, PRIMARY, items, sync_token, window_start, window_end, tz)
+    return {"full": True, "changes": len(items)}
+
+
+async def _list_all_pages(service, **params):
+    """All items of an events.list (following nextPageToken), its nextSyncToken and the calendar time zone."""
+    items: List[Dict] = []
+    async for page in _iter_pages(service, maxResults=2500, **params):
+        items.extend(page.get('items', []))
+    return items, page.get('nextSyncToken'), page.get('timeZone') or 'UTC'
+
+
+async def _iter_pages(service, **params) -> AsyncIterator[Dict]:
+    """Pages of an expanded (singleEvents) events.list, fetched as they are consumed."""
+    page_token = None
+    while True:
+        page = await run_google(service.events().list(
+            calendarId='primary',
+            singleEvents=True,
+            fields=_LIST_FIELDS,
+            pageToken=page_token,
+            **params,
+        ).execute)
+        yield page
+        page_token = page.get('nextPageToken')
+        if not page_token:
+            return
+
+
+async def _store_write_through(db: Session, user_id: int, record: Callable, *args) -> None:
+    """
+    Apply a calendar write to the local event store.
+    
+    Google is the source of truth and has already been written, so a store
+    failure only forces a full sync on the next read.
+    """
+    with _busy_lock:
+        _busy_cache.pop(user_id, None)
+    try:
+        await run_db(record, db, user_id, *args)
+    except Exception as e:
+        logger.warning("[calendar_store] write-through failed for user %s: %s", user_id, e)
+        try:
+            db.rollback()
+            await run_db(CalendarStore.invalidate, db, user_id)
+        except Exception:
+            pass
+
+
+def _event_body(
+    summary: str,
+    start_datetime: str,
+    end_datetime: str,
+    description: Optional[str] = None,
+    recurrence: Optional[List[str]] = None,
+    attendees: Optional[List[str]] = None,
+    location: Optional[str] = None,
+    timezone: str = "Asia/Ho_Chi_Minh",
+) -> Dict:
+    """Event resource for events.insert."""
+    event = {
+        'summary': summary.strip(),
+        'start': {
+            'dateTime': start_datetime,
+            'timeZone': timezone,
+        },
+        'end': {
+            'dateTime': end_datetime,
+            'timeZone': timezone,
+        }
+    }
+    
+    if description:
+        event['description'] = description
+    
+    if recurrence:
+        event['recurrence'] = recurrence
+    
+    if attendees:
+        event['attendees'] = [{'email': email.strip()} for email in attendees if email.strip()]
+    
+    if location:
+        event['location'] = location
+    
+    return event
 
 
 async def create_event(
@@ -120,6 +523,7 @@ async def create_event(
     attendees: Optional[List[str]] = None,
     location: Optional[str] = None,
     timezone: str = "Asia/Ho_Chi_Minh",
+    check_conflicts: bool = False,
 ) -> Dict:
     """
     Create an event in user's calendar
@@ -134,12 +538,14 @@ async def create_event(
         recurrence: RRULE format list
         attendees: List of attendee emails
         location: Event location
+        check_conflicts: Refuse times that overlap an existing event (see check_conflict)
         
     Returns:
         Created event dict
         
     Raises:
         ValidationError: If required fields are missing or invalid
+        EventConflictError: If check_conflicts and the time is taken
         NoOAuthTokenError: If user has no valid OAuth token
         GoogleCalendarError: If event creation fails
     """
@@ -148,41 +554,21 @@ async def create_event(
         raise ValidationError("Event summary cannot be empty")
     if not start_datetime or not end_datetime:
         raise ValidationError("Start and end times are required")
+    if check_conflicts:
+        await check_conflict(db, user_id, start_datetime, end_datetime, timezone)
     
     try:
-        service = get_calendar_service(db, user_id)
-        
-        # Create event object
-        event = {
-            'summary': summary.strip(),
-            'start': {
-                'dateTime': start_datetime,
-                'timeZone': timezone,
-            },
-            'end': {
-                'dateTime': end_datetime,
-                'timeZone': timezone,
-            }
-        }
-        
-        if description:
-            event['description'] = description
+        service = await run_google(get_calendar_service, db, user_id)
         
-        if recurrence:
-            event['recurrence'] = recurrence
-        
-        if attendees:
-            event['attendees'] = [{'email': email.strip()} for email in attendees if email.strip()]
+        event = _event_body(summary, start_datetime, end_datetime, description, recurrence, attendees, location, timezone)
         
-        if location:
-            event['location'] = location
-        
-        created_event = service.events().insert(
+        created_event = await run_google(service.events().insert(
             calendarId='primary',
             body=event,
             sendUpdates='all'
-        ).execute()
+        ).execute)
         
+        await _store_write_through(db, user_id, CalendarStore.record_upserted, created_event)
         return created_event
         
     except (ValidationError, NoOAuthTokenError, GoogleCalendarError):
@@ -205,6 +591,7 @@ async def update_event(
     attendees: Optional[List[str]] = None,
     location: Optional[str] = None,
     timezone: str = "Asia/Ho_Chi_Minh",
+    check_conflicts: bool = False,
 ) -> Dict:
     """
     Update an event in user's calendar
@@ -220,27 +607,31 @@ async def update_event(
         recurrence: New recurrence rules
         attendees: New attendee list
         location: New location
+        check_conflicts: Refuse a new time that overlaps another event (see check_conflict)
         
     Returns:
         Updated event dict
         
     Raises:
         ValidationError: If event_id is missing
+        EventConflictError: If check_conflicts and the new time is taken
         EventNotFoundError: If event not found
         NoOAuthTokenError: If user has no valid OAuth token
         GoogleCalendarError: If update fails
     """
     if not event_id:
         raise ValidationError("Event ID is required")
+    if check_conflicts and start_datetime is not None and end_datetime is not None:
+        await check_conflict(db, user_id, start_datetime, end_datetime, timezone, exclude_event_id=event_id)
     
     try:
-        service = get_calendar_service(db, user_id)
+        service = await run_google(get_calendar_service, db, user_id)
         
         # Get current event
-        event = service.events().get(
+        event = await run_google(service.events().get(
             calendarId='primary',
             eventId=event_id
-        ).execute()
+        ).execute)
         
         # Update only provided fields
         if summary is not None:
@@ -262,13 +653,14 @@ async def update_event(
         if location is not None:
             event['location'] = location
         
-        updated_event = service.events().update(
+        updated_event = await run_google(service.events().update(
             calendarId='primary',
             eventId=event_id,
             body=event,
             sendUpdates='all'
-        ).execute()
+        ).execute)
         
+        await _store_write_through(db, user_id, CalendarStore.record_upserted, updated_event)
         return updated_event
         
     except (ValidationError, NoOAuthTokenError, GoogleCalendarError):
@@ -307,14 +699,15 @@ async def delete_event(
         raise ValidationError("Event ID is required")
     
     try:
-        service = get_calendar_service(db, user_id)
+        service = await run_google(get_calendar_service, db, user_id)
         
-        service.events().delete(
+        await run_google(service.events().delete(
             calendarId='primary',
             eventId=event_id,
             sendUpdates='all'
-        ).execute()
+        ).execute)
         
+        await _store_write_through(db, user_id, CalendarStore.record_deleted, event_id)
         return True
         
     except (ValidationError, NoOAuthTokenError, GoogleCalendarError):
@@ -324,4 +717,140 @@ async def delete_event(
             raise EventNotFoundError(event_id=event_id)
         raise GoogleCalendarError(f"Calendar API error: {str(e)}")
     except Exception as e:
-        raise GoogleCalendarError(f"Failed to delete event: {str(e)}")
\ No newline at end of file
+        raise GoogleCalendarError(f"Failed to delete event: {str(e)}")
+
+
+async def batch_events(db: Session, user_id: int, operations: List[Dict]) -> List[Dict]:
+    """
+    Create, update and delete several events in as few round trips as possible
+    
+    Operations go through Google's batch HTTP endpoint, up to _BATCH_SIZE per
+    request, so N operations cost about one round trip instead of N. Updates are
+    sent as events.patch (only the given fields), so no events.get is needed.
+    One failing operation does not affect the others.
+    
+    Args:
+        db: Database session
+        user_id: User ID
+        operations: Dicts with "op" ("create" | "update" | "delete"), "event_id"
+            (update/delete) and, for create/update, the create_event/update_event
+            keyword fields (summary, start_datetime, end_datetime, ...)
+        
+    Returns:
+        One {"op", "event_id", "success", "event", "error"} dict per operation, in order
+        
+    Raises:
+        NoOAuthTokenError: If user has no valid OAuth token
+        GoogleCalendarError: If the batch request itself fails
+    """
+    results: List[Optional[Dict]] = [None] * len(operations)
+    pending = []
+    for i, operation in enumerate(operations):
+        op = operation.get("op")
+        event_id = operation.get("event_id")
+        try:
+            fields = {k: operation.get(k) for k in _EVENT_ARGS if operation.get(k) is not None}
+            if op == "create":
+                if not (fields.get("summary") or "").strip():
+                    raise ValidationError("Event summary cannot be empty")
+                if not fields.get("start_datetime") or not fields.get("end_datetime"):
+                    raise ValidationError("Start and end times are required")
+                body = _event_body(**fields)
+            elif op in ("update", "delete"):
+                if not event_id:
+                    raise ValidationError("Event ID is required")
+                body = _patch_body(**fields) if op == "update" else None
+            else:
+                raise ValidationError(f"Unknown batch operation: {op}")
+        except ValidationError as e:
+            results[i] = {"op": op, "event_id": event_id, "success": False, "event": None, "error": e.message}
+            continue
+        pending.append((i, op, event_id, body))
+    
+    if pending:
+        try:
+            service = await run_google(get_calendar_service, db, user_id)
+            await run_google(_execute_batches, service, pending, results)
+        except (NoOAuthTokenError, GoogleCalendarError):
+            raise
+        except HttpError as e:
+            raise GoogleCalendarError(f"Calendar API error: {str(e)}")
+        except Exception as e:
+            raise GoogleCalendarError(f"Failed to run batch: {str(e)}")
+    
+    for result in results:
+        if not result["success"]:
+            continue
+        if result["op"] == "delete":
+            await _store_write_through(db, user_id, CalendarStore.record_deleted, result["event_id"])
+        else:
+            await _store_write_through(db, user_id, CalendarStore.record_upserted, result["event"])
+    return results
+
+
+def _patch_body(
+    summary: Optional[str] = None,
+    start_datetime: Optional[str] = None,
+    end_datetime: Optional[str] = None,
+    description: Optional[str] = None,
+    recurrence: Optional[List[str]] = None,
+    attendees: Optional[List[str]] = None,
+    location: Optional[str] = None,
+    timezone: str = "Asia/Ho_Chi_Minh",
+) -> Dict:
+    """Partial event resource for events.patch, same field rules as update_event."""
+    event: Dict = {}
+    if summary is not None:
+        event['summary'] = summary.strip()
+    if description is not None:
+        event['description'] = description
+    if start_datetime is not None and end_datetime is not None:
+        event['start'] = {'dateTime': start_datetime, 'timeZone': timezone}
+        event['end'] = {'dateTime': end_datetime, 'timeZone': timezone}
+    if recurrence is not None:
+        event['recurrence'] = recurrence
+    if attendees is not None:
+        event['attendees'] = [{'email': email.strip()} for email in attendees if email.strip()]
+    if location is not None:
+        event['location'] = location
+    return event
+
+
+def _execute_batches(service, pending: List, results: List[Optional[Dict]]) -> None:
+    """
+    Send pending (index, op, event_id, body) operations as batch requests, filling results.
+    
+    Runs entirely on one executor thread: the requests must be built on the thread
+    whose Http executes them (see build_thread_safe_service).
+    """
+    ops = {str(i): (op, event_id) for i, op, event_id, _ in pending}
+
+    def _callback(request_id: str, response: Optional[Dict], exception: Optional[Exception]) -> None:
+        op, event_id = ops[request_id]
+        if exception is None:
+            results[int(request_id)] = {
+                "op": op,
+                "event_id": (response or {}).get('id', event_id),
+                "success": True,
+                "event": response or None,
+                "error": None,
+            }
+            return
+        if isinstance(exception, HttpError) and exception.resp.status in (404, 410):
+            error = f"Event not found: {event_id}"
+        else:
+            error = f"Calendar API error: {str(exception)}"
+        results[int(request_id)] = {"op": op, "event_id": event_id, "success": False, "event": None, "error": error}
+
+    events = service.events()
+    for start in range(0, len(pending), _BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=_callback)
+        for i, op, event_id, body in pending[start:start + _BATCH_SIZE]:
+            if op == "create":
+                request = events.insert(calendarId='primary', body=body, sendUpdates='all')
+            elif op == "update":
+                request = events.patch(calendarId='primary', eventId=event_id, body=body, sendUpdates='all')
+            else:
+                request = events.delete(calendarId='primary', eventId=event_id, sendUpdates='all')
+            batch.add(request, request_id=str(i))
+        batch.execute()
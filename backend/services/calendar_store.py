@@ -0,0 +1,265 @@
+"""Calendar Store - local DB mirror of a user's Google Calendar events"""
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.orm import Session
+
+from config.config import settings
+from exceptions import DatabaseError
+from models.calendar_event import CalendarEventEntry, CalendarSyncState
+
+PRIMARY = "primary"
+
+
+def _to_utc(value: datetime) -> datetime:
+    """Naive UTC, the form stored in start_at / end_at."""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _parse_time(when: Dict, default_tz: str) -> Tuple[datetime, bool]:
+    """(UTC start/end, is_all_day) of an event's start or end object."""
+    if when.get("dateTime"):
+        return _to_utc(datetime.fromisoformat(when["dateTime"].replace("Z", "+00:00"))), False
+    try:
+        tz = ZoneInfo(when.get("timeZone") or default_tz)
+    except Exception:
+        tz = timezone.utc
+    return _to_utc(datetime.fromisoformat(when["date"]).replace(tzinfo=tz)), True
+
+
+class CalendarStore:
+    """
+    Keeps one CalendarEventEntry per event instance (singleEvents=True) of a user's
+    calendar, so window reads are an indexed query instead of an events.list call.
+
+    calendar_service does one full sync of the window [now - calendar_sync_days_back,
+    now + calendar_sync_days_ahead], then applies Google's incremental syncToken
+    changes once the store is older than calendar_sync_interval_seconds, and writes
+    through on create/update/delete. Windows outside the full-sync range are read
+    from the API directly. Write-through is skipped while a calendar has never been
+    synced; the first read does a full sync instead.
+    """
+
+    @staticmethod
+    def get_state(db: Session, user_id: int, calendar_id: str = PRIMARY) -> Optional[CalendarSyncState]:
+        return db.get(CalendarSyncState, (user_id, calendar_id))
+
+    @staticmethod
+    def covers(state: Optional[CalendarSyncState], start: datetime, end: datetime) -> bool:
+        """True if [start, end) lies inside the window of the last full sync."""
+        return state is not None and state.window_start <= start and end <= state.window_end
+
+    @staticmethod
+    def is_fresh(state: Optional[CalendarSyncState]) -> bool:
+        """True if the store was synced within the configured interval."""
+        if state is None:
+            return False
+        max_age = timedelta(seconds=settings.calendar_sync_interval_seconds)
+        return datetime.utcnow() - state.synced_at < max_age
+
+    @staticmethod
+    def replace_all(
+        db: Session,
+        user_id: int,
+        calendar_id: str,
+        events: List[Dict],
+        sync_token: Optional[str],
+        window_start: datetime,
+        window_end: datetime,
+        default_tz: str = "UTC",
+    ) -> None:
+        """
+        Replace the store with the result of a full sync.
+
+        Args:
+            events: Event resources from events.list (singleEvents=True)
+            sync_token: nextSyncToken of the last page (None disables incremental sync)
+            window_start / window_end: timeMin / timeMax of the full sync (naive UTC)
+            default_tz: Calendar time zone, used for all-day events
+
+        Raises:
+            DatabaseError: If the database operation fails
+        """
+        try:
+            CalendarStore._entries(db, user_id, calendar_id).delete(synchronize_session=False)
+            db.add_all(
+                CalendarStore._entry(user_id, calendar_id, event, default_tz)
+                for event in events
+                if event.get("status") != "cancelled"
+            )
+            state = CalendarStore.get_state(db, user_id, calendar_id)
+            if state is None:
+                state = CalendarSyncState(user_id=user_id, calendar_id=calendar_id)
+                db.add(state)
+            state.sync_token = sync_token
+            state.window_start = window_start
+            state.window_end = window_end
+            state.synced_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise DatabaseError(f"Failed to replace calendar events: {str(e)}")
+
+    @staticmethod
+    def apply_changes(
+        db: Session,
+        user_id: int,
+        calendar_id: str,
+        events: List[Dict],
+        sync_token: Optional[str],
+        default_tz: str = "UTC",
+    ) -> None:
+        """
+        Apply the result of an incremental (syncToken) sync: upsert changed events,
+        drop cancelled ones, store the new token.
+
+        Raises:
+            DatabaseError: If the database operation fails
+        """
+        try:
+            for event in events:
+                if event.get("status") == "cancelled":
+                    CalendarStore._delete(db, user_id, calendar_id, event["id"])
+                else:
+                    CalendarStore._upsert(db, user_id, calendar_id, event, default_tz)
+            state = CalendarStore.get_state(db, user_id, calendar_id)
+            if state is not None:
+                state.sync_token = sync_token
+                state.synced_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise DatabaseError(f"Failed to apply calendar changes: {str(e)}")
+
+    @staticmethod
+    def read_window(
+        db: Session, user_id: int, start: datetime, end: datetime, limit: int, calendar_id: str = PRIMARY
+    ) -> List[Dict]:
+        """Event resources overlapping [start, end) (naive UTC), by start time."""
+        entries = (
+            CalendarStore._entries(db, user_id, calendar_id)
+            .filter(CalendarEventEntry.start_at < end, CalendarEventEntry.end_at > start)
+            .order_by(CalendarEventEntry.start_at, CalendarEventEntry.entry_id)
+            .limit(limit)
+            .all()
+        )
+        return [e.to_dict() for e in entries]
+
+    @staticmethod
+    def busy_intervals(
+        db: Session,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        exclude_event_id: Optional[str] = None,
+        calendar_id: str = PRIMARY,
+    ) -> List[Tuple[datetime, datetime, str]]:
+        """
+        (start_at, end_at, event_id) of the timed events overlapping [start, end) (naive UTC).
+
+        All-day events (birthdays, holidays, reminders) do not block time.
+        exclude_event_id leaves out that event (or all instances of that series),
+        e.g. the event being rescheduled.
+        """
+        query = CalendarStore._entries(db, user_id, calendar_id).with_entities(
+            CalendarEventEntry.start_at, CalendarEventEntry.end_at, CalendarEventEntry.event_id
+        ).filter(
+            CalendarEventEntry.start_at < end,
+            CalendarEventEntry.end_at > start,
+            CalendarEventEntry.all_day.is_(False),
+        )
+        if exclude_event_id:
+            query = query.filter(
+                CalendarEventEntry.event_id != exclude_event_id,
+                ~CalendarEventEntry.event_id.startswith(exclude_event_id + "_", autoescape=True),
+            )
+        return [tuple(row) for row in query.all()]
+
+    @staticmethod
+    def record_upserted(db: Session, user_id: int, event: Dict, calendar_id: str = PRIMARY) -> None:
+        """
+        Mirror an events.insert / events.update.
+
+        A recurring event comes back as its master resource, not as the instances
+        the store holds, so the store is marked stale instead and the next read
+        picks the instances up through incremental sync.
+        """
+        if CalendarStore.get_state(db, user_id, calendar_id) is None:
+            return
+        if event.get("recurrence"):
+            CalendarStore.mark_stale(db, user_id, calendar_id)
+            return
+        CalendarStore._upsert(db, user_id, calendar_id, event, event.get("start", {}).get("timeZone") or "UTC")
+        db.commit()
+
+    @staticmethod
+    def record_deleted(db: Session, user_id: int, event_id: str, calendar_id: str = PRIMARY) -> None:
+        """Mirror an events.delete (of a single event or of a recurring series)."""
+        if CalendarStore.get_state(db, user_id, calendar_id) is None:
+            return
+        CalendarStore._delete(db, user_id, calendar_id, event_id)
+        db.commit()
+
+    @staticmethod
+    def mark_stale(db: Session, user_id: int, calendar_id: str = PRIMARY) -> None:
+        """Force an incremental sync on the next read."""
+        db.query(CalendarSyncState).filter(
+            CalendarSyncState.user_id == user_id,
+            CalendarSyncState.calendar_id == calendar_id,
+        ).update({CalendarSyncState.synced_at: datetime(1970, 1, 1)}, synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def invalidate(db: Session, user_id: int, calendar_id: str = PRIMARY) -> None:
+        """Force a full sync on the next read."""
+        db.query(CalendarSyncState).filter(
+            CalendarSyncState.user_id == user_id,
+            CalendarSyncState.calendar_id == calendar_id,
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def _entries(db: Session, user_id: int, calendar_id: str):
+        return db.query(CalendarEventEntry).filter(
+            CalendarEventEntry.user_id == user_id,
+            CalendarEventEntry.calendar_id == calendar_id,
+        )
+
+    @staticmethod
+    def _entry(user_id: int, calendar_id: str, event: Dict, default_tz: str) -> CalendarEventEntry:
+        start_at, all_day = _parse_time(event.get("start", {}), default_tz)
+        end_at, _ = _parse_time(event.get("end", {}), default_tz)
+        return CalendarEventEntry(
+            user_id=user_id,
+            calendar_id=calendar_id,
+            event_id=event["id"],
+            start_at=start_at,
+            end_at=end_at,
+            all_day=all_day,
+            resource_json=json.dumps(event, ensure_ascii=False),
+        )
+
+    @staticmethod
+    def _upsert(db: Session, user_id: int, calendar_id: str, event: Dict, default_tz: str) -> None:
+        fresh = CalendarStore._entry(user_id, calendar_id, event, default_tz)
+        entry = CalendarStore._entries(db, user_id, calendar_id).filter(
+            CalendarEventEntry.event_id == event["id"]
+        ).first()
+        if entry is None:
+            db.add(fresh)
+        else:
+            entry.start_at = fresh.start_at
+            entry.end_at = fresh.end_at
+            entry.all_day = fresh.all_day
+            entry.resource_json = fresh.resource_json
+
+    @staticmethod
+    def _delete(db: Session, user_id: int, calendar_id: str, event_id: str) -> None:
+        # Instances of a recurring event have ids "<series id>_<start>"
+        query = CalendarStore._entries(db, user_id, calendar_id)
+        query.filter(
+            (CalendarEventEntry.event_id == event_id)
+            | CalendarEventEntry.event_id.startswith(event_id + "_", autoescape=True)
+        ).delete(synchronize_session=False)
@@ -1,13 +1,19 @@
 """Chat Service - AI chat with message persistence and intent parsing"""
+import asyncio
+import base64
 import json
 import logging
 import time
-from typing import Optional, Dict, List
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional, Dict, List, Set, Tuple
 
 logger = logging.getLogger(__name__)
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
 from services.ai_service import parse_user_intent, smart_event_operation, generate_chat_title
+from services.event_matcher import match_event
+from services.executors import run_google, run_db
 from models.message import Message, MessageRole
 from models.assistant_session import AssistantSession, SessionStatus
 from models.workspace import Workspace, WorkspaceStatus
@@ -30,6 +36,74 @@ def _find_invalid_amounts(data) -> bool:
     )
 
 
+_TIME_FIELDS = ("start_datetime", "end_datetime")
+
+
+def _keep_duration(updates: Dict, event: Dict) -> Dict:
+    """
+    Fill in the missing end (or start) of a time change from the event's own duration.
+
+    Calendar updates only move the time when both ends are given, so a reply that
+    only says where the event now starts would otherwise drop the change.
+    """
+    if not event or ("start_datetime" in updates) == ("end_datetime" in updates):
+        return updates
+    try:
+        old_start = datetime.fromisoformat(event["start"]["dateTime"].replace("Z", "+00:00"))
+        old_end = datetime.fromisoformat(event["end"]["dateTime"].replace("Z", "+00:00"))
+        if "start_datetime" in updates:
+            start = datetime.fromisoformat(updates["start_datetime"])
+            return {**updates, "end_datetime": (start + (old_end - old_start)).isoformat()}
+        end = datetime.fromisoformat(updates["end_datetime"])
+        return {**updates, "start_datetime": (end - (old_end - old_start)).isoformat()}
+    except (KeyError, TypeError, ValueError):
+        # All-day event or unparsable time: leave it to the confirmation form
+        return updates
+
+
+# Strong references to fire-and-forget tasks so they are not garbage-collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
+
+
+async def _set_title_later(session_id: int, message: str) -> None:
+    """Generate a session title after the response has been sent and store it if still unset."""
+    from config.database import SessionLocal
+
+    title = await generate_chat_title(message)
+    if not title:
+        return
+
+    def _save() -> None:
+        db = SessionLocal()
+        try:
+            db.query(AssistantSession).filter(
+                AssistantSession.session_id == session_id,
+                AssistantSession.title.is_(None),
+            ).update({AssistantSession.title: title}, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning("[title] failed to save title for session %s: %s", session_id, e)
+        finally:
+            db.close()
+
+    await run_db(_save)
+
+
+def _encode_session_cursor(updated_at: datetime, session_id: int) -> str:
+    raw = f"{updated_at.isoformat()}|{session_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_session_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        updated_at, session_id = raw.split("|")
+        return datetime.fromisoformat(updated_at), int(session_id)
+    except Exception:
+        raise ValidationError("Invalid session cursor", field="cursor")
+
+
 class ChatService:
 
     @staticmethod
@@ -82,10 +156,15 @@ class ChatService:
         session_id: Optional[int] = None,
         image_base64: Optional[str] = None,
         history: Optional[List] = None,
+        emit: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
     ) -> Dict:
         """
         Send message to AI, persist to DB, return structured response.
 
+        If emit is given it is awaited with progress events as each stage finishes:
+        "token" (chat reply text deltas), "intent", "calendar", "sheet", "actions" and
+        "persisted". The return value and the stored messages do not depend on it.
+
         Raises:
             ValidationError: If message is empty
             SessionNotFoundError: If given session_id does not exist
@@ -95,18 +174,24 @@ class ChatService:
         if not message.strip() and not image_base64:
             raise ValidationError("Message cannot be empty")
 
+        async def _emit(event: str, payload: Dict[str, Any]) -> None:
+            if emit is not None:
+                await emit(event, payload)
+
         try:
             # Get or create session
             is_new_session = not bool(session_id)
             if session_id:
-                session = db.query(AssistantSession).filter(
-                    AssistantSession.session_id == session_id,
-                    AssistantSession.user_id == user_id,
-                ).first()
+                session = await run_db(
+                    lambda: db.query(AssistantSession).filter(
+                        AssistantSession.session_id == session_id,
+                        AssistantSession.user_id == user_id,
+                    ).first()
+                )
                 if not session:
                     raise SessionNotFoundError(session_id=session_id)
             else:
-                session = ChatService.create_session(db, user_id)
+                session = await run_db(ChatService.create_session, db, user_id)
                 session_id = session.session_id
 
             t_start = time.monotonic()
@@ -119,8 +204,8 @@ class ChatService:
                 from services.sheets_service import get_categories as fetch_categories
                 from services.sheets_service import get_income_categories as fetch_income_categories
                 if settings.google_sheet_id:
-                    categories = fetch_categories(db, user_id, settings.google_sheet_id)
-                    income_categories = fetch_income_categories(db, user_id, settings.google_sheet_id)
+                    categories = await run_google(fetch_categories, db, user_id, settings.google_sheet_id)
+                    income_categories = await run_google(fetch_income_categories, db, user_id, settings.google_sheet_id)
             except Exception:
                 pass
 
@@ -132,12 +217,16 @@ class ChatService:
                     income_categories=income_categories,
                     image_base64=image_base64,
                     session_id=session_id,
+                    user_id=user_id,
+                    want_title=is_new_session,
+                    on_token=(lambda text: _emit("token", {"text": text})) if emit else None,
                 )
             except Exception as e:
                 raise LLMProcessingError(f"AI processing failed: {str(e)}")
 
             thinking_ms = int((time.monotonic() - t_start) * 1000)
             tokens_used = intent_result.pop("_tokens", 0)
+            intent_title = intent_result.pop("session_title", None)
 
             # Build response text and actions list
             intent = intent_result.get("intent", "chat")
@@ -146,10 +235,46 @@ class ChatService:
                         user_id, session_id, intent,
                         intent_result.get("confidence"), data)
             actions = None
+            await _emit("intent", {
+                "session_id": session_id,
+                "intent": intent,
+                "action": intent_result.get("action"),
+                "thinking_time_ms": thinking_ms,
+            })
 
             if intent == "chat":
                 response_text = data.get("response", "")
 
+            elif intent == "read_calendar" and data.get("mode") == "free_slots":
+                try:
+                    from services.calendar_service import find_free_slots as _find_free_slots
+                    date_from = datetime.strptime(data["date"], "%Y-%m-%d").date() if data.get("date") else None
+                    days = 1 if date_from else max(1, min(int(data.get("days_ahead", 7)), 31))
+                    duration = max(5, int(data.get("duration_minutes") or 60))
+                    logger.info("[read_calendar] free_slots date=%s days=%s duration=%s", date_from, days, duration)
+                    # A day asked about by name is searched even if it is a weekend
+                    slots = await _find_free_slots(
+                        db, user_id,
+                        date_from=date_from,
+                        days=days,
+                        duration_minutes=duration,
+                        include_weekends=True if date_from else None,
+                    )
+                    await _emit("calendar", {"count": len(slots)})
+                    if not slots:
+                        response_text = "Không có khoảng trống nào trong giờ làm việc vào thời gian này."
+                    else:
+                        by_day: Dict[str, List[str]] = {}
+                        for slot in slots:
+                            by_day.setdefault(slot["start"].strftime("%d/%m"), []).append(
+                                f"{slot['start']:%H:%M}–{slot['end']:%H:%M}"
+                            )
+                        lines = ["Bạn rảnh vào các khoảng sau:"]
+                        lines += [f"• {day}: {', '.join(ranges)}" for day, ranges in by_day.items()]
+                        response_text = "\n".join(lines)
+                except Exception:
+                    response_text = "Xin lỗi, tôi không thể tìm thời gian rảnh của bạn lúc này."
+
             elif intent == "read_calendar":
                 try:
                     from services.calendar_service import list_events as _list_events
@@ -165,6 +290,7 @@ class ChatService:
                         days_back=days_back,
                     )
                     logger.info("[read_calendar] fetched %s events", len(events))
+                    await _emit("calendar", {"count": len(events)})
                     if not events:
                         response_text = "Không có sự kiện nào trong khoảng thời gian này."
                     else:
@@ -193,13 +319,15 @@ class ChatService:
 
             elif intent == "read_sheet":
                 try:
-                    from config.config import settings as _settings
                     from services.sheets_service import read_expenses as _read_expenses
-                    if not getattr(_settings, "google_sheet_id", None):
+                    from services.sheets_service import get_user_sheet_id
+                    sheet_id = await run_db(get_user_sheet_id, db, user_id)
+                    if not sheet_id:
                         response_text = "Chưa cấu hình Google Sheet."
                     else:
                         limit = int(data.get("limit", 50))
-                        expenses = _read_expenses(db, user_id, _settings.google_sheet_id, limit=limit)
+                        expenses = await run_google(_read_expenses, db, user_id, sheet_id, limit=limit)
+                        await _emit("sheet", {"count": len(expenses)})
                         if not expenses:
                             response_text = "Không có khoản chi nào trong khoảng thời gian này."
                         else:
@@ -237,10 +365,28 @@ class ChatService:
                     try:
                         from services.calendar_service import list_events as _list_events
                         events = await _list_events(db, user_id, days_ahead=30, days_back=7)
+                        await _emit("calendar", {"count": len(events)})
                         event_query = data.get("event_query", message)
-                        op_result = await smart_event_operation(
-                            event_query, events, calendar_action, session_id=session_id
-                        )
+                        changes = data.get("changes") or {}
+                        # Resolve clear matches locally; the LLM only sees the top candidates.
+                        # Time changes are often relative to the event ("dời lên 1 tiếng"), which
+                        # parse_user_intent never saw, so they still go through the LLM with the
+                        # matched event as the only candidate.
+                        match = match_event(event_query, events)
+                        moves_time = any(changes.get(k) for k in _TIME_FIELDS)
+                        if match.event and (calendar_action == "delete" or (changes and not moves_time)):
+                            logger.info("[event_match] local %s event_id=%s score=%.2f",
+                                        calendar_action, match.event.get("id"), match.score)
+                            op_result = {
+                                "event_id": match.event.get("id"),
+                                "event_summary": match.event.get("summary", ""),
+                                "updates": changes,
+                            }
+                        else:
+                            op_result = await smart_event_operation(
+                                event_query, [match.event] if match.event else match.candidates,
+                                calendar_action, session_id=session_id
+                            )
                         if not op_result.get("event_id"):
                             response_text = op_result.get(
                                 "error",
@@ -252,10 +398,9 @@ class ChatService:
                                 if v is not None
                             }
                             event_id = op_result["event_id"]
-                            event_summary = next(
-                                (e.get("summary", "") for e in events if e.get("id") == event_id),
-                                data.get("summary", ""),
-                            )
+                            matched = next((e for e in events if e.get("id") == event_id), {})
+                            updates = _keep_duration(updates, matched)
+                            event_summary = matched.get("summary", "") if matched else data.get("summary", "")
                             action_data = {"event_id": event_id, "event_summary": event_summary, **updates}
                             response_text = "Tôi sẽ cập nhật sự kiện này. Vui lòng xác nhận."
                             actions = [ChatActionData(action_type="update_event", action_status="pending", data=action_data)]
@@ -349,38 +494,65 @@ class ChatService:
             else:
                 response_text = data.get("response", "")
 
-            # Generate title for new chat/read sessions (no action-based label on frontend)
+            await _emit("actions", {
+                "response": response_text,
+                "actions": [a.model_dump(mode="json") for a in actions] if actions else None,
+            })
+
+            # Title new chat/read sessions (no action-based label on frontend). The title
+            # normally arrives with the intent; otherwise it is generated after responding.
             suggested_title: Optional[str] = None
             if is_new_session and intent in ("chat", "read_calendar", "read_sheet"):
-                suggested_title = await generate_chat_title(message) or None
-                if suggested_title:
+                if intent_title:
+                    suggested_title = intent_title
                     session.title = suggested_title
+                else:
+                    task = asyncio.create_task(_set_title_later(session_id, message))
+                    _background_tasks.add(task)
+                    task.add_done_callback(_background_tasks.discard)
 
             # Persist user message + assistant response
-            try:
-                user_msg = Message(
-                    session_id=session_id,
-                    role=MessageRole.USER,
-                    content=message,
-                )
-                db.add(user_msg)
+            def _persist() -> Message:
+                try:
+                    user_msg = Message(
+                        session_id=session_id,
+                        role=MessageRole.USER,
+                        content=message,
+                    )
+                    db.add(user_msg)
+
+                    actions_json_str = json.dumps([
+                        {"action_type": a.action_type, "action_status": a.action_status, "data": a.data}
+                        for a in actions
+                    ]) if actions else None
+                    assistant_msg = Message(
+                        session_id=session_id,
+                        role=MessageRole.ASSISTANT,
+                        content=response_text,
+                        actions_json=actions_json_str,
+                    )
+                    db.add(assistant_msg)
+                    db.query(AssistantSession).filter(AssistantSession.session_id == session_id).update(
+                        {
+                            AssistantSession.message_count: AssistantSession.message_count + 2,
+                            AssistantSession.last_message_at: datetime.utcnow(),
+                        },
+                        synchronize_session=False,
+                    )
+                    db.commit()
+                    db.refresh(assistant_msg)
+                    return assistant_msg
+                except Exception as e:
+                    db.rollback()
+                    raise DatabaseError(f"Failed to persist messages: {str(e)}")
 
-                actions_json_str = json.dumps([
-                    {"action_type": a.action_type, "action_status": a.action_status, "data": a.data}
-                    for a in actions
-                ]) if actions else None
-                assistant_msg = Message(
-                    session_id=session_id,
-                    role=MessageRole.ASSISTANT,
-                    content=response_text,
-                    actions_json=actions_json_str,
-                )
-                db.add(assistant_msg)
-                db.commit()
-                db.refresh(assistant_msg)
-            except Exception as e:
-                db.rollback()
-                raise DatabaseError(f"Failed to persist messages: {str(e)}")
+            assistant_msg = await run_db(_persist)
+
+            await _emit("persisted", {
+                "message_id": assistant_msg.message_id,
+                "session_id": session_id,
+                "created_at": assistant_msg.created_at.isoformat() if assistant_msg.created_at else None,
+            })
 
             return {
                 "message_id": assistant_msg.message_id,
@@ -411,22 +583,96 @@ class ChatService:
         return "\n".join(lines)
 
     @staticmethod
-    def get_message_history(db: Session, session_id: int, limit: int = 10) -> List[Dict]:
-        """Return message history for a session, oldest first."""
+    def get_history_etag(
+        db: Session, user_id: int, session_id: int, limit: int = 10, before_message_id: Optional[int] = None
+    ) -> str:
+        """
+        ETag for a history page, from one indexed lookup (no messages are loaded).
+
+        Keyed on the session's latest message id and its updated_at, which moves
+        whenever messages are added or an action status changes.
+
+        Raises:
+            SessionNotFoundError: If the session does not exist or is not the user's
+            DatabaseError: If database operation fails
+        """
         try:
-            session = db.query(AssistantSession).filter(
-                AssistantSession.session_id == session_id
+            latest_id = (
+                select(Message.message_id)
+                .where(Message.session_id == AssistantSession.session_id)
+                .order_by(Message.created_at.desc(), Message.message_id.desc())
+                .limit(1)
+                .correlate(AssistantSession)
+                .scalar_subquery()
+            )
+            row = db.execute(
+                select(AssistantSession.updated_at, latest_id).where(
+                    AssistantSession.session_id == session_id,
+                    AssistantSession.user_id == user_id,
+                )
             ).first()
-            if not session:
+            if row is None:
                 raise SessionNotFoundError(session_id=session_id)
 
-            messages = (
-                db.query(Message)
-                .filter(Message.session_id == session_id)
-                .order_by(Message.created_at.desc())
-                .limit(limit)
-                .all()
-            )
+            updated_at, latest = row
+            stamp = int(updated_at.timestamp() * 1_000_000) if updated_at else 0
+            return f'W/"{session_id}-{latest or 0}-{stamp}-{before_message_id or 0}-{limit}"'
+        except SessionNotFoundError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"Failed to get message history: {str(e)}")
+
+    @staticmethod
+    def get_message_history(
+        db: Session,
+        user_id: int,
+        session_id: int,
+        limit: int = 10,
+        before_message_id: Optional[int] = None,
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Return one page of a session's history, oldest first.
+
+        Pages walk backwards from the newest message: pass the returned cursor as
+        before_message_id to get the messages just before this page. Ownership is
+        checked in the same query (session LEFT JOIN message).
+
+        Args:
+            before_message_id: Only return messages older than this one
+
+        Returns:
+            (messages, next_before_message_id); the cursor is None on the oldest page
+
+        Raises:
+            SessionNotFoundError: If the session does not exist or is not the user's
+            DatabaseError: If database operation fails
+        """
+        try:
+            join_on = Message.session_id == AssistantSession.session_id
+            if before_message_id is not None:
+                before_created = (
+                    select(Message.created_at).where(Message.message_id == before_message_id).scalar_subquery()
+                )
+                join_on = and_(join_on, or_(
+                    Message.created_at < before_created,
+                    and_(Message.created_at == before_created, Message.message_id < before_message_id),
+                ))
+
+            rows = db.execute(
+                select(AssistantSession.session_id, Message)
+                .outerjoin(Message, join_on)
+                .where(AssistantSession.session_id == session_id, AssistantSession.user_id == user_id)
+                .order_by(Message.created_at.desc(), Message.message_id.desc())
+                .limit(limit + 1)
+            ).all()
+            if not rows:
+                raise SessionNotFoundError(session_id=session_id)
+
+            messages = [msg for _, msg in rows if msg is not None]
+            next_before = None
+            if len(messages) > limit:
+                messages = messages[:limit]
+                next_before = messages[-1].message_id
 
             result = []
             for msg in reversed(messages):
@@ -442,7 +688,7 @@ class ChatService:
                     except Exception:
                         pass
                 result.append(entry)
-            return result
+            return result, next_before
 
         except SessionNotFoundError:
             raise
@@ -450,38 +696,64 @@ class ChatService:
             raise DatabaseError(f"Failed to get message history: {str(e)}")
 
     @staticmethod
-    def list_sessions(db: Session, user_id: int, limit: int = 20) -> List[Dict]:
-        """Return non-cancelled sessions for a user, most recent first."""
+    def list_sessions(
+        db: Session, user_id: int, limit: int = 20, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Return non-cancelled sessions for a user, most recent first.
+
+        One query over the session rows: message_count, last_message_at and
+        total_tokens are denormalised on AssistantSession. Pages are keyset-paginated
+        on (updated_at, session_id), so page N costs the same as page 1.
+
+        Args:
+            cursor: next_cursor from the previous page (None for the first page)
+
+        Returns:
+            (sessions, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValidationError: If cursor is malformed
+            DatabaseError: If database operation fails
+        """
         try:
-            sessions = (
-                db.query(AssistantSession)
-                .filter(
-                    AssistantSession.user_id == user_id,
-                    AssistantSession.status != SessionStatus.CANCELLED,
+            query = db.query(AssistantSession).filter(
+                AssistantSession.user_id == user_id,
+                AssistantSession.status != SessionStatus.CANCELLED,
+            )
+            if cursor:
+                updated_at, session_id = _decode_session_cursor(cursor)
+                query = query.filter(
+                    or_(
+                        AssistantSession.updated_at < updated_at,
+                        and_(AssistantSession.updated_at == updated_at, AssistantSession.session_id < session_id),
+                    )
                 )
-                .order_by(AssistantSession.updated_at.desc())
-                .limit(limit)
+            sessions = (
+                query.order_by(AssistantSession.updated_at.desc(), AssistantSession.session_id.desc())
+                .limit(limit + 1)
                 .all()
             )
 
-            result = []
-            for s in sessions:
-                msg_count = db.query(Message).filter(Message.session_id == s.session_id).count()
-                last_msg = (
-                    db.query(Message)
-                    .filter(Message.session_id == s.session_id)
-                    .order_by(Message.created_at.desc())
-                    .first()
-                )
-                result.append({
+            next_cursor = None
+            if len(sessions) > limit:
+                sessions = sessions[:limit]
+                next_cursor = _encode_session_cursor(sessions[-1].updated_at, sessions[-1].session_id)
+
+            result = [
+                {
                     "session_id": s.session_id,
                     "title": s.title,
-                    "message_count": msg_count,
-                    "last_message_at": last_msg.created_at if last_msg else s.created_at,
-                    "total_tokens_used": 0,
+                    "message_count": s.message_count or 0,
+                    "last_message_at": s.last_message_at or s.created_at,
+                    "total_tokens_used": s.total_tokens or 0,
                     "status": s.status.value if hasattr(s.status, "value") else s.status,
-                })
-            return result
+                }
+                for s in sessions
+            ]
+            return result, next_cursor
+        except ValidationError:
+            raise
         except Exception as e:
             raise DatabaseError(f"Failed to list sessions: {str(e)}")
 
@@ -502,6 +774,10 @@ class ChatService:
                 return False
             actions[action_idx]["action_status"] = status
             msg.actions_json = json.dumps(actions)
+            # Moves the history ETag so clients polling the session see the change
+            db.query(AssistantSession).filter(AssistantSession.session_id == msg.session_id).update(
+                {AssistantSession.updated_at: datetime.utcnow()}, synchronize_session=False
+            )
             db.commit()
             return True
         except Exception as e:
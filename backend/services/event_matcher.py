@@ -0,0 +1,185 @@
+"""Event Matcher - local fuzzy matching of a natural-language query to calendar events"""
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from utils.vn_text import fold
+
+# Words that describe the operation or are too generic to identify an event (folded)
+_STOPWORDS = {
+    "lich", "su", "kien", "cuoc", "buoi", "cai", "voi", "cua", "va", "o", "tai", "luc", "vao",
+    "ngay", "gio", "nay", "do", "kia", "minh", "em", "anh", "giup", "hay", "nhe", "di", "la",
+    "xoa", "huy", "bo", "sua", "doi", "cap", "nhat", "thay", "sang", "event", "the", "my",
+    "toi", "cancel", "delete", "remove", "update", "reschedule",
+}
+
+_WEEKDAYS = {
+    "thu 2": 0, "thu hai": 0, "thu 3": 1, "thu ba": 1, "thu 4": 2, "thu tu": 2,
+    "thu 5": 3, "thu nam": 3, "thu 6": 4, "thu sau": 4, "thu 7": 5, "thu bay": 5,
+    "chu nhat": 6, "cn": 6,
+}
+
+_RELATIVE_DAYS = (
+    (r"\b(ngay kia|ngay mot)\b", 2),
+    (r"\b(ngay mai|mai)\b", 1),
+    (r"\b(hom nay)\b", 0),
+    (r"\b(hom qua)\b", -1),
+)
+
+_TIME_RE = re.compile(r"\b(\d{1,2})\s*(?:h|g|gio|:)\s*(\d{2})?\s*(sang|trua|chieu|toi)?\b")
+
+
+@dataclass
+class DateHint:
+    """Date/time constraints extracted from the query; None fields are unconstrained."""
+    dates: Optional[Set[date]] = None
+    weekday: Optional[int] = None
+    hour: Optional[int] = None
+
+    @property
+    def empty(self) -> bool:
+        return self.dates is None and self.weekday is None and self.hour is None
+
+
+@dataclass
+class MatchResult:
+    """Best local match (None when ambiguous) plus the ranked candidates for the LLM."""
+    event: Optional[Dict[str, Any]]
+    score: float
+    candidates: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _extract_date_hint(folded: str, today: date) -> Tuple[DateHint, str]:
+    """Pull date/time expressions out of the query; returns (hint, query with them removed)."""
+    hint = DateHint()
+
+    def _cut(m: "re.Match") -> str:
+        return " " * (m.end() - m.start())
+
+    m = re.search(r"(?<!\d)(\d{1,2})[/-](\d{1,2})(?:[/-](\d{2,4}))?(?!\d)", folded)
+    if m:
+        year = int(m.group(3)) if m.group(3) else today.year
+        try:
+            hint.dates = {date(year + 2000 if year < 100 else year, int(m.group(2)), int(m.group(1)))}
+        except ValueError:
+            pass
+        folded = folded[:m.start()] + _cut(m) + folded[m.end():]
+
+    for pattern, offset in _RELATIVE_DAYS:
+        m = re.search(pattern, folded)
+        if m:
+            hint.dates = {today + timedelta(days=offset)}
+            folded = folded[:m.start()] + _cut(m) + folded[m.end():]
+            break
+
+    for phrase in sorted(_WEEKDAYS, key=len, reverse=True):
+        m = re.search(rf"\b{phrase}\b", folded)
+        if m:
+            hint.weekday = _WEEKDAYS[phrase]
+            folded = folded[:m.start()] + _cut(m) + folded[m.end():]
+            break
+
+    m = _TIME_RE.search(folded)
+    if m:
+        hour = int(m.group(1))
+        if m.group(3) in ("chieu", "toi") and hour < 12:
+            hour += 12
+        if hour < 24:
+            hint.hour = hour
+        folded = folded[:m.start()] + _cut(m) + folded[m.end():]
+
+    return hint, folded
+
+
+def _tokens(folded: str) -> List[str]:
+    return [t for t in re.findall(r"[a-z0-9]+", folded) if t not in _STOPWORDS]
+
+
+def _event_start(event: Dict[str, Any]) -> Tuple[Optional[date], Optional[int]]:
+    start = event.get("start", {}) or {}
+    raw = start.get("dateTime") or start.get("date") or ""
+    if not raw:
+        return None, None
+    try:
+        if "T" in raw:
+            parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+            return parsed.date(), parsed.hour
+        return date.fromisoformat(raw), None
+    except ValueError:
+        return None, None
+
+
+def _token_similarity(query_tokens: List[str], event_tokens: Set[str]) -> float:
+    """Share of query tokens found in the event, counting near-misses (typos) as partial."""
+    if not query_tokens:
+        return 0.0
+    total = 0.0
+    for qt in query_tokens:
+        if qt in event_tokens:
+            total += 1.0
+            continue
+        best = max((SequenceMatcher(None, qt, et).ratio() for et in event_tokens), default=0.0)
+        if best >= 0.8:
+            total += best
+    return total / len(query_tokens)
+
+
+def _score(query_tokens: List[str], hint: DateHint, event: Dict[str, Any]) -> float:
+    text = fold(" ".join(str(event.get(k) or "") for k in ("summary", "location")))
+    score = _token_similarity(query_tokens, set(re.findall(r"[a-z0-9]+", text)))
+    if hint.empty:
+        return score
+
+    ev_date, ev_hour = _event_start(event)
+    checks = []
+    if hint.dates is not None:
+        checks.append(ev_date in hint.dates)
+    if hint.weekday is not None:
+        checks.append(ev_date is not None and ev_date.weekday() == hint.weekday)
+    if hint.hour is not None:
+        checks.append(ev_hour == hint.hour)
+
+    if not all(checks):
+        return score * 0.3
+    # No words left (e.g. "xóa lịch ngày mai"): the date alone decides
+    return 1.0 if not query_tokens else 0.3 + 0.7 * score
+
+
+def match_event(
+    query: str,
+    events: List[Dict[str, Any]],
+    today: Optional[date] = None,
+    top_k: int = 5,
+    min_score: float = 0.75,
+    min_margin: float = 0.25,
+) -> MatchResult:
+    """
+    Match "họp team thứ 6" / "xóa lịch nha khoa ngày mai" to one of the user's events.
+
+    Scores events by diacritic-insensitive token overlap with summary and location,
+    then applies any date (dd/mm, hôm nay, mai, thứ 2-CN) and time (3h chiều, 15:00) filters.
+
+    Returns:
+        MatchResult with `event` set when one event clearly wins (score >= min_score and
+        ahead of the runner-up by min_margin); `candidates` always holds the top_k events,
+        best first, for an LLM fallback.
+    """
+    today = today or date.today()
+    hint, rest = _extract_date_hint(fold(query or ""), today)
+    query_tokens = _tokens(rest)
+
+    scored = sorted(
+        ((_score(query_tokens, hint, e), i, e) for i, e in enumerate(events)),
+        key=lambda x: (-x[0], x[1]),
+    )
+    candidates = [e for _, _, e in scored[:top_k]]
+    if not scored:
+        return MatchResult(event=None, score=0.0, candidates=[])
+
+    best_score, _, best = scored[0]
+    runner_up = scored[1][0] if len(scored) > 1 else 0.0
+    if best_score >= min_score and best_score - runner_up >= min_margin:
+        return MatchResult(event=best, score=best_score, candidates=candidates)
+    return MatchResult(event=None, score=best_score, candidates=candidates)
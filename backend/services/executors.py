@@ -0,0 +1,128 @@
+"""Executors - dedicated, instrumented thread pools for blocking Google API and DB work"""
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, TypeVar
+
+from config.config import settings
+from config.database import IS_SQLITE_MEMORY
+
+T = TypeVar("T")
+
+# Recent samples kept for wait/run percentiles
+_SAMPLE_WINDOW = 1024
+
+
+def _percentile(samples: list, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class InstrumentedExecutor:
+    """
+    A sized ThreadPoolExecutor that async code awaits through run().
+
+    Tracks queue depth (submitted but not yet started), active workers and, over the
+    last _SAMPLE_WINDOW calls, how long work waited for a thread and how long it ran.
+    A steadily high wait time means max_workers is too small for the load.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self.max_queue_depth = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._wait_ms: Deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+        self._run_ms: Deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run fn(*args, **kwargs) on a pool thread (with the caller's contextvars) and await it."""
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, fn, *args, **kwargs)
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self.submitted += 1
+            self._queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queued)
+
+        def _task() -> T:
+            started_at = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._wait_ms.append((started_at - submitted_at) * 1000)
+            ok = False
+            try:
+                result = call()
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._run_ms.append((time.perf_counter() - started_at) * 1000)
+                    if ok:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+
+        return await asyncio.get_running_loop().run_in_executor(self._pool, _task)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            wait = list(self._wait_ms)
+            run = list(self._run_ms)
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queue_depth": self._queued,
+                "max_queue_depth": self.max_queue_depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "wait_ms_avg": sum(wait) / len(wait) if wait else 0.0,
+                "wait_ms_p95": _percentile(wait, 95),
+                "wait_ms_max": max(wait, default=0.0),
+                "run_ms_avg": sum(run) / len(run) if run else 0.0,
+                "run_ms_p95": _percentile(run, 95),
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+# Google API calls: network-bound, may block on token refresh
+google_executor = InstrumentedExecutor("google-io", settings.google_io_workers)
+# SQLAlchemy sessions: short, CPU/DB-bound; sized to the DB connection pool.
+# In-memory SQLite has a single shared connection, so its sessions run one at a time
+db_executor = InstrumentedExecutor("db", 1 if IS_SQLITE_MEMORY else settings.db_workers)
+
+
+async def run_google(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run blocking Google API work (googleapiclient .execute(), credential refresh)."""
+    return await google_executor.run(fn, *args, **kwargs)
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run blocking SQLAlchemy work."""
+    return await db_executor.run(fn, *args, **kwargs)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {e.name: e.stats() for e in (google_executor, db_executor)}
+
+
+def shutdown_executors() -> None:
+    google_executor.shutdown()
+    db_executor.shutdown()
@@ -0,0 +1,141 @@
+"""Google Client Pool - reusable, authorised Google API service objects per user"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+import google_auth_httplib2
+import httplib2
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build, fix_method_name
+from googleapiclient.http import HttpRequest
+
+from config.config import settings
+
+PoolKey = Tuple[int, str, str]  # (user_id, api name, api version)
+
+
+def _memoized_resource(factory: Callable[[], Any]) -> Callable[[], Any]:
+    lock = threading.Lock()
+    box: list = []
+
+    def get() -> Any:
+        if not box:
+            with lock:
+                if not box:
+                    box.append(_memoize_nested_resources(factory()))
+        return box[0]
+
+    return get
+
+
+def _memoize_nested_resources(resource: Any) -> Any:
+    """
+    Make service.spreadsheets() / .values() / .events() return one shared object.
+
+    googleapiclient rebuilds a nested resource, including docstrings for every
+    method, on each call — tens of ms for spreadsheets(). Resources hold no request
+    state, so building each one once per pooled service is safe.
+    """
+    for name in resource._resourceDesc.get("resources", {}):
+        attr = fix_method_name(name)
+        resource.__dict__[attr] = _memoized_resource(resource.__dict__[attr])
+    return resource
+
+
+def build_thread_safe_service(api: str, version: str, creds: Credentials) -> Any:
+    """
+    Build a Google API service object that can be shared between threads.
+
+    httplib2.Http is not thread-safe, so every thread gets its own authorised Http
+    (kept in a thread-local, so connections are still reused within a thread).
+    Credentials are shared: a refresh by one thread is seen by all of them.
+    Nested resources are built once and reused (see _memoize_nested_resources).
+    """
+    local = threading.local()
+
+    def _http() -> google_auth_httplib2.AuthorizedHttp:
+        http = getattr(local, "http", None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http())
+            local.http = http
+        return http
+
+    def _request_builder(_http_unused, *args, **kwargs) -> HttpRequest:
+        return HttpRequest(_http(), *args, **kwargs)
+
+    service = build(api, version, http=_http(), requestBuilder=_request_builder, cache_discovery=False)
+    return _memoize_nested_resources(service)
+
+
+class GoogleClientPool:
+    """
+    Bounded LRU of ready service objects keyed by (user, api, version).
+
+    Entries expire after ttl_seconds and are dropped for a user whenever their token
+    is saved, refreshed or deleted (see OAuthTokenService), so a stale or revoked
+    token is never reused for long. Safe to use from multiple threads.
+    """
+
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 1800):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[PoolKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: int, api: str, version: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return the pooled service for (user_id, api, version), building it with factory() on a miss.
+
+        factory runs outside the lock; if two threads miss at once, the first stored entry wins.
+        """
+        key = (user_id, api, version)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        service = factory()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            self._entries[key] = (now + self.ttl_seconds, service)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return service
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every pooled service of a user (token changed or user logged out)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+google_client_pool = GoogleClientPool(
+    max_size=settings.google_client_pool_size,
+    ttl_seconds=settings.google_client_pool_ttl_seconds,
+)
@@ -0,0 +1,110 @@
+"""Intent Cache - reuse parse_user_intent results for repeated phrasings"""
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+from utils.vn_text import fold, find_amounts
+
+# Intents that only read data; their results are safe to replay
+READ_INTENTS = frozenset({"read_calendar", "read_sheet", "chat"})
+
+
+def normalize_message(message: str) -> str:
+    """
+    Canonical form of a message for cache lookups.
+
+    Folds diacritics and case, collapses whitespace, drops trailing punctuation and
+    rewrites amounts to plain numbers, so "Xem lịch hôm nay?" == "xem  lich hom nay"
+    and "cafe 50k" == "cafe 50.000đ".
+    """
+    folded = fold(message.strip())
+    parts, last = [], 0
+    for amount, _has_unit, negative, (start, end) in find_amounts(folded):
+        value = int(amount) if float(amount).is_integer() else amount
+        parts.append(folded[last:start])
+        parts.append(f"{'-' if negative else ''}{value}")
+        last = end
+    parts.append(folded[last:])
+    text = " ".join("".join(parts).split())
+    return re.sub(r"[\s.!?,;]+$", "", text)
+
+
+class IntentCache:
+    """
+    Thread-safe LRU + TTL cache of intent results.
+
+    Stored and returned values are deep copies, so callers may mutate what they get.
+    """
+
+    def __init__(self, max_entries: int = 5000, ttl_seconds: float = 600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(
+        user_id: int,
+        message: str,
+        expense_categories: Sequence[str],
+        income_categories: Sequence[str],
+        current_date: str,
+    ) -> Tuple:
+        """Cache key: per user, per normalised message, per category set and date."""
+        return (
+            user_id,
+            normalize_message(message),
+            tuple(expense_categories),
+            tuple(income_categories),
+            current_date,
+        )
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, stored)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,257 @@
+"""Intent Fast Path - rule-based parser for short Vietnamese expense/income messages"""
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.vn_text import fold, find_amounts
+
+
+@dataclass
+class FastPathResult:
+    """A locally produced tool call, shaped like the LLM's (name + arguments)."""
+    tool_name: str
+    args: Dict[str, Any]
+    confidence: float
+
+
+@dataclass
+class FastPathStats:
+    """
+    Hit rate and latency counters, shared by all requests of this worker.
+
+    LLM round trips are recorded too, so the latency saved by each hit can be
+    estimated from live traffic rather than a guess.
+    """
+    attempts: int = 0
+    hits: int = 0
+    total_parse_ms: float = 0.0
+    llm_calls: int = 0
+    total_llm_ms: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, hit: bool, parse_ms: float) -> None:
+        with self._lock:
+            self.attempts += 1
+            self.hits += int(hit)
+            self.total_parse_ms += parse_ms
+
+    def record_llm(self, llm_ms: float) -> None:
+        with self._lock:
+            self.llm_calls += 1
+            self.total_llm_ms += llm_ms
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            hit_rate = self.hits / self.attempts if self.attempts else 0.0
+            avg_parse_ms = self.total_parse_ms / self.attempts if self.attempts else 0.0
+            avg_llm_ms = self.total_llm_ms / self.llm_calls if self.llm_calls else 0.0
+            return {
+                "attempts": self.attempts,
+                "hits": self.hits,
+                "hit_rate": hit_rate,
+                "avg_parse_ms": avg_parse_ms,
+                "avg_llm_ms": avg_llm_ms,
+                "saved_ms_per_hit": max(0.0, avg_llm_ms - avg_parse_ms),
+                "saved_ms_per_message": hit_rate * max(0.0, avg_llm_ms - avg_parse_ms),
+            }
+
+
+fastpath_stats = FastPathStats()
+
+# Anything that smells like calendar, a question, an edit or a report goes to the LLM
+_BLOCKERS = re.compile(
+    r"\b(lich|hop|su kien|nhac|hen|meeting|xem(?! phim)|bao nhieu|tong|thong ke|bao cao|xoa|(?<!tra )sua(?! xe)|huy|"
+    r"cap nhat|ngan sach|con lai|so du|mai|tuan|thang|thu [2-7]|thu hai|thu ba|thu tu|thu nam|"
+    r"thu sau|thu bay|chu nhat|vay|cho muon|tra no|no)\b|\?"
+)
+
+_INCOME_HINTS = re.compile(r"\b(nhan|luong|thuong|duoc tra|thu nhap|freelance|hoa hong|tien lai|ban duoc|kiem duoc)\b")
+
+# Keyword → names a user's category for that group is likely to have (both folded)
+_EXPENSE_GROUPS: List[Tuple[str, List[str]]] = [
+    (r"an|uong|com|pho|bun|mi|banh|cafe|ca phe|cf|tra sua|tra da|nuoc uong|bia|lau|nuong|do an|nha hang|"
+     r"an sang|an trua|an toi|an vat|tap hoa|di cho|thuc pham",
+     ["an uong", "do an", "thuc pham", "food", "an"]),
+    (r"xang|do xang|grab|be|gojek|xanh sm|taxi|xe om|xe buyt|bus|gui xe|ve xe|ve tau|may bay|"
+     r"sua xe|rua xe|cau duong",
+     ["di chuyen", "di lai", "giao thong", "xe", "transport"]),
+    (r"dien|tien dien|tien nuoc|internet|wifi|mang|tien nha|thue nha|dien thoai|nap the|gas",
+     ["hoa don", "tien ich", "nha cua", "nha o", "sinh hoat"]),
+    (r"mua|ao|quan|giay|dep|tui|shopee|lazada|tiki|sieu thi|my pham|do dung",
+     ["mua sam", "shopping"]),
+    (r"phim|xem phim|game|karaoke|du lich|concert|netflix|spotify|choi",
+     ["giai tri", "vui choi", "entertainment"]),
+    (r"thuoc|kham|benh vien|nha thuoc|gym|tap",
+     ["suc khoe", "y te", "health"]),
+    (r"hoc|hoc phi|sach|khoa hoc",
+     ["giao duc", "hoc tap", "education"]),
+]
+
+_INCOME_GROUPS: List[Tuple[str, List[str]]] = [
+    (r"luong", ["luong", "salary"]),
+    (r"thuong", ["thuong", "bonus"]),
+    (r"freelance|du an|job|lam them", ["freelance", "lam them", "thu nhap phu"]),
+]
+
+_FILLERS = {"het", "mat", "chi", "khoang", "tam", "tra", "nhan", "duoc", "la", "voi", "cho"}
+
+_MAX_WORDS = 10
+
+
+def _resolve_date(folded: str, today: date) -> Tuple[Optional[str], List[Tuple[int, int]]]:
+    """Return (YYYY-MM-DD, spans to drop from the description); date is None if unparseable."""
+    m = re.search(r"(?<!\d)(\d{1,2})[/-](\d{1,2})(?:[/-](\d{2,4}))?(?!\d)", folded)
+    if m:
+        day, month = int(m.group(1)), int(m.group(2))
+        year = int(m.group(3)) if m.group(3) else today.year
+        if year < 100:
+            year += 2000
+        try:
+            return date(year, month, day).isoformat(), [m.span()]
+        except ValueError:
+            return None, []
+
+    m = re.search(r"\b(\d+) ngay truoc\b", folded)
+    if m:
+        return (today - timedelta(days=int(m.group(1)))).isoformat(), [m.span()]
+
+    for pattern, offset in (
+        (r"\b(hom kia)\b", 2),
+        (r"\b(hom qua|toi qua|trua qua|sang qua)\b", 1),
+        (r"\b(hom nay|sang nay|trua nay|chieu nay|toi nay)\b", 0),
+    ):
+        m = re.search(pattern, folded)
+        if m:
+            return (today - timedelta(days=offset)).isoformat(), [m.span()]
+
+    return today.isoformat(), []
+
+
+def _guess_category(
+    folded: str, groups: List[Tuple[str, List[str]]], categories: List[str]
+) -> Tuple[Optional[str], bool]:
+    """
+    Map keywords in the message to one of the user's categories.
+
+    Returns:
+        (category, matched) — matched is False when we fell back to a catch-all category
+    """
+    folded_cats = [(c, fold(c).strip()) for c in categories]
+
+    # The longest keyword wins: "tien nuoc" (bill) beats "nuoc" (drink)
+    best_names, best_len = None, 0
+    for keywords, names in groups:
+        for m in re.finditer(rf"\b({keywords})\b", folded):
+            if len(m.group(0)) > best_len:
+                best_names, best_len = names, len(m.group(0))
+
+    for name in best_names or []:
+        for original, fc in folded_cats:
+            if fc == name or re.search(rf"\b{re.escape(name)}\b", fc):
+                return original, True
+    fallback = next((c for c, fc in folded_cats if fc == "khac"), None)
+    return fallback, False
+
+
+def _clean_description(message: str, drop_spans: List[Tuple[int, int]]) -> str:
+    chars = list(message)
+    for start, end in drop_spans:
+        for i in range(start, end):
+            chars[i] = " "
+    words = re.sub(r"[,;:.!]+", " ", "".join(chars)).split()
+    while words and fold(words[0]) in _FILLERS:
+        words.pop(0)
+    while words and fold(words[-1]) in _FILLERS:
+        words.pop()
+    text = " ".join(words)
+    return text[:1].upper() + text[1:]
+
+
+def parse_fast_intent(
+    message: str,
+    expense_categories: List[str],
+    income_categories: List[str],
+    today: Optional[date] = None,
+    min_confidence: float = 0.9,
+) -> Optional[FastPathResult]:
+    """
+    Parse short expense/income messages ("50k ăn trưa", "nhận lương 15 triệu") locally.
+
+    Returns:
+        An add_expense / add_income tool call, or None when the rules are not at least
+        `min_confidence` sure — the caller then falls back to the LLM.
+    """
+    t0 = time.perf_counter()
+    result = _parse(message, expense_categories, income_categories, today or date.today())
+    if result is not None and result.confidence < min_confidence:
+        result = None
+    fastpath_stats.record(result is not None, (time.perf_counter() - t0) * 1000)
+    return result
+
+
+def _parse(
+    message: str,
+    expense_categories: List[str],
+    income_categories: List[str],
+    today: date,
+) -> Optional[FastPathResult]:
+    text = message.strip()
+    if not text or len(text.split()) > _MAX_WORDS:
+        return None
+
+    folded = fold(text)
+    if _BLOCKERS.search(folded) or re.search(r"\bam\b", folded):
+        return None
+
+    tx_date, date_spans = _resolve_date(folded, today)
+    if tx_date is None:
+        return None
+
+    # Mask the date before looking for amounts so "12/5" is never read as money
+    masked = list(folded)
+    for start, end in date_spans:
+        masked[start:end] = " " * (end - start)
+    amounts = find_amounts("".join(masked))
+    if len(amounts) != 1:
+        return None
+    amount, _has_unit, negative, amount_span = amounts[0]
+    if negative or amount <= 0:
+        return None
+
+    is_income = bool(_INCOME_HINTS.search(folded))
+    if is_income:
+        category, matched = _guess_category(folded, _INCOME_GROUPS, income_categories)
+        tool_name = "add_income"
+    else:
+        category, matched = _guess_category(folded, _EXPENSE_GROUPS, expense_categories)
+        tool_name = "add_expense"
+    if not category:
+        return None
+
+    description = _clean_description(text, date_spans + [amount_span])
+    if not description:
+        return None
+
+    confidence = 0.95
+    if amount < 1_000:
+        # "ăn trưa 50" / "50đ ăn trưa" — probably 50k, but that's the LLM's call.
+        # Scale units (k, nghìn, tr, triệu, m) never land here; "đ"/"đồng" alone does.
+        confidence -= 0.4
+    if not matched:
+        confidence -= 0.2
+
+    return FastPathResult(
+        tool_name=tool_name,
+        args={
+            "transactions": [{
+                "date": tx_date,
+                "amount": int(amount) if float(amount).is_integer() else amount,
+                "description": description,
+                "category": category,
+            }]
+        },
+        confidence=round(confidence, 2),
+    )
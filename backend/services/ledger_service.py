@@ -0,0 +1,187 @@
+"""Ledger Service - local DB mirror of the "Giao dịch" sheet's transaction rows"""
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from config.config import settings
+from exceptions import DatabaseError
+from models.ledger import LedgerEntry, LedgerSyncState
+
+EXPENSE = "expense"
+INCOME = "income"
+
+
+class LedgerService:
+    """
+    Keeps one LedgerEntry per non-empty expense (B:E) / income (G:J) row of a user's
+    spreadsheet, so reads are an indexed query instead of a full column download.
+
+    sheets_service writes through on every append/update/delete and reconciles the
+    whole ledger with the sheet once it is older than ledger_reconcile_interval_seconds
+    (catching edits made directly in Google Sheets). Write-through is skipped while a
+    spreadsheet has never been reconciled; the first read does a full sync instead.
+    """
+
+    @staticmethod
+    def is_fresh(db: Session, user_id: int, spreadsheet_id: str) -> bool:
+        """True if the ledger was reconciled within the configured interval."""
+        state = db.get(LedgerSyncState, (user_id, spreadsheet_id))
+        if state is None:
+            return False
+        max_age = timedelta(seconds=settings.ledger_reconcile_interval_seconds)
+        return datetime.utcnow() - state.synced_at < max_age
+
+    @staticmethod
+    def replace_all(
+        db: Session,
+        user_id: int,
+        spreadsheet_id: str,
+        expenses: List[Dict],
+        income: List[Dict],
+    ) -> None:
+        """
+        Replace the ledger with rows just read from the sheet and mark it fresh.
+
+        Args:
+            expenses: Parsed expense rows (date, amount, description, category, row_number)
+            income: Parsed income rows, same shape
+
+        Raises:
+            DatabaseError: If the database operation fails
+        """
+        try:
+            LedgerService._entries(db, user_id, spreadsheet_id).delete(synchronize_session=False)
+            db.add_all(
+                LedgerService._entry(user_id, spreadsheet_id, kind, row)
+                for kind, rows in ((EXPENSE, expenses), (INCOME, income))
+                for row in rows
+            )
+            LedgerService._mark_synced(db, user_id, spreadsheet_id)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise DatabaseError(f"Failed to reconcile ledger: {str(e)}")
+
+    @staticmethod
+    def read(db: Session, user_id: int, spreadsheet_id: str, kind: str, limit: int) -> List[Dict]:
+        """Return the last `limit` rows of one kind, in sheet order."""
+        entries = (
+            LedgerService._entries(db, user_id, spreadsheet_id)
+            .filter(LedgerEntry.kind == kind)
+            .order_by(LedgerEntry.row_number.desc())
+            .limit(limit)
+            .all()
+        )
+        return [e.to_dict() for e in reversed(entries)]
+
+    @staticmethod
+    def record_inserted(db: Session, user_id: int, spreadsheet_id: str, kind: str, rows: List[Dict]) -> None:
+        """
+        Mirror a values.append with INSERT_ROWS.
+
+        The sheet inserts whole rows, so every entry (of either kind) at or below the
+        first inserted row moves down by len(rows).
+        """
+        if not rows or not LedgerService._is_tracked(db, user_id, spreadsheet_id):
+            return
+        if any(r.get("row_number") is None for r in rows):
+            LedgerService.invalidate(db, user_id, spreadsheet_id)
+            return
+        start = min(r["row_number"] for r in rows)
+        LedgerService._shift_rows(db, user_id, spreadsheet_id, start, len(rows))
+        db.add_all(LedgerService._entry(user_id, spreadsheet_id, kind, row) for row in rows)
+        db.commit()
+
+    @staticmethod
+    def record_written(db: Session, user_id: int, spreadsheet_id: str, kind: str, rows: List[Dict]) -> None:
+        """Mirror rows overwritten in place (values.update / values.batchUpdate)."""
+        if not rows or not LedgerService._is_tracked(db, user_id, spreadsheet_id):
+            return
+        for row in rows:
+            entry = (
+                LedgerService._entries(db, user_id, spreadsheet_id)
+                .filter(LedgerEntry.kind == kind, LedgerEntry.row_number == row["row_number"])
+                .first()
+            )
+            if entry is None:
+                db.add(LedgerService._entry(user_id, spreadsheet_id, kind, row))
+            else:
+                entry.date = row["date"]
+                entry.amount = row["amount"]
+                entry.description = row["description"]
+                entry.category = row["category"]
+        db.commit()
+
+    @staticmethod
+    def record_row_deleted(db: Session, user_id: int, spreadsheet_id: str, row_number: int) -> None:
+        """Mirror a deleteDimension of one sheet row: drop both kinds there, shift the rest up."""
+        if not LedgerService._is_tracked(db, user_id, spreadsheet_id):
+            return
+        LedgerService._entries(db, user_id, spreadsheet_id).filter(
+            LedgerEntry.row_number == row_number
+        ).delete(synchronize_session=False)
+        LedgerService._shift_rows(db, user_id, spreadsheet_id, row_number + 1, -1)
+        db.commit()
+
+    @staticmethod
+    def record_cleared(db: Session, user_id: int, spreadsheet_id: str) -> None:
+        """Mirror clear_transactions: the sheet has no rows left, so the ledger is empty and fresh."""
+        LedgerService.replace_all(db, user_id, spreadsheet_id, [], [])
+
+    @staticmethod
+    def invalidate(db: Session, user_id: int, spreadsheet_id: str) -> None:
+        """Force a full reconcile on the next read."""
+        db.query(LedgerSyncState).filter(
+            LedgerSyncState.user_id == user_id,
+            LedgerSyncState.spreadsheet_id == spreadsheet_id,
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def _entries(db: Session, user_id: int, spreadsheet_id: str):
+        return db.query(LedgerEntry).filter(
+            LedgerEntry.user_id == user_id,
+            LedgerEntry.spreadsheet_id == spreadsheet_id,
+        )
+
+    @staticmethod
+    def _entry(user_id: int, spreadsheet_id: str, kind: str, row: Dict) -> LedgerEntry:
+        return LedgerEntry(
+            user_id=user_id,
+            spreadsheet_id=spreadsheet_id,
+            kind=kind,
+            row_number=row["row_number"],
+            date=row["date"],
+            amount=row["amount"],
+            description=row.get("description") or "",
+            category=row.get("category") or "",
+        )
+
+    @staticmethod
+    def _is_tracked(db: Session, user_id: int, spreadsheet_id: str) -> bool:
+        return db.get(LedgerSyncState, (user_id, spreadsheet_id)) is not None
+
+    @staticmethod
+    def _mark_synced(db: Session, user_id: int, spreadsheet_id: str) -> None:
+        state = db.get(LedgerSyncState, (user_id, spreadsheet_id))
+        if state is None:
+            db.add(LedgerSyncState(user_id=user_id, spreadsheet_id=spreadsheet_id, synced_at=datetime.utcnow()))
+        else:
+            state.synced_at = datetime.utcnow()
+
+    @staticmethod
+    def _shift_rows(db: Session, user_id: int, spreadsheet_id: str, from_row: int, delta: int) -> None:
+        """
+        Add delta to every row_number >= from_row.
+
+        Done in two passes through negative numbers: a single UPDATE can trip the
+        unique (user, spreadsheet, kind, row_number) constraint midway.
+        """
+        query = LedgerService._entries(db, user_id, spreadsheet_id)
+        query.filter(LedgerEntry.row_number >= from_row).update(
+            {LedgerEntry.row_number: -(LedgerEntry.row_number + delta)}, synchronize_session=False
+        )
+        query.filter(LedgerEntry.row_number < 0).update(
+            {LedgerEntry.row_number: -LedgerEntry.row_number}, synchronize_session=False
+        )
@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 from models.oauth_token import OAuthToken
 from models.connected_account import ConnectedAccount
 from utils.encryption import encrypt_data, decrypt_data
+from services.google_client_pool import google_client_pool
+from services.auth_cache import auth_cache
 from google.oauth2.credentials import Credentials
 from typing import Optional, Dict
 from exceptions import (
@@ -88,6 +90,8 @@ class OAuthTokenService:
             db.add(oauth_token)
             db.commit()
             db.refresh(oauth_token)
+            google_client_pool.invalidate_user(user_id)
+            auth_cache.invalidate_user(user_id)
             
             return oauth_token
             
@@ -209,6 +213,8 @@ class OAuthTokenService:
             
             db.commit()
             db.refresh(oauth_token)
+            google_client_pool.invalidate_user(user_id)
+            auth_cache.invalidate_user(user_id)
             
             return oauth_token
             
@@ -275,6 +281,8 @@ class OAuthTokenService:
             ).delete()
             
             db.commit()
+            google_client_pool.invalidate_user(user_id)
+            auth_cache.invalidate_user(user_id)
             return True
             
         except Exception as e:
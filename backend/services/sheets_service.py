@@ -1,31 +1,41 @@
 """Google Sheets Service"""
+import logging
 import re
-from typing import List, Dict, Optional
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Optional
 from googleapiclient.errors import HttpError
 from sqlalchemy.orm import Session
-from services.auth_service import get_credentials_for_user
+from services.auth_service import get_credentials_for_user, refresh_credentials
+from services.google_client_pool import google_client_pool, build_thread_safe_service
+from services.ledger_service import LedgerService, EXPENSE, INCOME
+from services.transaction_columns import parse_expense_columns, parse_income_columns
 from exceptions import GoogleSheetsError, NoOAuthTokenError
 from config.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 def get_sheet_service(db: Session, user_id: int):
     """
-    Authenticate and return Sheets API service for user.
+    Authenticate and return Sheets API service for user (pooled per user, thread-safe).
 
     Raises:
         NoOAuthTokenError: If user has no valid OAuth token
         GoogleSheetsError: If service creation fails
     """
-    try:
+    def _factory():
         creds = get_credentials_for_user(db, user_id)
         if creds.expired and creds.refresh_token:
             try:
-                creds.refresh(Request())
+                creds = refresh_credentials(db, user_id)
             except Exception as e:
                 raise GoogleSheetsError(f"Token refresh failed: {str(e)}")
-        return build("sheets", "v4", credentials=creds)
+        return build_thread_safe_service("sheets", "v4", creds)
+
+    try:
+        return google_client_pool.get(user_id, "sheets", "v4", _factory)
     except NoOAuthTokenError:
         raise
     except GoogleSheetsError:
@@ -34,28 +44,116 @@ def get_sheet_service(db: Session, user_id: int):
         raise GoogleSheetsError(f"Failed to create Sheets service: {str(e)}")
 
 
-def _get_sheet_by_name(service, sheet_id: str, sheet_name: str) -> Optional[str]:
+@dataclass
+class _SheetMetadata:
+    """Tab titles and numeric sheetIds of one spreadsheet, in tab order."""
+    titles: List[str]
+    sheet_ids: Dict[str, int]
+    expires_at: float
+
+
+# First data row of the transaction blocks on "Giao dịch" (rows 1-4 are headers)
+_FIRST_DATA_ROW = 5
+
+_metadata_cache: Dict[str, _SheetMetadata] = {}
+_metadata_lock = threading.Lock()
+
+
+def _get_sheet_metadata(service, sheet_id: str) -> _SheetMetadata:
     """
-    Get sheet title by matching name (case-insensitive).
-    Returns the first matching sheet name, or None if not found.
+    Return cached tab metadata for a spreadsheet, fetching it when missing or expired.
+
+    Raises:
+        GoogleSheetsError: If the spreadsheet cannot be read
     """
+    now = time.monotonic()
+    with _metadata_lock:
+        cached = _metadata_cache.get(sheet_id)
+    if cached and cached.expires_at > now:
+        return cached
+
     try:
         meta = service.spreadsheets().get(
             spreadsheetId=sheet_id,
-            fields="sheets.properties.title",
+            fields="sheets.properties(sheetId,title)",
         ).execute()
-        sheets = [s["properties"]["title"] for s in meta.get("sheets", [])]
-        # Try exact match first, then case-insensitive
-        for s in sheets:
-            if s == sheet_name:
-                return s
-        for s in sheets:
-            if s.lower() == sheet_name.lower():
-                return s
-        return None
     except HttpError as e:
         raise GoogleSheetsError(f"Cannot access spreadsheet: {str(e)}")
 
+    props = [s["properties"] for s in meta.get("sheets", [])]
+    metadata = _SheetMetadata(
+        titles=[p["title"] for p in props],
+        sheet_ids={p["title"]: p.get("sheetId", 0) for p in props},
+        expires_at=now + settings.sheets_metadata_ttl_seconds,
+    )
+    with _metadata_lock:
+        _metadata_cache[sheet_id] = metadata
+    return metadata
+
+
+def invalidate_sheet_metadata(sheet_id: str) -> None:
+    """Forget cached tab metadata (tabs renamed, added or removed)."""
+    with _metadata_lock:
+        _metadata_cache.pop(sheet_id, None)
+
+
+def _sheets_api_error(sheet_id: str, e: HttpError) -> GoogleSheetsError:
+    """
+    Wrap an HttpError; drop the metadata cache when the error suggests it is stale.
+
+    A renamed or deleted tab shows up as 400 "Unable to parse range" or a 404.
+    """
+    status = getattr(getattr(e, "resp", None), "status", None)
+    if status == 404 or (status == 400 and "range" in str(e).lower()):
+        invalidate_sheet_metadata(sheet_id)
+    return GoogleSheetsError(f"Sheets API error: {str(e)}")
+
+
+def _get_sheet_by_name(service, sheet_id: str, sheet_name: str) -> Optional[str]:
+    """
+    Get sheet title by matching name (case-insensitive).
+    Returns the first matching sheet name, or None if not found.
+    """
+    sheets = _get_sheet_metadata(service, sheet_id).titles
+    # Try exact match first, then case-insensitive
+    for s in sheets:
+        if s == sheet_name:
+            return s
+    for s in sheets:
+        if s.lower() == sheet_name.lower():
+            return s
+    return None
+
+
+def _resolve_sheet_title(service, sheet_id: str, sheet_name: str) -> str:
+    """
+    Resolve a tab such as "Giao dịch" or "Tóm tắt", falling back to the first tab.
+
+    Raises:
+        GoogleSheetsError: If the spreadsheet has no tabs
+    """
+    title = _get_sheet_by_name(service, sheet_id, sheet_name)
+    if title:
+        return title
+    titles = _get_sheet_metadata(service, sheet_id).titles
+    if not titles:
+        raise GoogleSheetsError("Spreadsheet has no sheets")
+    return titles[0]
+
+
+def _get_numeric_sheet_id(service, sheet_id: str, sheet_title: str) -> int:
+    """
+    Numeric sheetId of a tab (needed by batchUpdate requests).
+
+    Raises:
+        GoogleSheetsError: If the tab does not exist
+    """
+    numeric = _get_sheet_metadata(service, sheet_id).sheet_ids.get(sheet_title)
+    if numeric is None:
+        invalidate_sheet_metadata(sheet_id)
+        raise GoogleSheetsError("Could not find sheet ID")
+    return numeric
+
 
 def _parse_amount(value: str) -> float:
     """
@@ -79,23 +177,6 @@ def _parse_amount(value: str) -> float:
         return 0.0
 
 
-def _normalize_date_format(date_str: str) -> str:
-    """
-    Convert date from DD/MM/YYYY to YYYY-MM-DD format.
-    Example: "01/05/2020" → "2020-05-01"
-    """
-    if not date_str:
-        return ""
-    try:
-        parts = str(date_str).strip().split("/")
-        if len(parts) == 3:
-            day, month, year = parts
-            return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-        return date_str
-    except Exception:
-        return date_str
-
-
 def get_income_categories(db: Session, user_id: int, sheet_id: str) -> List[str]:
     """
     Return income category list from "Tóm tắt" sheet, range H28:H44.
@@ -103,13 +184,7 @@ def get_income_categories(db: Session, user_id: int, sheet_id: str) -> List[str]
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Tóm tắt")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Tóm tắt")
 
         result = service.spreadsheets().values().get(
             spreadsheetId=sheet_id,
@@ -129,7 +204,7 @@ def get_income_categories(db: Session, user_id: int, sheet_id: str) -> List[str]
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to get income categories: {str(e)}")
 
@@ -141,65 +216,30 @@ def read_income_transactions(
     limit: int = 50,
 ) -> List[Dict]:
     """
-    Return the last `limit` income rows from the "Giao dịch" sheet.
-    Income columns: G=date (DD/MM/YYYY), H=amount, I=description, J=category.
-    Reads from row 5 onwards.
+    Return the last `limit` income rows of the "Giao dịch" sheet.
+    Served from the local ledger, which is reconciled with the sheet first if stale.
     """
     try:
-        service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Giao dịch")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
-
-        result = service.spreadsheets().values().get(
-            spreadsheetId=sheet_id,
-            range=f"{sheet_name}!G5:J",
-        ).execute()
-
-        values = result.get("values", [])
-        total = len(values)
-        rows = []
-
-        start_idx = max(0, total - limit)
-        for idx, row in enumerate(values[start_idx:], start=start_idx + 5):
-            if not row or all(not str(cell).strip() for cell in row if cell):
-                continue
-
-            date_raw = row[0] if len(row) > 0 else ""
-
-            if not str(date_raw).strip():
-                continue
-
-            date = _normalize_date_format(date_raw)
-
-            amount = row[1] if len(row) > 1 else ""
-            description = row[2] if len(row) > 2 else ""
-            category = row[3] if len(row) > 3 else ""
-
-            amount = _parse_amount(amount)
-
-            rows.append({
-                "date": date,
-                "amount": amount,
-                "description": description.strip(),
-                "category": category.strip(),
-                "row_number": idx,
-            })
-
-        return rows
+        if not LedgerService.is_fresh(db, user_id, sheet_id):
+            sync_ledger(db, user_id, sheet_id)
+        return LedgerService.read(db, user_id, sheet_id, INCOME, limit)
 
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to read income transactions: {str(e)}")
 
 
+def _parse_income_values(values: List[List]) -> List[Dict]:
+    """
+    Parse G5:J values into income rows.
+    Income columns: G=date (DD/MM/YYYY), H=amount, I=description, J=category.
+    """
+    return parse_income_columns(values, _FIRST_DATA_ROW).to_rows()
+
+
 def append_income(
     db: Session,
     user_id: int,
@@ -213,44 +253,30 @@ def append_income(
     Append one income row to the "Giao dịch" sheet, columns G:J.
     G=date, H=amount, I=description, J=category.
     """
-    try:
-        service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Giao dịch")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+    item = {"date": date, "amount": amount, "description": description, "category": category}
+    return append_income_bulk(db, user_id, sheet_id, [item])[0]
 
-        amount_display = f"{amount:,.0f}".replace(",", ".")
 
-        result = service.spreadsheets().values().append(
-            spreadsheetId=sheet_id,
-            range=f"{sheet_name}!G5:J",
-            valueInputOption="USER_ENTERED",
-            insertDataOption="INSERT_ROWS",
-            body={"values": [[date, amount_display + " ₫", description, category]]},
-        ).execute()
+def append_income_bulk(db: Session, user_id: int, sheet_id: str, items: List[Dict]) -> List[Dict]:
+    """
+    Append several income rows (columns G:J) with a single values.append call.
 
-        row_number: Optional[int] = None
-        updated_range = result.get("updates", {}).get("updatedRange", "")
-        match = re.search(r":J(\d+)", updated_range)
-        if match:
-            row_number = int(match.group(1))
+    Args:
+        items: Dicts with date, amount, description, category
 
-        return {
-            "date": date,
-            "amount": amount,
-            "description": description,
-            "category": category,
-            "row_number": row_number,
-        }
+    Returns:
+        The items, in order, each with its row_number
 
+    Raises:
+        NoOAuthTokenError: If user has no valid OAuth token
+        GoogleSheetsError: If Sheets API call fails
+    """
+    try:
+        return _append_rows(db, user_id, sheet_id, items, "G5:J", INCOME)
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to append income: {str(e)}")
 
@@ -270,13 +296,7 @@ def update_income(
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Giao dịch")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Giao dịch")
 
         amount_display = f"{amount:,.0f}".replace(",", ".")
 
@@ -287,18 +307,20 @@ def update_income(
             body={"values": [[date, amount_display + " ₫", description, category]]},
         ).execute()
 
-        return {
+        result = {
             "date": date,
             "amount": amount,
             "description": description,
             "category": category,
             "row_number": row_number,
         }
+        _ledger_write_through(db, user_id, sheet_id, LedgerService.record_written, INCOME, [result])
+        return result
 
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to update income: {str(e)}")
 
@@ -314,14 +336,7 @@ def get_categories(db: Session, user_id: int, sheet_id: str) -> List[str]:
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Tóm tắt")
-        if not sheet_name:
-            # Fallback to first sheet if "Tóm tắt" not found
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Tóm tắt")
 
         # Read from B28:B41 (category list from Summary sheet)
         result = service.spreadsheets().values().get(
@@ -342,7 +357,7 @@ def get_categories(db: Session, user_id: int, sheet_id: str) -> List[str]:
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to get categories: {str(e)}")
 
@@ -355,83 +370,83 @@ def read_expenses(
     limit: int = 50,
 ) -> List[Dict]:
     """
-    Return the last `limit` expense rows from the "Giao dịch" sheet.
-    Reads starting from row 5 and handles column offset.
+    Return the last `limit` expense rows of the "Giao dịch" sheet.
+    Served from the local ledger, which is reconciled with the sheet first if stale.
 
     Raises:
         NoOAuthTokenError: If user has no valid OAuth token
         GoogleSheetsError: If Sheets API call fails
     """
+    try:
+        if not LedgerService.is_fresh(db, user_id, sheet_id):
+            sync_ledger(db, user_id, sheet_id)
+        return LedgerService.read(db, user_id, sheet_id, EXPENSE, limit)
+
+    except (NoOAuthTokenError, GoogleSheetsError):
+        raise
+    except HttpError as e:
+        raise _sheets_api_error(sheet_id, e)
+    except Exception as e:
+        raise GoogleSheetsError(f"Failed to read expenses: {str(e)}")
+
+
+def _parse_expense_values(values: List[List]) -> List[Dict]:
+    """Parse A5:E values into expense rows, handling the column offset."""
+    return parse_expense_columns(values, _FIRST_DATA_ROW).to_rows()
+
+
+def sync_ledger(db: Session, user_id: int, sheet_id: str) -> Dict[str, int]:
+    """
+    Reconcile the local ledger with the "Giao dịch" sheet (one values.batchGet).
+
+    Returns:
+        {"expenses": n, "income": m} rows now in the ledger
+
+    Raises:
+        NoOAuthTokenError: If user has no valid OAuth token
+        GoogleSheetsError: If Sheets API call fails
+        DatabaseError: If the ledger cannot be written
+    """
     try:
         service = get_sheet_service(db, user_id)
-        
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Giao dịch")
-        if not sheet_name:
-            # Fallback to first sheet if "Giao dịch" not found
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Giao dịch")
 
-        # Read from row 5 onwards (accounting for possible empty first column)
-        result = service.spreadsheets().values().get(
+        # Expenses from A (data may start in A or B), income from G
+        result = service.spreadsheets().values().batchGet(
             spreadsheetId=sheet_id,
-            range=f"{sheet_name}!A5:E",
+            ranges=[f"{sheet_name}!A{_FIRST_DATA_ROW}:E", f"{sheet_name}!G{_FIRST_DATA_ROW}:J"],
         ).execute()
-
-        values = result.get("values", [])
-        
-        total = len(values)
-        rows = []
-        
-        # Get last `limit` rows
-        start_idx = max(0, total - limit)
-        for idx, row in enumerate(values[start_idx:], start=start_idx + 5):
-            # Skip completely empty rows
-            if not row or all(not str(cell).strip() for cell in row if cell):
-                continue
-                
-            # Determine which columns have data (may be offset by 1)
-            if len(row) > 0 and not str(row[0]).strip() and len(row) > 1 and str(row[1]).strip():
-                # Data starts from column B (index 1)
-                date = row[1] if len(row) > 1 else ""
-                amount = row[2] if len(row) > 2 else ""
-                description = row[3] if len(row) > 3 else ""
-                category = row[4] if len(row) > 4 else ""
-            else:
-                # Normal case: data in columns A-D
-                date = row[0] if len(row) > 0 else ""
-                amount = row[1] if len(row) > 1 else ""
-                description = row[2] if len(row) > 2 else ""
-                category = row[3] if len(row) > 3 else ""
-            
-            # Skip if no date
-            if not str(date).strip():
-                continue
-            
-            # Normalize date format from DD/MM/YYYY to YYYY-MM-DD
-            date = _normalize_date_format(date)
-            
-            # Parse amount (handle Vietnamese format)
-            amount = _parse_amount(amount)
-            
-            rows.append({
-                "date": date,
-                "amount": amount,
-                "description": description.strip(),
-                "category": category.strip(),
-                "row_number": idx,
-            })
-
-        return rows
+        value_ranges = result.get("valueRanges", [])
+        expenses = _parse_expense_values(value_ranges[0].get("values", []) if value_ranges else [])
+        income = _parse_income_values(value_ranges[1].get("values", []) if len(value_ranges) > 1 else [])
 
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
-        raise GoogleSheetsError(f"Failed to read expenses: {str(e)}")
+        raise GoogleSheetsError(f"Failed to read transactions: {str(e)}")
+
+    LedgerService.replace_all(db, user_id, sheet_id, expenses, income)
+    return {"expenses": len(expenses), "income": len(income)}
+
+
+def _ledger_write_through(db: Session, user_id: int, sheet_id: str, record: Callable, *args) -> None:
+    """
+    Apply a sheet write to the local ledger.
+
+    The sheet is the source of truth and has already been written, so a ledger
+    failure only forces a full reconcile on the next read.
+    """
+    try:
+        record(db, user_id, sheet_id, *args)
+    except Exception as e:
+        db.rollback()
+        logger.warning("[ledger] write-through failed for sheet %s, resyncing on next read: %s", sheet_id, e)
+        try:
+            LedgerService.invalidate(db, user_id, sheet_id)
+        except Exception:
+            db.rollback()
 
 
 def append_expense(
@@ -454,50 +469,110 @@ def append_expense(
         NoOAuthTokenError: If user has no valid OAuth token
         GoogleSheetsError: If Sheets API call fails
     """
-    try:
-        service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Giao dịch")
-        if not sheet_name:
-            # Fallback to first sheet if "Giao dịch" not found
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+    item = {"date": date, "amount": amount, "description": description, "category": category}
+    return append_expenses_bulk(db, user_id, sheet_id, [item])[0]
 
-        # Format amount for display (with thousand separator and currency)
-        amount_display = f"{amount:,.0f}".replace(",", ".")
 
-        result = service.spreadsheets().values().append(
-            spreadsheetId=sheet_id,
-            range=f"{sheet_name}!B:E",
-            valueInputOption="USER_ENTERED",
-            insertDataOption="INSERT_ROWS",
-            body={"values": [[date, amount_display + " ₫", description, category]]},
-        ).execute()
+def append_expenses_bulk(db: Session, user_id: int, sheet_id: str, items: List[Dict]) -> List[Dict]:
+    """
+    Append several expense rows (columns B:E) with a single values.append call.
 
-        row_number: Optional[int] = None
-        updated_range = result.get("updates", {}).get("updatedRange", "")
-        match = re.search(r":E(\d+)", updated_range)
-        if match:
-            row_number = int(match.group(1))
+    Args:
+        items: Dicts with date, amount, description, category
 
-        return {
-            "date": date,
-            "amount": amount,
-            "description": description,
-            "category": category,
-            "row_number": row_number,
-        }
+    Returns:
+        The items, in order, each with its row_number
 
+    Raises:
+        NoOAuthTokenError: If user has no valid OAuth token
+        GoogleSheetsError: If Sheets API call fails
+    """
+    try:
+        return _append_rows(db, user_id, sheet_id, items, "B:E", EXPENSE)
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to append expense: {str(e)}")
 
 
+def append_transactions_bulk(
+    db: Session,
+    user_id: int,
+    sheet_id: str,
+    expenses: List[Dict],
+    income: List[Dict],
+) -> Dict[str, List[Dict]]:
+    """
+    Write expense (B:E) and income (G:J) rows together.
+
+    Each block is written with its own values.append, which picks the next free
+    row on the server, so concurrent writers never compute the same target rows.
+
+    Returns:
+        {"expenses": [...], "income": [...]}, each item with its row_number
+
+    Raises:
+        NoOAuthTokenError: If user has no valid OAuth token
+        GoogleSheetsError: If Sheets API call fails
+    """
+    return {
+        "expenses": append_expenses_bulk(db, user_id, sheet_id, expenses) if expenses else [],
+        "income": append_income_bulk(db, user_id, sheet_id, income) if income else [],
+    }
+
+
+def _format_transaction_row(item: Dict) -> List:
+    """[date, "50.000 ₫", description, category] as written to B:E / G:J."""
+    amount_display = f"{item['amount']:,.0f}".replace(",", ".")
+    return [item["date"], amount_display + " ₫", item["description"], item["category"]]
+
+
+def _transaction_result(item: Dict, row_number: Optional[int]) -> Dict:
+    return {
+        "date": item["date"],
+        "amount": item["amount"],
+        "description": item["description"],
+        "category": item["category"],
+        "row_number": row_number,
+    }
+
+
+def _append_rows(
+    db: Session, user_id: int, sheet_id: str, items: List[Dict], columns: str, kind: str,
+) -> List[Dict]:
+    """
+    Append items to the "Giao dịch" sheet in one values.append call.
+
+    Row numbers come from updatedRange ("Giao dịch!B12:E14" → 12, 13, 14).
+    """
+    if not items:
+        return []
+    service = get_sheet_service(db, user_id)
+    sheet_name = _resolve_sheet_title(service, sheet_id, "Giao dịch")
+
+    result = service.spreadsheets().values().append(
+        spreadsheetId=sheet_id,
+        range=f"{sheet_name}!{columns}",
+        valueInputOption="USER_ENTERED",
+        insertDataOption="INSERT_ROWS",
+        body={"values": [_format_transaction_row(i) for i in items]},
+    ).execute()
+
+    start_row: Optional[int] = None
+    updated_range = result.get("updates", {}).get("updatedRange", "")
+    match = re.search(r"![A-Z]+(\d+)(?::[A-Z]+\d+)?$", updated_range)
+    if match:
+        start_row = int(match.group(1))
+    results = [
+        _transaction_result(i, start_row + n if start_row is not None else None)
+        for n, i in enumerate(items)
+    ]
+    _ledger_write_through(db, user_id, sheet_id, LedgerService.record_inserted, kind, results)
+    return results
+
+
 def get_summary_data(db: Session, user_id: int, sheet_id: str) -> Dict:
     """
     Return summary data from "Tóm tắt" sheet:
@@ -516,14 +591,7 @@ def get_summary_data(db: Session, user_id: int, sheet_id: str) -> Dict:
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Tóm tắt")
-        if not sheet_name:
-            # Fallback to first sheet
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Tóm tắt")
 
         # Read all needed cells at once
         # L8: opening balance
@@ -582,7 +650,7 @@ def get_summary_data(db: Session, user_id: int, sheet_id: str) -> Dict:
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to get summary data: {str(e)}")
 
@@ -603,27 +671,9 @@ def delete_expense(db: Session, user_id: int, sheet_id: str, row_number: int) ->
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Giao dịch")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
-
-        # Get sheet ID (numeric)
-        meta = service.spreadsheets().get(
-            spreadsheetId=sheet_id,
-            fields="sheets.properties",
-        ).execute()
-        sheet_id_numeric = None
-        for sheet in meta.get("sheets", []):
-            if sheet["properties"]["title"] == sheet_name:
-                sheet_id_numeric = sheet["properties"]["sheetId"]
-                break
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Giao dịch")
 
-        if sheet_id_numeric is None:
-            raise GoogleSheetsError("Could not find sheet ID")
+        sheet_id_numeric = _get_numeric_sheet_id(service, sheet_id, sheet_name)
 
         # Delete row
         service.spreadsheets().batchUpdate(
@@ -643,13 +693,16 @@ def delete_expense(db: Session, user_id: int, sheet_id: str, row_number: int) ->
                 ]
             },
         ).execute()
+        # The grid just shrank by one row
+        invalidate_sheet_metadata(sheet_id)
+        _ledger_write_through(db, user_id, sheet_id, LedgerService.record_row_deleted, row_number)
 
         return True
 
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to delete expense: {str(e)}")
 
@@ -679,13 +732,7 @@ def update_expense(
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Giao dịch")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Giao dịch")
 
         # Format amount for display
         amount_display = f"{amount:,.0f}".replace(",", ".")
@@ -698,18 +745,20 @@ def update_expense(
             body={"values": [[date, amount_display + " ₫", description, category]]},
         ).execute()
 
-        return {
+        result = {
             "date": date,
             "amount": amount,
             "description": description,
             "category": category,
             "row_number": row_number,
         }
+        _ledger_write_through(db, user_id, sheet_id, LedgerService.record_written, EXPENSE, [result])
+        return result
 
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to update expense: {str(e)}")
 
@@ -737,13 +786,7 @@ def update_balance(
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Tóm tắt")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Tóm tắt")
 
         updates = []
         
@@ -773,7 +816,7 @@ def update_balance(
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to update balance: {str(e)}")
 
@@ -803,13 +846,7 @@ def update_budget(
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Tóm tắt")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Tóm tắt")
 
         # Read the category list to find the row
         if is_income:
@@ -859,7 +896,7 @@ def update_budget(
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to update budget: {str(e)}")
 
@@ -887,13 +924,7 @@ def add_category(
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Tóm tắt")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Tóm tắt")
 
         if is_income:
             # Income categories: H28:H44. Find first empty row.
@@ -941,7 +972,7 @@ def add_category(
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to add category: {str(e)}")
 
@@ -977,12 +1008,7 @@ def get_budgets(db: Session, user_id: int, sheet_id: str) -> Dict:
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Tóm tắt")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id, fields="sheets.properties.title"
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Tóm tắt")
 
         result = service.spreadsheets().values().batchGet(
             spreadsheetId=sheet_id,
@@ -1014,7 +1040,7 @@ def get_budgets(db: Session, user_id: int, sheet_id: str) -> Dict:
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to get budgets: {str(e)}")
 
@@ -1026,22 +1052,18 @@ def clear_transactions(db: Session, user_id: int, sheet_id: str) -> None:
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Giao dịch")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id, fields="sheets.properties.title"
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Giao dịch")
 
         service.spreadsheets().values().batchClear(
             spreadsheetId=sheet_id,
             body={"ranges": [f"{sheet_name}!B5:E", f"{sheet_name}!G5:J"]},
         ).execute()
+        _ledger_write_through(db, user_id, sheet_id, LedgerService.record_cleared)
 
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to clear transactions: {str(e)}")
 
@@ -1069,13 +1091,7 @@ def delete_category(
     """
     try:
         service = get_sheet_service(db, user_id)
-        sheet_name = _get_sheet_by_name(service, sheet_id, "Tóm tắt")
-        if not sheet_name:
-            meta = service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                fields="sheets.properties.title",
-            ).execute()
-            sheet_name = meta["sheets"][0]["properties"]["title"]
+        sheet_name = _resolve_sheet_title(service, sheet_id, "Tóm tắt")
 
         if is_income:
             # Income categories: H28:H44
@@ -1118,6 +1134,6 @@ def delete_category(
     except (NoOAuthTokenError, GoogleSheetsError):
         raise
     except HttpError as e:
-        raise GoogleSheetsError(f"Sheets API error: {str(e)}")
+        raise _sheets_api_error(sheet_id, e)
     except Exception as e:
         raise GoogleSheetsError(f"Failed to delete category: {str(e)}")
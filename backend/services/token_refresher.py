@@ -0,0 +1,107 @@
+"""Token Refresher - background refresh of Google access tokens before they expire"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from config.config import settings
+from config.database import SessionLocal
+from models.connected_account import ConnectedAccount
+from models.oauth_token import OAuthToken
+from services.auth_service import refresh_credentials
+from services.executors import run_db, run_google
+
+logger = logging.getLogger(__name__)
+
+# Users whose last refresh failed (e.g. revoked grant) → monotonic time of next attempt
+_retry_after: Dict[int, float] = {}
+
+
+def _due_user_ids(lead_seconds: float) -> List[int]:
+    """Users with a refresh token whose access token expires within lead_seconds."""
+    db = SessionLocal()
+    try:
+        deadline = datetime.utcnow() + timedelta(seconds=lead_seconds)
+        rows = (
+            db.query(ConnectedAccount.user_id)
+            .join(OAuthToken, OAuthToken.connected_account_id == ConnectedAccount.connected_account_id)
+            .filter(
+                ConnectedAccount.provider == "google",
+                OAuthToken.refresh_token.isnot(None),
+                OAuthToken.expires_at.isnot(None),
+                OAuthToken.expires_at <= deadline,
+            )
+            .distinct()
+            .all()
+        )
+        return [r.user_id for r in rows]
+    finally:
+        db.close()
+
+
+def _refresh_one(user_id: int, lead_seconds: float) -> None:
+    db = SessionLocal()
+    try:
+        refresh_credentials(db, user_id, lead_seconds=lead_seconds)
+    finally:
+        db.close()
+
+
+async def refresh_due_tokens(lead_seconds: Optional[float] = None) -> int:
+    """
+    Refresh every token expiring within lead_seconds; returns how many were attempted.
+
+    Failed users are retried after token_refresh_retry_seconds instead of every tick.
+    """
+    lead = settings.token_refresh_lead_seconds if lead_seconds is None else lead_seconds
+    now = time.monotonic()
+    user_ids = [u for u in await run_db(_due_user_ids, lead) if _retry_after.get(u, 0) <= now]
+    sem = asyncio.Semaphore(settings.token_refresh_concurrency)
+
+    async def _one(user_id: int) -> None:
+        async with sem:
+            try:
+                await run_google(_refresh_one, user_id, lead)
+                _retry_after.pop(user_id, None)
+            except Exception as e:
+                _retry_after[user_id] = time.monotonic() + settings.token_refresh_retry_seconds
+                logger.warning("[token_refresh] user_id=%s failed: %s", user_id, e)
+
+    await asyncio.gather(*(_one(u) for u in user_ids))
+    return len(user_ids)
+
+
+class TokenRefresher:
+    """Runs refresh_due_tokens every token_refresh_interval_seconds until stopped."""
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if settings.token_refresh_enabled and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                refreshed = await refresh_due_tokens()
+                if refreshed:
+                    logger.info("[token_refresh] refreshed %s token(s)", refreshed)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[token_refresh] sweep failed")
+            await asyncio.sleep(settings.token_refresh_interval_seconds)
+
+
+token_refresher = TokenRefresher()
@@ -1,11 +1,15 @@
 """Token Usage Service - Logs and tracks token consumption"""
 import json
 from datetime import datetime
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from models.assistant_session import AssistantSession
 from models.token_usage import TokenUsage
 from config.database import SessionLocal
 from typing import Optional, Dict
 from exceptions import DatabaseError, SessionNotFoundError
+from services.usage_buffer import usage_buffer
+from services.usage_rollup import apply_usage, get_totals
 
 
 class TokenUsageService:
@@ -18,84 +22,89 @@ class TokenUsageService:
         prompt_tokens: int = 0,
         completion_tokens: int = 0,
         total_tokens: int = 0,
+        cached_tokens: int = 0,
         model: Optional[str] = None,
         db: Optional[Session] = None
     ) -> Optional[TokenUsage]:
         """
         Log token usage to database
         
+        Without a db session the record is queued on usage_buffer and written in a
+        later bulk insert, so the caller never waits on a commit. With a session it
+        is written immediately, in that session.
+        
         Args:
             session_id: ID of assistant session (optional)
             usage_type: Type of usage (default: "llm_api")
             prompt_tokens: Number of input tokens
             completion_tokens: Number of output tokens
             total_tokens: Total tokens
+            cached_tokens: Prompt tokens served from the provider's prompt cache
             model: Model name/identifier
-            db: Database session (optional, creates new if not provided)
+            db: Database session (optional, buffered write if not provided)
         
         Returns:
-            TokenUsage instance or None if session_id not provided
+            TokenUsage instance when written with db, otherwise None
             
         Raises:
-            SessionNotFoundError: If session_id provided but not found
             DatabaseError: If database operation fails
         """
+        # If no session_id, skip DB logging but return None
+        if session_id is None:
+            return None
+
+        now = datetime.utcnow()
+        metadata = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "model": model or "unknown",
+            "timestamp": now.isoformat()
+        }
+        row = {
+            "session_id": session_id,
+            "usage_type": usage_type,
+            "amount": total_tokens,
+            "meta_data": json.dumps(metadata),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        if db is None:
+            await usage_buffer.add(row)
+            return None
+
         try:
-            # If no session_id, skip DB logging but return None
-            if session_id is None:
-                return None
-            
-            # Create session if not provided
-            if db is None:
-                db = SessionLocal()
-                should_close = True
-            else:
-                should_close = False
-            
-            try:
-                # Build metadata
-                metadata = {
-                    "prompt_tokens": prompt_tokens,
-                    "completion_tokens": completion_tokens,
-                    "model": model or "unknown",
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                
-                # Create record
-                token_usage = TokenUsage(
-                    session_id=session_id,
-                    usage_type=usage_type,
-                    amount=total_tokens,
-                    metadata=json.dumps(metadata)
-                )
-                
-                db.add(token_usage)
-                db.commit()
-                db.refresh(token_usage)
-                
-                return token_usage
-                
-            finally:
-                if should_close:
-                    db.close()
-        
+            token_usage = TokenUsage(**row)
+            db.add(token_usage)
+            apply_usage(db, [row])
+            db.commit()
+            db.refresh(token_usage)
+            return token_usage
         except Exception as e:
+            db.rollback()
             raise DatabaseError(f"Failed to log token usage: {str(e)}")
     
     @staticmethod
-    async def get_session_usage(
+    def get_session_usage(
         session_id: int,
-        db: Optional[Session] = None
+        db: Optional[Session] = None,
+        user_id: Optional[int] = None
     ) -> Dict:
         """
         Get total token usage for a session
         
+        Read from the session's running AssistantSession.total_tokens / total_cost
+        counters (kept by usage_rollup), so no token_usage rows are scanned. Blocking;
+        call it through run_db from async code.
+        
         Args:
             session_id: Session ID
             db: Database session (optional)
+            user_id: If given, the session must belong to this user
         
         Returns:
-            Dict with total_tokens, usage_breakdown
+            Dict with total_tokens, cost_estimate
             
         Raises:
             SessionNotFoundError: If session not found
@@ -109,71 +118,39 @@ class TokenUsageService:
                 should_close = False
             
             try:
-                usages = db.query(TokenUsage).filter(
-                    TokenUsage.session_id == session_id
-                ).all()
-                
-                if not usages:
-                    return {
-                        "session_id": session_id,
-                        "total_tokens": 0,
-                        "usage_breakdown": {},
-                        "cost_estimate": 0.0
-                    }
-                
-                # Calculate totals
-                total_tokens = sum(u.amount for u in usages)
-                
-                # Build breakdown by usage type
-                breakdown = {}
-                for usage in usages:
-                    usage_type = usage.usage_type
-                    if usage_type not in breakdown:
-                        breakdown[usage_type] = 0
-                    breakdown[usage_type] += usage.amount
-                
-                # Estimate cost (based on GPT-4 pricing as default)
-                cost_estimate = TokenUsageService._estimate_cost(total_tokens)
+                session = db.get(AssistantSession, session_id)
+                if session is None or (user_id is not None and session.user_id != user_id):
+                    raise SessionNotFoundError(session_id=session_id)
                 
                 return {
                     "session_id": session_id,
-                    "total_tokens": total_tokens,
-                    "usage_breakdown": breakdown,
-                    "cost_estimate": cost_estimate
+                    "total_tokens": session.total_tokens or 0,
+                    "cost_estimate": session.total_cost or 0.0
                 }
                 
             finally:
                 if should_close:
                     db.close()
         
+        except SessionNotFoundError:
+            raise
         except Exception as e:
             raise DatabaseError(f"Failed to get session usage: {str(e)}")
     
-    @staticmethod
-    def _estimate_cost(total_tokens: int) -> float:
-        """
-        Estimate API cost based on token count
-        Using approximate GPT-4 pricing
-        
-        Args:
-            total_tokens: Total tokens used
-            
-        Returns:
-            Estimated cost in USD
-        """
-        # Approximate pricing: $0.03 per 1K tokens (average)
-        return (total_tokens / 1000) * 0.03
-    
     @staticmethod
     async def get_user_monthly_usage(
         user_id: int,
+        month: Optional[str] = None,
         db: Optional[Session] = None
     ) -> Dict:
         """
         Get monthly token usage for a user
         
+        Read from the pre-aggregated usage_rollup rows for that month (one per model).
+        
         Args:
             user_id: User ID
+            month: "YYYY-MM" (default: current month, UTC)
             db: Database session
         
         Returns:
@@ -190,14 +167,28 @@ class TokenUsageService:
                 should_close = False
             
             try:
-                # This would require joining with sessions to get user_id
-                # For now, just return placeholder
+                month = month or datetime.utcnow().strftime("%Y-%m")
+                totals = get_totals(db, user_id, "month", month)
+                month_start = datetime.strptime(month, "%Y-%m")
+                next_month = month_start.replace(year=month_start.year + month_start.month // 12,
+                                                 month=month_start.month % 12 + 1)
+                sessions_count = db.query(func.count(AssistantSession.session_id)).filter(
+                    AssistantSession.user_id == user_id,
+                    AssistantSession.created_at >= month_start,
+                    AssistantSession.created_at < next_month,
+                ).scalar()
+                
                 return {
                     "user_id": user_id,
-                    "month": datetime.utcnow().strftime("%Y-%m"),
-                    "total_tokens": 0,
-                    "sessions_count": 0,
-                    "cost_estimate": 0.0
+                    "month": month,
+                    "total_tokens": totals["total_tokens"],
+                    "prompt_tokens": totals["prompt_tokens"],
+                    "completion_tokens": totals["completion_tokens"],
+                    "cached_tokens": totals["cached_tokens"],
+                    "request_count": totals["request_count"],
+                    "by_model": totals["by_model"],
+                    "sessions_count": sessions_count,
+                    "cost_estimate": totals["cost"]
                 }
                 
             finally:
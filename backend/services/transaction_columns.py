@@ -0,0 +1,163 @@
+"""Transaction Columns - columnar (NumPy) parsing of "Giao dịch" sheet values"""
+import sys
+from dataclasses import dataclass
+from itertools import zip_longest
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class TransactionColumns:
+    """
+    Expense or income rows of the "Giao dịch" sheet as typed column arrays.
+
+    amount: VND as int64 (VND has no minor unit; fractional amounts are rounded)
+    category_code: index into categories (interned, sorted)
+    date_code: index into date_texts (YYYY-MM-DD where the cell was DD/MM/YYYY)
+    row_number: sheet row of each transaction
+
+    The values matrix is transposed once and handled column by column. Dates,
+    amounts and categories are dictionary-encoded, so each distinct value is parsed
+    once however many rows share it (amounts with NumPy string operations over the
+    distinct values).
+    """
+    row_number: np.ndarray
+    amount: np.ndarray
+    category_code: np.ndarray
+    categories: List[str]
+    descriptions: List[str]
+    date_code: np.ndarray
+    date_texts: List[str]
+
+    def __len__(self) -> int:
+        return len(self.row_number)
+
+    def to_rows(self) -> List[Dict]:
+        """Row dicts (date, amount, description, category, row_number), as stored in the ledger."""
+        return [
+            {
+                "date": d,
+                "amount": a,
+                "description": desc,
+                "category": cat,
+                "row_number": r,
+            }
+            for d, a, desc, cat, r in zip(
+                map(self.date_texts.__getitem__, self.date_code.tolist()),
+                self.amount.astype(np.float64).tolist(),
+                self.descriptions,
+                map(self.categories.__getitem__, self.category_code.tolist()),
+                self.row_number.tolist(),
+            )
+        ]
+
+
+def parse_expense_columns(values: List[List], first_row: int) -> TransactionColumns:
+    """
+    Parse A:E values of the "Giao dịch" sheet (date, amount, description, category).
+    Rows whose data starts in column B instead of A are shifted back.
+    """
+    return _parse(values, first_row, detect_offset=True)
+
+
+def parse_income_columns(values: List[List], first_row: int) -> TransactionColumns:
+    """Parse G:J values of the "Giao dịch" sheet (date, amount, description, category)."""
+    return _parse(values, first_row, detect_offset=False)
+
+
+def _parse(values: List[List], first_row: int, detect_offset: bool) -> TransactionColumns:
+    width = 5 if detect_offset else 4
+    # Transpose once (ragged rows padded with ""), then work column by column
+    cols = list(zip_longest(*values, fillvalue=""))[:width]
+    cols += [("",) * len(values)] * (width - len(cols))
+    try:
+        return _parse_columns(cols, first_row, detect_offset)
+    except AttributeError:
+        # Sheets returns formatted values as strings; anything else is converted first
+        return _parse_columns([tuple(map(str, col)) for col in cols], first_row, detect_offset)
+
+
+def _parse_columns(cols: List[tuple], first_row: int, detect_offset: bool) -> TransactionColumns:
+    if detect_offset:
+        # Rows whose data starts in column B (column A left blank) are shifted back
+        shifted = [i for i, (a, b) in enumerate(zip(cols[0], cols[1])) if b.strip() and not a.strip()]
+        if shifted:
+            cols = [list(col) for col in cols]
+            for i in shifted:
+                for k in range(len(cols) - 1):
+                    cols[k][i] = cols[k + 1][i]
+    # Rows without a date (including blank rows) are not transactions
+    keep = [i for i, d in enumerate(cols[0]) if d.strip()]
+    dates, amounts, descriptions, categories = ([col[i] for i in keep] for col in cols[:4])
+
+    date_values, date_code = _encode(dates)
+    amount_values, amount_code = _encode(amounts)
+    categories, category_code = _intern_categories(*_encode(categories))
+    return TransactionColumns(
+        row_number=np.array(keep, dtype=np.int32) + first_row,
+        amount=_parse_amounts(amount_values)[amount_code],
+        category_code=category_code,
+        categories=categories,
+        descriptions=[d.strip() for d in descriptions],
+        date_code=date_code,
+        date_texts=[_normalize_date(d) for d in date_values],
+    )
+
+
+def _encode(column: List[str]) -> Tuple[List[str], np.ndarray]:
+    """(distinct values in first-seen order, int32 code of each row)"""
+    ids = {value: i for i, value in enumerate(dict.fromkeys(column))}
+    return list(ids), np.fromiter(map(ids.__getitem__, column), dtype=np.int32, count=len(column))
+
+
+def _intern_categories(distinct: List[str], codes: np.ndarray):
+    """(sorted interned stripped categories, recoded codes): values differing only by whitespace share a code."""
+    stripped = [c.strip() for c in distinct]
+    categories = sorted({sys.intern(c) for c in stripped})
+    if not distinct:
+        return categories, codes
+    lookup = {c: i for i, c in enumerate(categories)}
+    return categories, np.array([lookup[c] for c in stripped], dtype=np.int32)[codes]
+
+
+def _normalize_date(value: str) -> str:
+    """
+    Convert date from DD/MM/YYYY to YYYY-MM-DD format; anything else is returned unchanged.
+    Example: "01/05/2020" → "2020-05-01"
+    """
+    parts = value.strip().split("/")
+    if len(parts) == 3:
+        day, month, year = parts
+        return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+    return value
+
+
+def _parse_amounts(column: List[str]) -> np.ndarray:
+    """
+    Vietnamese-formatted amounts ("27.000 ₫", "1.600.000,00 đ") -> int64 VND, 0 if unparsable.
+
+    Same rules as sheets_service._parse_amount, applied to all values at once; only
+    when some value is malformed are they converted one by one.
+    """
+    if not column:
+        return np.zeros(0, dtype=np.int64)
+    v = np.strings.strip(np.strings.replace(np.strings.replace(np.array(column, dtype=np.str_), "₫", ""), "đ", ""))
+    # A comma is the decimal separator; dots are thousand separators
+    has_comma = np.strings.find(v, ",") >= 0
+    v = np.strings.replace(v, ".", "")
+    v = np.where(has_comma, np.strings.replace(v, ",", "."), v)
+    v = np.where(v == "", "0", v)
+    try:
+        numbers = v.astype(np.float64)
+    except ValueError:
+        numbers = np.array([_to_float(s) for s in v.tolist()], dtype=np.float64)
+    numbers[~np.isfinite(numbers)] = 0.0
+    return np.rint(numbers).astype(np.int64)
+
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
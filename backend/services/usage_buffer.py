@@ -0,0 +1,165 @@
+"""Usage Buffer - batched, non-blocking writes of token_usage records"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from config.config import settings
+from config.database import SessionLocal
+from models.token_usage import TokenUsage
+from services.executors import run_db
+from services.usage_rollup import apply_usage
+
+logger = logging.getLogger(__name__)
+
+
+def _insert_rows(rows: List[Dict[str, Any]]) -> int:
+    """
+    Bulk-insert token_usage rows and fold them into the usage rollups in the same
+    transaction; returns how many could not be written.
+
+    If the batch fails (e.g. one row references a deleted session), rows are
+    retried one by one so a single bad record does not lose the whole batch.
+    """
+    db = SessionLocal()
+    try:
+        try:
+            db.execute(insert(TokenUsage), rows)
+            apply_usage(db, rows)
+            db.commit()
+            return 0
+        except Exception as e:
+            db.rollback()
+            logger.warning("[usage_buffer] batch insert of %s rows failed, retrying per row: %s", len(rows), e)
+
+        failed = 0
+        for row in rows:
+            try:
+                db.execute(insert(TokenUsage), [row])
+                apply_usage(db, [row])
+                db.commit()
+            except Exception:
+                db.rollback()
+                failed += 1
+        return failed
+    finally:
+        db.close()
+
+
+class UsageBuffer:
+    """
+    Bounded in-process queue of token_usage rows, flushed by a background task.
+
+    A flush happens when batch_size rows are waiting or flush_interval_ms has passed
+    since the first waiting row, whichever comes first. When the queue is full,
+    add() waits up to enqueue_timeout_ms for space (back-pressure) and then drops
+    the record, counting it in `dropped`. stop() flushes everything still queued.
+    """
+
+    def __init__(
+        self,
+        max_records: int = 10000,
+        batch_size: int = 200,
+        flush_interval_ms: int = 1000,
+        enqueue_timeout_ms: int = 50,
+    ):
+        self.max_records = max_records
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.enqueue_timeout = enqueue_timeout_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.flushed = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        """Start the flusher on the running event loop (idempotent)."""
+        if self._task is None or self._task.done() or self._task.get_loop() is not asyncio.get_running_loop():
+            self._queue = asyncio.Queue(maxsize=self.max_records)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop accepting records, flush what is queued and wait for the flusher."""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def add(self, row: Dict[str, Any]) -> bool:
+        """Queue one token_usage row (column → value). Returns False if it was dropped."""
+        self.start()
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put(row), timeout=self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                return False
+        self.enqueued += 1
+        return True
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            await self._flush(batch)
+
+        # Drain anything queued behind the stop marker
+        rest = []
+        while not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is not None:
+                rest.append(row)
+        for i in range(0, len(rest), self.batch_size):
+            await self._flush(rest[i:i + self.batch_size])
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            failed = await run_db(_insert_rows, batch)
+        except Exception as e:
+            logger.warning("[usage_buffer] flush of %s rows failed: %s", len(batch), e)
+            failed = len(batch)
+        self.batches += 1
+        self.flushed += len(batch) - failed
+        self.failed += failed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+usage_buffer = UsageBuffer(
+    max_records=settings.usage_buffer_max_records,
+    batch_size=settings.usage_flush_batch_size,
+    flush_interval_ms=settings.usage_flush_interval_ms,
+    enqueue_timeout_ms=settings.usage_enqueue_timeout_ms,
+)
@@ -0,0 +1,187 @@
+"""Usage Rollup - incremental per-user day/month/model token aggregates"""
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Select, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models.assistant_session import AssistantSession
+from models.usage_rollup import UsageRollup
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# USD per 1M tokens: (input, cached input, output). Longest matching prefix wins,
+# so dated snapshots such as "gpt-4o-mini-2024-07-18" use their family's price.
+_PRICING_PER_1M: Dict[str, Tuple[float, float, float]] = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+}
+
+_COUNTERS = ("request_count", "prompt_tokens", "completion_tokens", "cached_tokens", "total_tokens", "cost")
+
+BucketKey = Tuple[int, str, str, str]  # (user_id, period, period_start, model)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """USD cost of one call; unknown models fall back to a flat $0.03 per 1K tokens."""
+    matches = [m for m in _PRICING_PER_1M if (model or "").startswith(m)]
+    if not matches:
+        return (prompt_tokens + completion_tokens) / 1000 * 0.03
+    input_price, cached_price, output_price = _PRICING_PER_1M[max(matches, key=len)]
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (uncached * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1_000_000
+
+
+def apply_usage(db: Session, rows: Iterable[Dict[str, Any]]) -> None:
+    """
+    Add token_usage rows to the rollups and to AssistantSession.total_tokens / total_cost.
+
+    Runs in the caller's transaction (the caller commits together with the
+    token_usage insert). Rows are column dicts as written to token_usage; token
+    split and model come from their meta_data JSON.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+
+    session_ids = {r["session_id"] for r in rows}
+    owners = dict(
+        db.query(AssistantSession.session_id, AssistantSession.user_id)
+        .filter(AssistantSession.session_id.in_(session_ids))
+        .all()
+    )
+
+    buckets: Dict[BucketKey, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+    session_totals: Dict[int, List[float]] = defaultdict(lambda: [0, 0.0])  # session_id -> [tokens, cost]
+    for row in rows:
+        user_id = owners.get(row["session_id"])
+        if user_id is None:
+            continue
+        meta = json.loads(row.get("meta_data") or "{}")
+        model = meta.get("model") or "unknown"
+        prompt = int(meta.get("prompt_tokens") or 0)
+        completion = int(meta.get("completion_tokens") or 0)
+        cached = int(meta.get("cached_tokens") or 0)
+        total = int(row.get("amount") or 0)
+        cost = estimate_cost(model, prompt, completion, cached)
+        at = row.get("created_at") or datetime.utcnow()
+
+        session_totals[row["session_id"]][0] += total
+        session_totals[row["session_id"]][1] += cost
+        for period, start in (("day", at.strftime("%Y-%m-%d")), ("month", at.strftime("%Y-%m"))):
+            bucket = buckets[(user_id, period, start, model)]
+            bucket["request_count"] += 1
+            bucket["prompt_tokens"] += prompt
+            bucket["completion_tokens"] += completion
+            bucket["cached_tokens"] += cached
+            bucket["total_tokens"] += total
+            bucket["cost"] += cost
+
+    for (user_id, period, start, model), counters in buckets.items():
+        _upsert_bucket(db, user_id, period, start, model, counters)
+
+    # updated_at is written back unchanged: usage is not session activity, and a bump
+    # would reorder the session list and change the history ETag (onupdate fires otherwise)
+    sessions = AssistantSession.__table__
+    for session_id, (tokens, cost) in session_totals.items():
+        db.execute(
+            update(sessions)
+            .where(sessions.c.session_id == session_id)
+            .values(
+                total_tokens=sessions.c.total_tokens + tokens,
+                total_cost=sessions.c.total_cost + cost,
+                updated_at=sessions.c.updated_at,
+            )
+        )
+
+
+def _upsert_bucket(db: Session, user_id: int, period: str, start: str, model: str, counters: Dict[str, float]) -> None:
+    dialect = db.get_bind().dialect.name
+    now = datetime.utcnow()
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(UsageRollup).values(
+            user_id=user_id, period=period, period_start=start, model=model,
+            created_at=now, updated_at=now, **counters,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "period", "period_start", "model"],
+            set_={
+                **{c: getattr(UsageRollup, c) + getattr(stmt.excluded, c) for c in _COUNTERS},
+                "updated_at": now,
+            },
+        )
+        db.execute(stmt)
+        return
+
+    rollup = db.query(UsageRollup).filter(
+        UsageRollup.user_id == user_id,
+        UsageRollup.period == period,
+        UsageRollup.period_start == start,
+        UsageRollup.model == model,
+    ).first()
+    if rollup is None:
+        db.add(UsageRollup(user_id=user_id, period=period, period_start=start, model=model, **counters))
+    else:
+        for c in _COUNTERS:
+            setattr(rollup, c, getattr(rollup, c) + counters[c])
+
+
+def get_usage(
+    db: Session,
+    user_id: int,
+    period: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rollup rows for a user, oldest first.
+
+    Args:
+        period: "day" or "month"
+        start / end: Inclusive bounds in the period's format ("2026-10-01" / "2026-10")
+    """
+    return [_rollup_dict(r) for r in db.execute(_usage_query(user_id, period, start, end)).scalars()]
+
+
+async def get_usage_async(
+    db: "AsyncSession",
+    user_id: int,
+    period: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """get_usage on the async engine (config.database.AsyncSessionLocal)."""
+    result = await db.execute(_usage_query(user_id, period, start, end))
+    return [_rollup_dict(r) for r in result.scalars()]
+
+
+def _usage_query(user_id: int, period: str, start: Optional[str], end: Optional[str]) -> Select:
+    stmt = select(UsageRollup).where(UsageRollup.user_id == user_id, UsageRollup.period == period)
+    if start:
+        stmt = stmt.where(UsageRollup.period_start >= start)
+    if end:
+        stmt = stmt.where(UsageRollup.period_start <= end)
+    return stmt.order_by(UsageRollup.period_start, UsageRollup.model)
+
+
+def _rollup_dict(r: UsageRollup) -> Dict[str, Any]:
+    return {"period_start": r.period_start, "model": r.model, **{c: getattr(r, c) for c in _COUNTERS}}
+
+
+def get_totals(db: Session, user_id: int, period: str, period_start: str) -> Dict[str, Any]:
+    """Counters for one user/period summed over models (a handful of rows)."""
+    totals: Dict[str, Any] = dict.fromkeys(_COUNTERS, 0)
+    by_model: Dict[str, int] = {}
+    for row in get_usage(db, user_id, period, period_start, period_start):
+        for c in _COUNTERS:
+            totals[c] += row[c]
+        by_model[row["model"]] = row["total_tokens"]
+    return {**totals, "by_model": by_model}
@@ -0,0 +1,85 @@
+"""Vietnamese text helpers - diacritic folding and VND amount parsing"""
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+
+def fold_char(ch: str) -> str:
+    """Fold one character to its lowercase ASCII base ('Ế' → 'e', 'đ' → 'd')."""
+    if ch in "đĐ":
+        return "d"
+    base = unicodedata.normalize("NFD", ch)[0].lower()
+    return base[0] if base else ch
+
+
+def fold(text: str) -> str:
+    """
+    Lowercase and strip Vietnamese diacritics.
+
+    The result has exactly the same length as the input, so regex spans found in the
+    folded text can be used to slice the original text.
+    """
+    return "".join(fold_char(c) for c in text)
+
+
+_UNIT_MULTIPLIERS = {
+    "k": 1_000, "nghin": 1_000, "ngan": 1_000, "ng": 1_000,
+    "tr": 1_000_000, "trieu": 1_000_000, "cu": 1_000_000, "m": 1_000_000,
+    "ty": 1_000_000_000, "ti": 1_000_000_000,
+    "d": 1, "dong": 1, "vnd": 1,
+}
+
+# Longest units first so "trieu" wins over "tr" and "nghin" over "ng"
+_UNITS = "|".join(sorted(_UNIT_MULTIPLIERS, key=len, reverse=True))
+
+AMOUNT_RE = re.compile(
+    r"(?<![\w/.,-])(-?)"
+    r"(\d{1,3}(?:[.,]\d{3})+|\d+(?:[.,]\d+)?)"
+    rf"(?:\s*({_UNITS})(?![a-z])(?:(\d{{1,3}})|\s+(\d)(?=\s|$))?)?"
+    r"(?![\w/])"
+)
+
+
+def _to_number(raw: str) -> float:
+    """'50.000' / '1,500,000' → thousands separators; '2.5' / '2,5' → decimal."""
+    if re.fullmatch(r"\d{1,3}(?:[.,]\d{3})+", raw):
+        return float(re.sub(r"[.,]", "", raw))
+    return float(raw.replace(",", "."))
+
+
+def find_amounts(folded: str) -> List[Tuple[float, bool, bool, Tuple[int, int]]]:
+    """
+    Find VND amounts in folded text.
+
+    Understands '50k', '200 nghìn', '15 triệu', '2.5m', '1tr2' (= 1.200.000), '50.000đ'.
+
+    Returns:
+        List of (amount, has_unit, negative, (start, end)) tuples, in order of appearance
+    """
+    results = []
+    for m in AMOUNT_RE.finditer(folded):
+        sign, number, unit, tight_tail, spaced_tail = m.groups()
+        value = _to_number(number)
+        end = m.end()
+        if unit:
+            multiplier = _UNIT_MULTIPLIERS[unit]
+            # "1tr2" = 1.2 triệu, "2k5" = 2.5k; "1 triệu 2" only for million units
+            tail = tight_tail if multiplier >= 1_000 else None
+            if spaced_tail:
+                if multiplier == 1_000_000:
+                    tail = spaced_tail
+                else:
+                    end = m.end(3)
+            if tail:
+                value += float(f"0.{tail}")
+            value *= multiplier
+        results.append((value, bool(unit), sign == "-", (m.start(), end)))
+    return results
+
+
+def parse_vnd_amount(text: str) -> Optional[float]:
+    """Parse a single amount phrase like '50k' or '1 triệu 2'; None if there isn't exactly one."""
+    amounts = find_amounts(fold(text))
+    if len(amounts) != 1:
+        return None
+    return amounts[0][0]
@@ -240,14 +240,10 @@ export function ChatModule({ userId, userEmail }) {
         await API.createEvent(userId, { ...action.data, timezone: tz });
       } else if (action.type === "write_sheet") {
         const items = Array.isArray(action.data) ? action.data : [action.data];
-        for (const item of items) {
-          await API.addExpense(userId, item);
-        }
+        await API.addExpensesBulk(userId, items);
       } else if (action.type === "write_income_sheet") {
         const items = Array.isArray(action.data) ? action.data : [action.data];
-        for (const item of items) {
-          await API.addIncome(userId, item);
-        }
+        await API.addIncomeBulk(userId, items);
       } else if (action.type === "update_event") {
         const tz = Intl.DateTimeFormat().resolvedOptions().timeZone;
         const { event_id, event_summary, ...updates } = action.data;
@@ -63,6 +63,10 @@ const API = {
     apiFetch(`/api/calendar/events/${encodeURIComponent(eventId)}?user_id=${userId}`, { method: "PUT", body: data }),
   deleteEvent: (userId, eventId) =>
     apiFetch(`/api/calendar/events/${encodeURIComponent(eventId)}?user_id=${userId}`, { method: "DELETE" }),
+  batchEvents: (userId, items) =>
+    apiFetch(`/api/calendar/events:batch?user_id=${userId}`, { method: "POST", body: { items } }),
+  getFreeSlots: (userId, dateFrom, days = 7, durationMinutes = 60) =>
+    apiFetch(`/api/calendar/free-slots?user_id=${userId}&days=${days}&duration_minutes=${durationMinutes}${dateFrom ? `&date_from=${dateFrom}` : ""}`),
 
   // Sheets
   getExpenses: (userId, limit = 100) =>
@@ -75,6 +79,8 @@ const API = {
     apiFetch(`/api/sheets/summary?user_id=${userId}`),
   addExpense: (userId, expense) =>
     apiFetch(`/api/sheets/expenses?user_id=${userId}`, { method: "POST", body: expense }),
+  addExpensesBulk: (userId, items) =>
+    apiFetch(`/api/sheets/expenses:bulk?user_id=${userId}`, { method: "POST", body: { items } }),
   deleteExpense: (userId, rowNumber) =>
     apiFetch(`/api/sheets/expenses/${rowNumber}?user_id=${userId}`, { method: "DELETE" }),
   updateExpense: (userId, rowNumber, expense) =>
@@ -93,6 +99,8 @@ const API = {
     apiFetch(`/api/sheets/income-transactions?user_id=${userId}&limit=${limit}`),
   addIncome: (userId, income) =>
     apiFetch(`/api/sheets/income?user_id=${userId}`, { method: "POST", body: income }),
+  addIncomeBulk: (userId, items) =>
+    apiFetch(`/api/sheets/income:bulk?user_id=${userId}`, { method: "POST", body: { items } }),
   updateIncome: (userId, rowNumber, income) =>
     apiFetch(`/api/sheets/income/${rowNumber}?user_id=${userId}`, { method: "PUT", body: income }),
   deleteIncome: (userId, rowNumber) =>